@@ -0,0 +1,278 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from sqlmodel import col, exists, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.crud.base import CRUDRepository
+from app.logger import logger
+from app.models.football import TeamSeasonAggregate, TournamentEvent
+
+
+# pg_advisory_xact_lock(key, season_id) serializing a season's updates.
+AGGREGATE_LOCK_ID = 0x616767
+
+TOTALS = ('played', 'wins', 'draws', 'losses',
+          'goals_for', 'goals_against', 'points')
+
+aggregate_repo = CRUDRepository(model=TeamSeasonAggregate)
+
+
+class EventResult(NamedTuple):
+    """
+    The parts of an event the aggregates depend on.
+    """
+    event_id: int
+    home_team_id: int
+    away_team_id: int
+    start_timestamp: datetime | None
+    finished: bool
+    home_goals: int
+    away_goals: int
+    season_id: int | None = None
+
+    @classmethod
+    def of(cls, event: TournamentEvent) -> "EventResult":
+        return cls(event_id=event.sofascore_id,
+                   home_team_id=event.home_team_id,
+                   away_team_id=event.away_team_id,
+                   start_timestamp=event.start_timestamp,
+                   finished=event.status_type == 'finished',
+                   home_goals=event.home_score_current or 0,
+                   away_goals=event.away_score_current or 0,
+                   season_id=event.season_id)
+
+    def sides(self) -> List[Tuple[int, int, int]]:
+        """
+        (team_id, goals for, goals against) of both teams.
+        """
+        return [(self.home_team_id, self.home_goals, self.away_goals),
+                (self.away_team_id, self.away_goals, self.home_goals)]
+
+
+async def lock_seasons(db: AsyncSession,
+                       season_ids: Iterable[int | None]) -> None:
+    """
+    Takes the seasons' aggregate locks until the end of the transaction,
+    in id order so concurrent writers can't deadlock on each other.
+    """
+    for season_id in sorted({season_id for season_id in season_ids
+                             if season_id is not None}):
+        await db.exec(select(func.pg_advisory_xact_lock(AGGREGATE_LOCK_ID,
+                                                        season_id)))
+
+
+def result_letter(scored: int, conceded: int) -> str:
+    return 'W' if scored > conceded else 'D' if scored == conceded else 'L'
+
+
+def contribution(scored: int, conceded: int) -> Dict[str, int]:
+    letter = result_letter(scored, conceded)
+    return dict(played=1,
+                wins=int(letter == 'W'),
+                draws=int(letter == 'D'),
+                losses=int(letter == 'L'),
+                goals_for=scored,
+                goals_against=conceded,
+                points=3 if letter == 'W' else 1 if letter == 'D' else 0)
+
+
+def season_changes(changes: Sequence[Tuple[EventResult | None, EventResult]]
+                   ) -> Dict[int, List[Tuple[EventResult | None,
+                                             EventResult | None]]]:
+    """
+    (previous state, new state) pairs grouped by season. An event moved
+    to another season is taken out of the previous one, as a pair without
+    a new state, and counted from scratch in the new one.
+    """
+    seasons: Dict[int, List] = dict()
+    for before, after in changes:
+        if before is not None and before.season_id != after.season_id:
+            if before.season_id is not None:
+                seasons.setdefault(before.season_id, list()).append(
+                    (before, None))
+            before = None
+        if after.season_id is not None:
+            seasons.setdefault(after.season_id, list()).append(
+                (before, after))
+    return seasons
+
+
+def team_deltas(changes: Sequence[Tuple[EventResult | None,
+                                        EventResult | None]]
+                ) -> Dict[int, Dict[str, int]]:
+    """
+    Net change of every team's totals: the new result of each finished
+    event minus what its previous state had contributed.
+    """
+    deltas: Dict[int, Dict[str, int]] = dict()
+    for before, after in changes:
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None or not state.finished:
+                continue
+            for team_id, scored, conceded in state.sides():
+                delta = deltas.setdefault(team_id, dict.fromkeys(TOTALS, 0))
+                for name, value in contribution(scored, conceded).items():
+                    delta[name] += sign * value
+    return deltas
+
+
+def recent_results(team_id: int, events: Sequence[EventResult],
+                   length: int) -> List[EventResult]:
+    played = [event for event in events
+              if event.finished and team_id in (event.home_team_id,
+                                                event.away_team_id)]
+    played.sort(key=lambda event: (event.start_timestamp or datetime.min,
+                                   event.event_id))
+    return played[-length:]
+
+
+def form_of(team_id: int, events: Sequence[EventResult]) -> str:
+    return ''.join(
+        result_letter(*(event.home_goals, event.away_goals)
+                      if event.home_team_id == team_id
+                      else (event.away_goals, event.home_goals))
+        for event in events)
+
+
+async def season_has_aggregates(db: AsyncSession, season_id: int) -> bool:
+    return (await db.exec(select(exists().where(
+        TeamSeasonAggregate.season_id == season_id)))).one()
+
+
+async def load_event_results(db: AsyncSession,
+                             event_ids: Sequence[int]) -> List[EventResult]:
+    if not event_ids:
+        return []
+    rows = (await db.exec(select(
+        TournamentEvent.sofascore_id,
+        TournamentEvent.home_team_id,
+        TournamentEvent.away_team_id,
+        TournamentEvent.start_timestamp,
+        TournamentEvent.status_type == 'finished',
+        TournamentEvent.home_score_current,
+        TournamentEvent.away_score_current,
+        TournamentEvent.season_id,
+    ).where(col(TournamentEvent.sofascore_id).in_(list(event_ids)))
+    )).all()
+    return [EventResult(*row[:4], bool(row[4]), *row[5:]) for row in rows]
+
+
+async def apply_event_changes(
+        db: AsyncSession, tournament_id: int, season_id: int,
+        changes: Sequence[Tuple[EventResult | None, EventResult | None]],
+        full_season: bool = False) -> int:
+    """
+    Applies changed events of a season to its team aggregates, as
+    (previous state or None, new state) pairs, see season_changes. A pair
+    without a new state removes an event that left the season. Runs in
+    the caller's transaction and doesn't commit.
+
+    Only the difference between both states is added, so a corrected
+    score moves the totals from the old result to the new one. The form
+    is rebuilt from the events already in it plus the changed ones.
+
+    A season without aggregates yet is seeded when `changes` hold all of
+    its events (`full_season`), and skipped otherwise so it never starts
+    from partial totals. Returns the number of aggregates written.
+    """
+    if not changes:
+        return 0
+
+    await lock_seasons(db, [season_id])
+
+    if not await season_has_aggregates(db, season_id):
+        if not full_season:
+            logger.info(f"Aggregates: season {season_id} not seeded yet, "
+                        f"skipping {len(changes)} events.")
+            return 0
+        changes = [(None, after) for _, after in changes
+                   if after is not None]
+        if not changes:
+            return 0
+    else:
+        changes = [(before, after) for before, after in changes
+                   if before != after]
+        if not changes:
+            return 0
+
+    deltas = team_deltas(changes)
+    changed = {after.event_id: after for _, after in changes
+               if after is not None}
+    removed = {before.event_id for before, after in changes
+               if after is None}
+    teams = set(deltas) | {team_id for pair in changes
+                           for state in pair if state is not None
+                           for team_id, *_ in state.sides()}
+
+    aggregates = {aggregate.team_id: aggregate for aggregate in (
+        await db.exec(select(TeamSeasonAggregate).where(
+            TeamSeasonAggregate.season_id == season_id,
+            col(TeamSeasonAggregate.team_id).in_(list(teams))))).all()}
+
+    # Events still in a form but not part of this change keep their
+    # stored state.
+    kept_ids = {event_id for aggregate in aggregates.values()
+                for event_id in aggregate.form_event_ids
+                if event_id not in changed and event_id not in removed}
+    candidates = await load_event_results(db, list(kept_ids))
+    candidates.extend(changed.values())
+
+    length = settings.TEAM_FORM_LENGTH
+    rows = list()
+    for team_id in teams:
+        aggregate = aggregates.get(team_id)
+        totals = {name: getattr(aggregate, name) if aggregate else 0
+                  for name in TOTALS}
+        for name, value in deltas.get(team_id, dict()).items():
+            totals[name] += value
+
+        own = set(aggregate.form_event_ids) if aggregate else set()
+        recent = recent_results(team_id, [
+            event for event in candidates
+            if event.event_id in own or event.event_id in changed
+        ], length)
+
+        last_played_at = aggregate.last_played_at if aggregate else None
+        if recent and recent[-1].start_timestamp and (
+                last_played_at is None
+                or recent[-1].start_timestamp > last_played_at):
+            last_played_at = recent[-1].start_timestamp
+
+        rows.append(dict(
+            season_id=season_id,
+            team_id=team_id,
+            tournament_id=tournament_id,
+            form=form_of(team_id, recent),
+            form_event_ids=[event.event_id for event in recent],
+            last_played_at=last_played_at,
+            **totals,
+        ))
+
+    await aggregate_repo.upsert_many(
+        db, rows, conflict_cols=['season_id', 'team_id'], commit=False)
+    return len(rows)
+
+
+async def get_season_aggregates(db: AsyncSession, season_id: int
+                                ) -> List[TeamSeasonAggregate]:
+    query = select(TeamSeasonAggregate).where(
+        TeamSeasonAggregate.season_id == season_id
+    ).order_by(TeamSeasonAggregate.points.desc(),
+               (TeamSeasonAggregate.goals_for
+                - TeamSeasonAggregate.goals_against).desc(),
+               TeamSeasonAggregate.goals_for.desc(),
+               TeamSeasonAggregate.team_id)
+    return (await db.exec(query)).all()
+
+
+async def get_team_aggregates(db: AsyncSession, team_id: int,
+                              season_id: int | None = None
+                              ) -> List[TeamSeasonAggregate]:
+    query = select(TeamSeasonAggregate).where(
+        TeamSeasonAggregate.team_id == team_id)
+    if season_id is not None:
+        query = query.where(TeamSeasonAggregate.season_id == season_id)
+    query = query.order_by(TeamSeasonAggregate.last_played_at.desc())
+    return (await db.exec(query)).all()
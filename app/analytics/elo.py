@@ -0,0 +1,392 @@
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+from sqlmodel import delete, exists, func, or_, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics.aggregates import EventResult
+from app.core.config import settings
+from app.crud.base import CRUDRepository
+from app.logger import logger
+from app.models.football import (RatingCheckpoint, TeamRating,
+                                 TeamRatingSnapshot, TournamentEvent)
+
+
+ELO_CHECKPOINT = "elo"
+# pg_advisory_xact_lock key serializing rating updates.
+ELO_LOCK_ID = 0x656C6F
+
+rating_repo = CRUDRepository(model=TeamRating)
+snapshot_repo = CRUDRepository(model=TeamRatingSnapshot)
+checkpoint_repo = CRUDRepository(model=RatingCheckpoint)
+
+
+class EloConfig(NamedTuple):
+    k: float
+    home_advantage: float
+    initial: float
+
+    @property
+    def formula(self) -> str:
+        return (f"elo:k={self.k}:home={self.home_advantage}"
+                f":initial={self.initial}:margin=1")
+
+
+def elo_config() -> EloConfig:
+    return EloConfig(k=settings.ELO_K,
+                     home_advantage=settings.ELO_HOME_ADVANTAGE,
+                     initial=settings.ELO_INITIAL_RATING)
+
+
+class TeamIndex:
+    """
+    Maps team ids to positions in the compact rating array, growing it
+    as new teams show up.
+    """
+
+    def __init__(self, initial: float):
+        self.initial = initial
+        self.positions: Dict[int, int] = dict()
+        self.team_ids: List[int] = list()
+        self.ratings = np.empty(0, dtype=np.float64)
+        self.matches = np.empty(0, dtype=np.int64)
+
+    def load(self, team_ids: List[int], ratings: List[float],
+             matches: List[int]) -> None:
+        self.team_ids = list(team_ids)
+        self.positions = {team_id: index
+                          for index, team_id in enumerate(self.team_ids)}
+        self.ratings = np.array(ratings, dtype=np.float64)
+        self.matches = np.array(matches, dtype=np.int64)
+
+    def lookup(self, team_ids: np.ndarray) -> np.ndarray:
+        new = [team_id for team_id in dict.fromkeys(team_ids.tolist())
+               if team_id not in self.positions]
+        for team_id in new:
+            self.positions[team_id] = len(self.team_ids)
+            self.team_ids.append(team_id)
+        if new:
+            self.ratings = np.concatenate(
+                [self.ratings, np.full(len(new), self.initial)])
+            self.matches = np.concatenate(
+                [self.matches, np.zeros(len(new), dtype=np.int64)])
+        return np.array([self.positions[team_id]
+                         for team_id in team_ids.tolist()], dtype=np.int64)
+
+
+def margin_multiplier(goal_difference: np.ndarray) -> np.ndarray:
+    """
+    World Football Elo goal margin weight: 1, 1.5, then (11 + n) / 8.
+    """
+    margin = np.abs(goal_difference)
+    return np.where(margin <= 1, 1.0,
+                    np.where(margin == 2, 1.5, (11 + margin) / 8))
+
+
+def rate_matches(ratings: np.ndarray, home: np.ndarray, away: np.ndarray,
+                 home_goals: np.ndarray, away_goals: np.ndarray,
+                 config: EloConfig) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Applies matches in order to `ratings` (updated in place) and returns
+    the (home, away) ratings before and after every match.
+
+    Results and margins are precomputed as arrays, only the rating
+    recurrence itself has to run match by match.
+    """
+    result = np.where(home_goals > away_goals, 1.0,
+                      np.where(home_goals == away_goals, 0.5, 0.0)).tolist()
+    weight = (config.k * margin_multiplier(home_goals - away_goals)).tolist()
+
+    current = ratings.tolist()
+    before = np.empty((len(home), 2), dtype=np.float64)
+    after = np.empty((len(home), 2), dtype=np.float64)
+    home_advantage = config.home_advantage
+
+    for i, (h, a) in enumerate(zip(home.tolist(), away.tolist())):
+        home_rating, away_rating = current[h], current[a]
+        expected = 1 / (1 + 10 ** ((away_rating - home_rating
+                                    - home_advantage) / 400))
+        delta = weight[i] * (result[i] - expected)
+        current[h] = home_rating + delta
+        current[a] = away_rating - delta
+        before[i] = (home_rating, away_rating)
+        after[i] = (current[h], current[a])
+
+    ratings[:] = current
+    return before, after
+
+
+def rate_events(index: TeamIndex, rows: Sequence[Tuple],
+                config: EloConfig) -> List[Dict[str, Any]]:
+    """
+    Rates pending_events_query rows in order on top of `index` and returns
+    their snapshots, one per event and team.
+    """
+    event_ids, home_ids, away_ids, home_goals, away_goals, starts = \
+        map(list, zip(*rows))
+    home_ids = np.array(home_ids, dtype=np.int64)
+    away_ids = np.array(away_ids, dtype=np.int64)
+    home = index.lookup(home_ids)
+    away = index.lookup(away_ids)
+
+    before, after = rate_matches(
+        index.ratings, home, away,
+        np.array(home_goals, dtype=np.int64),
+        np.array(away_goals, dtype=np.int64),
+        config)
+    np.add.at(index.matches, home, 1)
+    np.add.at(index.matches, away, 1)
+
+    snapshots = list()
+    for i, event_id in enumerate(event_ids):
+        for side, team_id in enumerate((home_ids[i], away_ids[i])):
+            snapshots.append(dict(
+                event_id=event_id,
+                team_id=int(team_id),
+                start_timestamp=starts[i],
+                rating_before=float(before[i, side]),
+                rating_after=float(after[i, side]),
+            ))
+    return snapshots
+
+
+async def reset_ratings(db: AsyncSession) -> None:
+    await db.exec(delete(TeamRatingSnapshot))
+    await db.exec(delete(TeamRating))
+    await db.exec(delete(RatingCheckpoint).where(
+        RatingCheckpoint.name == ELO_CHECKPOINT))
+
+
+async def load_ratings(db: AsyncSession, index: TeamIndex) -> None:
+    rows = (await db.exec(select(TeamRating.team_id, TeamRating.rating,
+                                 TeamRating.matches))).all()
+    columns = list(zip(*rows)) if rows else [(), (), ()]
+    index.load(*columns)
+
+
+def rated_state(result: EventResult | None) -> Tuple | None:
+    """
+    The parts of an event its ratings depend on, None unless finished.
+    """
+    if result is None or not result.finished:
+        return None
+    return (result.home_team_id, result.away_team_id,
+            result.home_goals, result.away_goals)
+
+
+async def mark_ratings_stale(
+        db: AsyncSession,
+        changes: Sequence[Tuple[EventResult | None, EventResult]]) -> None:
+    """
+    Moves the checkpoint's rewind point back to the earliest changed
+    result it has already passed, a corrected score or a late scraped
+    older result, so the next update replays the ratings from there.
+    Runs in the caller's transaction.
+    """
+    starts = [state.start_timestamp
+              for before, after in changes
+              if rated_state(before) != rated_state(after)
+              for state in (before, after)
+              if state is not None and state.start_timestamp is not None]
+    if not starts:
+        return
+
+    since = min(starts)
+    await db.exec(update(RatingCheckpoint).where(
+        RatingCheckpoint.name == ELO_CHECKPOINT,
+        RatingCheckpoint.last_start_timestamp >= since,
+    ).values(rewind_from=func.least(
+        func.coalesce(RatingCheckpoint.rewind_from, since), since)))
+
+
+async def rewind_ratings(db: AsyncSession, since: datetime
+                         ) -> Tuple[int, int | None, datetime | None]:
+    """
+    Drops the snapshots from `since` on and restores every team's rating
+    from its last remaining snapshot. Returns the rated event count and
+    the last rated event with its kick off.
+    """
+    await db.exec(delete(TeamRatingSnapshot).where(or_(
+        TeamRatingSnapshot.start_timestamp >= since,
+        TeamRatingSnapshot.start_timestamp.is_(None))))
+
+    latest = (await db.exec(select(
+        TeamRatingSnapshot.team_id, TeamRatingSnapshot.rating_after,
+        TeamRatingSnapshot.event_id, TeamRatingSnapshot.start_timestamp,
+    ).distinct(TeamRatingSnapshot.team_id).order_by(
+        TeamRatingSnapshot.team_id,
+        TeamRatingSnapshot.start_timestamp.desc(),
+        TeamRatingSnapshot.event_id.desc()))).all()
+    matches = dict((await db.exec(select(
+        TeamRatingSnapshot.team_id, func.count()
+    ).group_by(TeamRatingSnapshot.team_id))).all())
+    events = (await db.exec(select(
+        func.count(func.distinct(TeamRatingSnapshot.event_id))))).one()
+
+    await db.exec(delete(TeamRating))
+    await rating_repo.upsert_many(db, [
+        dict(team_id=team_id, rating=rating, matches=matches[team_id],
+             last_event_id=event_id, last_played_at=start_timestamp)
+        for team_id, rating, event_id, start_timestamp in latest
+    ], conflict_cols=['team_id'], commit=False)
+
+    if not latest:
+        return events, None, None
+    _, _, last_event_id, last_start_timestamp = max(
+        latest, key=lambda row: (row[3], row[2]))
+    return events, last_event_id, last_start_timestamp
+
+
+def pending_events_query(limit: int, since: datetime | None = None):
+    """
+    Finished events without a snapshot yet, oldest first, from the
+    checkpoint's kick off `since` on. Results changing behind the
+    checkpoint rewind it (mark_ratings_stale) instead of being searched
+    for in the whole history.
+    """
+    rated = exists().where(
+        TeamRatingSnapshot.event_id == TournamentEvent.sofascore_id)
+    query = select(
+        TournamentEvent.sofascore_id,
+        TournamentEvent.home_team_id,
+        TournamentEvent.away_team_id,
+        TournamentEvent.home_score_current,
+        TournamentEvent.away_score_current,
+        TournamentEvent.start_timestamp,
+    ).where(
+        TournamentEvent.status_type == 'finished',
+        ~rated,
+    )
+    if since is not None:
+        query = query.where(or_(TournamentEvent.start_timestamp >= since,
+                                TournamentEvent.start_timestamp.is_(None)))
+    return query.order_by(
+        TournamentEvent.start_timestamp, TournamentEvent.sofascore_id
+    ).limit(limit)
+
+
+async def update_ratings(db: AsyncSession, rebuild: bool = False,
+                         batch_size: int = settings.ELO_BATCH_SIZE
+                         ) -> Dict[str, Any]:
+    """
+    Applies every finished event not rated yet on top of the stored
+    ratings, in kick off order, and saves snapshots and the checkpoint in
+    one transaction.
+
+    When results changed behind the checkpoint, the ratings are first
+    rewound to the earliest of them. `rebuild` (or a changed formula)
+    drops all ratings and replays the whole history.
+    """
+    config = elo_config()
+
+    # Concurrent updaters would rate the same events twice.
+    await db.exec(select(func.pg_advisory_xact_lock(ELO_LOCK_ID)))
+
+    checkpoint = (await db.exec(select(RatingCheckpoint).where(
+        RatingCheckpoint.name == ELO_CHECKPOINT))).first()
+    if checkpoint is not None and checkpoint.formula != config.formula:
+        logger.info(f"Elo: formula changed from {checkpoint.formula}, "
+                    f"rebuilding.")
+        rebuild = True
+    if rebuild:
+        await reset_ratings(db)
+        checkpoint = None
+
+    events = checkpoint.events if checkpoint else 0
+    last_event_id = checkpoint.last_event_id if checkpoint else None
+    last_start_timestamp = checkpoint.last_start_timestamp if checkpoint else None
+    rewind_from = checkpoint.rewind_from if checkpoint else None
+    if rewind_from is not None:
+        logger.info(f"Elo: results changed since {rewind_from}, rewinding.")
+        events, last_event_id, last_start_timestamp = await rewind_ratings(
+            db, rewind_from)
+
+    index = TeamIndex(config.initial)
+    await load_ratings(db, index)
+
+    since = last_start_timestamp
+    applied = 0
+    last_played: Dict[int, Tuple[int, datetime | None]] = dict()
+
+    while True:
+        rows = (await db.exec(pending_events_query(batch_size,
+                                                   since))).all()
+        if not rows:
+            break
+
+        snapshots = rate_events(index, rows, config)
+        for snapshot in snapshots:
+            last_played[snapshot['team_id']] = (snapshot['event_id'],
+                                                snapshot['start_timestamp'])
+        await snapshot_repo.upsert_many(
+            db, snapshots, conflict_cols=['event_id', 'team_id'],
+            commit=False)
+
+        applied += len(rows)
+        last_event_id, last_start_timestamp = rows[-1][0], rows[-1][5]
+
+    if applied:
+        positions = [index.positions[team_id] for team_id in last_played]
+        await rating_repo.upsert_many(db, [
+            dict(team_id=team_id,
+                 rating=float(index.ratings[position]),
+                 matches=int(index.matches[position]),
+                 last_event_id=last_played[team_id][0],
+                 last_played_at=last_played[team_id][1])
+            for team_id, position in zip(last_played, positions)
+        ], conflict_cols=['team_id'], commit=False)
+
+    # rewind_from isn't overwritten: ingests may have moved it meanwhile,
+    # only the point consumed above is cleared.
+    await checkpoint_repo.upsert_many(db, [dict(
+        name=ELO_CHECKPOINT,
+        formula=config.formula,
+        events=events + applied,
+        last_event_id=last_event_id,
+        last_start_timestamp=last_start_timestamp,
+    )], conflict_cols=['name'],
+        update_cols=['formula', 'events', 'last_event_id',
+                     'last_start_timestamp', 'updated_at'],
+        commit=False)
+    if rewind_from is not None:
+        await db.exec(update(RatingCheckpoint).where(
+            RatingCheckpoint.name == ELO_CHECKPOINT,
+            RatingCheckpoint.rewind_from == rewind_from,
+        ).values(rewind_from=None))
+    await db.commit()
+
+    logger.info(f"Elo: applied {applied} events, rebuild={rebuild}, "
+                f"rewound from {rewind_from}.")
+    return dict(applied=applied, events=events + applied, rebuild=rebuild,
+                rewound_from=rewind_from, teams=len(index.team_ids))
+
+
+async def ratings_version(db: AsyncSession) -> Tuple:
+    """
+    Changes whenever an update or rebuild moves the current ratings.
+    """
+    checkpoint = (await db.exec(select(
+        RatingCheckpoint.events, RatingCheckpoint.last_event_id,
+        RatingCheckpoint.updated_at).where(
+        RatingCheckpoint.name == ELO_CHECKPOINT))).first()
+    return tuple(checkpoint) if checkpoint is not None else ()
+
+
+async def get_current_ratings(db: AsyncSession,
+                              limit: int | None = None) -> List[TeamRating]:
+    query = select(TeamRating).order_by(TeamRating.rating.desc())
+    if limit:
+        query = query.limit(limit)
+    return (await db.exec(query)).all()
+
+
+async def get_rating_history(db: AsyncSession, team_id: int,
+                             limit: int | None = None
+                             ) -> List[TeamRatingSnapshot]:
+    query = select(TeamRatingSnapshot).where(
+        TeamRatingSnapshot.team_id == team_id
+    ).order_by(TeamRatingSnapshot.start_timestamp.desc())
+    if limit:
+        query = query.limit(limit)
+    return list(reversed((await db.exec(query)).all()))
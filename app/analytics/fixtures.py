@@ -0,0 +1,182 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+from sqlmodel import and_, func, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.football import Team, TournamentEvent
+
+
+# (tournament_id, season_id), a None season stands for the events
+# scraped before events stored their season.
+SeasonKey = Tuple[int, int | None]
+
+
+def season_filter(tournament_id: int, season_id: int | None):
+    # The tournament is the partition key, the season narrows it down.
+    season = (TournamentEvent.season_id.is_(None) if season_id is None
+              else TournamentEvent.season_id == season_id)
+    return and_(TournamentEvent.tournament_id == tournament_id, season)
+
+
+class Fixtures(NamedTuple):
+    """
+    Events of one or more seasons as flat arrays.
+
+    Teams are numbered per season ("slots"): the same club in two
+    requested seasons gets two slots, so every table can be computed in a
+    single pass over all matches.
+    """
+    seasons: List[SeasonKey]
+    # per slot
+    table: np.ndarray
+    team_ids: np.ndarray
+    # per match, in kick off order
+    event_ids: np.ndarray
+    match_table: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+    home_goals: np.ndarray
+    away_goals: np.ndarray
+    finished: np.ndarray
+    upcoming: np.ndarray
+    start_timestamp: np.ndarray
+
+    @property
+    def slots(self) -> int:
+        return len(self.team_ids)
+
+    def slots_of(self, table: int) -> np.ndarray:
+        return np.flatnonzero(self.table == table)
+
+
+def build_fixtures(seasons: Sequence[SeasonKey],
+                   match_table: np.ndarray,
+                   event_ids: np.ndarray,
+                   home_ids: np.ndarray,
+                   away_ids: np.ndarray,
+                   home_goals: np.ndarray,
+                   away_goals: np.ndarray,
+                   finished: np.ndarray,
+                   start_timestamp: np.ndarray,
+                   upcoming: np.ndarray | None = None) -> Fixtures:
+    matches = len(match_table)
+    if upcoming is None:
+        upcoming = np.zeros(matches, dtype=bool)
+    pairs = np.concatenate([
+        np.stack([match_table, home_ids], axis=1),
+        np.stack([match_table, away_ids], axis=1),
+    ]).reshape(-1, 2)
+    slots, inverse = np.unique(pairs, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    return Fixtures(
+        seasons=list(seasons),
+        table=slots[:, 0],
+        team_ids=slots[:, 1],
+        event_ids=event_ids,
+        match_table=match_table,
+        home=inverse[:matches],
+        away=inverse[matches:],
+        home_goals=home_goals,
+        away_goals=away_goals,
+        finished=finished,
+        upcoming=upcoming,
+        start_timestamp=start_timestamp,
+    )
+
+
+async def load_fixtures(db: AsyncSession,
+                        seasons: Sequence[SeasonKey],
+                        score: str = 'current') -> Fixtures:
+    """
+    Loads every event of `seasons` with one query. Only `finished`
+    events count as results, `notstarted` ones are the remaining
+    fixtures.
+
+    `score` picks the score columns, e.g. `normaltime`.
+    """
+    seasons = list(dict.fromkeys(seasons))
+    tables: Dict[SeasonKey, int] = {season: index
+                                    for index, season in enumerate(seasons)}
+
+    query = select(
+        TournamentEvent.tournament_id,
+        TournamentEvent.season_id,
+        TournamentEvent.sofascore_id,
+        TournamentEvent.home_team_id,
+        TournamentEvent.away_team_id,
+        getattr(TournamentEvent, f"home_score_{score}"),
+        getattr(TournamentEvent, f"away_score_{score}"),
+        TournamentEvent.status_type,
+        TournamentEvent.start_timestamp,
+    ).where(
+        or_(*(season_filter(*season) for season in seasons))
+    ).order_by(TournamentEvent.start_timestamp, TournamentEvent.sofascore_id)
+
+    rows = (await db.exec(query)).all() if seasons else []
+    columns = list(zip(*rows)) if rows else [()] * 9
+
+    return build_fixtures(
+        seasons,
+        match_table=np.array([tables[season]
+                              for season in zip(columns[0], columns[1])],
+                             dtype=np.int64),
+        event_ids=np.array(columns[2], dtype=np.int64),
+        home_ids=np.array(columns[3], dtype=np.int64),
+        away_ids=np.array(columns[4], dtype=np.int64),
+        home_goals=np.array(columns[5], dtype=np.int32),
+        away_goals=np.array(columns[6], dtype=np.int32),
+        finished=np.array([status == 'finished' for status in columns[7]],
+                          dtype=bool),
+        start_timestamp=np.array(columns[8], dtype='datetime64[s]'),
+        upcoming=np.array([status == 'notstarted' for status in columns[7]],
+                          dtype=bool),
+    )
+
+
+async def load_team_names(db: AsyncSession,
+                          team_ids: np.ndarray) -> Dict[int, str]:
+    ids = np.unique(team_ids).tolist()
+    if not ids:
+        return dict()
+    rows = await db.exec(select(Team.sofascore_id, Team.name).where(
+        Team.sofascore_id.in_(ids)))
+    return dict(rows.all())
+
+
+async def season_events_version(db: AsyncSession, tournament_id: int,
+                                season_id: int | None = None) -> Tuple:
+    """
+    (max updated_at, count) of a season's events, changes with every
+    scraped result or correction.
+    """
+    result = await db.exec(
+        select(func.max(TournamentEvent.updated_at), func.count()).where(
+            season_filter(tournament_id, season_id)))
+    return tuple(result.one())
+
+
+class SeasonCache:
+    """
+    Bounded LRU of per season results, valid while the season's events
+    version is unchanged.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, Tuple[Tuple, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, version: Tuple) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, version: Tuple, value: Any) -> None:
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
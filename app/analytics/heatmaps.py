@@ -0,0 +1,70 @@
+import zlib
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.models.analytics import PlayerHeatmap
+from app.models.football import EventPlayerHeatmap
+
+
+# (x, y) cells over sofascore's 0-100 pitch coordinates, stored grids
+# depend on it so it isn't a setting.
+HEATMAP_SHAPE = (100, 64)
+HEATMAP_DTYPE = np.dtype('<u2')
+
+
+def rasterize(points: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """
+    Counts of the points per cell, saturating at the uint16 maximum.
+    """
+    width, height = HEATMAP_SHAPE
+    cells = np.zeros(width * height, dtype=np.int64)
+    if len(points):
+        xy = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        x = np.clip((xy[:, 0] * width / 100).astype(np.int64), 0, width - 1)
+        y = np.clip((xy[:, 1] * height / 100).astype(np.int64),
+                    0, height - 1)
+        cells = np.bincount(x * height + y, minlength=width * height)
+    limit = np.iinfo(HEATMAP_DTYPE).max
+    return np.minimum(cells, limit).astype(HEATMAP_DTYPE).reshape(
+        HEATMAP_SHAPE)
+
+
+def encode_grid(grid: np.ndarray) -> bytes:
+    return zlib.compress(grid.astype(HEATMAP_DTYPE).tobytes(),
+                         settings.HEATMAP_COMPRESSION_LEVEL)
+
+
+def sum_grids(blobs: Iterable[bytes]) -> np.ndarray:
+    """
+    Decompresses every grid into one buffer and sums them in one call.
+    """
+    data = b''.join(zlib.decompress(blob) for blob in blobs)
+    grids = np.frombuffer(data, dtype=HEATMAP_DTYPE).reshape(
+        -1, *HEATMAP_SHAPE)
+    return grids.sum(axis=0, dtype=np.uint32)
+
+
+async def get_player_heatmap(db: AsyncSession, player_id: int,
+                             season_id: int | None = None) -> PlayerHeatmap:
+    """
+    Heatmap of a player over all stored matches, or those of a season.
+    """
+    query = select(EventPlayerHeatmap.grid, EventPlayerHeatmap.points).where(
+        EventPlayerHeatmap.player_id == player_id)
+    if season_id is not None:
+        query = query.where(EventPlayerHeatmap.season_id == season_id)
+    rows = (await db.exec(query)).all()
+
+    grid = sum_grids(blob for blob, _ in rows)
+    return PlayerHeatmap(
+        player_id=player_id,
+        season_id=season_id,
+        matches=len(rows),
+        points=sum(points for _, points in rows),
+        shape=list(HEATMAP_SHAPE),
+        grid=grid.tolist(),
+    )
@@ -0,0 +1,82 @@
+from typing import List
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics.fixtures import load_team_names
+from app.models.analytics import (LeaderboardRow, LeaderboardScope,
+                                  StatLeaderboard)
+from app.models.football import EventStatistic, StatKey
+
+
+async def get_stat_keys(db: AsyncSession) -> List[StatKey]:
+    return (await db.exec(select(StatKey).order_by(StatKey.group_name,
+                                                   StatKey.key))).all()
+
+
+async def get_leaderboard(db: AsyncSession, stat: str,
+                          season_id: int | None = None,
+                          period: str = "ALL",
+                          scope: LeaderboardScope = LeaderboardScope.TEAM,
+                          ascending: bool = False,
+                          min_matches: int = 1,
+                          limit: int = 20) -> StatLeaderboard:
+    """
+    Best teams by their average of `stat`, or best single match values.
+
+    Both are one aggregate over event_statistic filtered on (season,
+    stat, period), which its covering indexes answer without touching
+    the table.
+    """
+    stat_key = (await db.exec(select(StatKey).where(
+        StatKey.key == stat))).first()
+    if stat_key is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=f"Unknown statistic {stat}.")
+
+    conditions = [EventStatistic.stat_key_id == stat_key.id,
+                  EventStatistic.period == period]
+    if season_id is not None:
+        conditions.append(EventStatistic.season_id == season_id)
+
+    if scope == LeaderboardScope.TEAM:
+        value = func.avg(EventStatistic.value)
+        query = select(
+            EventStatistic.team_id,
+            value,
+            func.count(),
+        ).where(*conditions).group_by(EventStatistic.team_id).having(
+            func.count() >= min_matches)
+        tie_breakers = [EventStatistic.team_id]
+    else:
+        value = EventStatistic.value
+        query = select(
+            EventStatistic.team_id,
+            value,
+            EventStatistic.event_id,
+        ).where(*conditions)
+        tie_breakers = [EventStatistic.event_id, EventStatistic.team_id]
+
+    query = query.order_by(value.asc() if ascending else value.desc(),
+                           *tie_breakers).limit(limit)
+    rows = (await db.exec(query)).all()
+
+    team_names = await load_team_names(
+        db, np.array([row[0] for row in rows], dtype=np.int64))
+
+    leaderboard = list()
+    for position, (team_id, row_value, extra) in enumerate(rows, start=1):
+        leaderboard.append(LeaderboardRow(
+            position=position,
+            team_id=team_id,
+            team_name=team_names.get(team_id),
+            event_id=extra if scope == LeaderboardScope.MATCH else None,
+            matches=extra if scope == LeaderboardScope.TEAM else None,
+            value=float(row_value),
+        ))
+
+    return StatLeaderboard(stat_key=stat_key.key, stat_name=stat_key.name,
+                           period=period, scope=scope, season_id=season_id,
+                           rows=leaderboard)
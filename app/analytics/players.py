@@ -0,0 +1,76 @@
+from typing import List
+
+from sqlmodel import col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.analytics import PlayerSeasonTotals, SquadPlayer
+from app.models.football import EventAppearance, Player
+
+
+def appearance_totals():
+    """
+    Totals over appearances, all read from the columns the appearance
+    indexes include.
+    """
+    played = EventAppearance.minutes > 0
+    return (
+        func.count().filter(played),
+        func.count().filter(played, EventAppearance.substitute.is_(False)),
+        func.coalesce(func.sum(EventAppearance.minutes), 0),
+        func.count(EventAppearance.rating),
+        func.avg(EventAppearance.rating),
+    )
+
+
+async def get_player_seasons(db: AsyncSession, player_id: int
+                             ) -> List[PlayerSeasonTotals]:
+    query = select(EventAppearance.season_id, *appearance_totals()).where(
+        EventAppearance.player_id == player_id,
+    ).group_by(EventAppearance.season_id).order_by(
+        EventAppearance.season_id.desc())
+    return [PlayerSeasonTotals(
+        season_id=season_id,
+        appearances=appearances,
+        starts=starts,
+        minutes=minutes,
+        rated_matches=rated,
+        average_rating=round(rating, 2) if rating is not None else None,
+    ) for season_id, appearances, starts, minutes, rated, rating in (
+        await db.exec(query)).all()]
+
+
+async def get_squad(db: AsyncSession, team_id: int,
+                    season_id: int | None = None) -> List[SquadPlayer]:
+    """
+    Minutes and ratings of every player of a team, most used first.
+    """
+    query = select(EventAppearance.player_id, *appearance_totals()).where(
+        EventAppearance.team_id == team_id)
+    if season_id is not None:
+        query = query.where(EventAppearance.season_id == season_id)
+    query = query.group_by(EventAppearance.player_id).order_by(
+        func.sum(EventAppearance.minutes).desc(), EventAppearance.player_id)
+    rows = (await db.exec(query)).all()
+
+    names = dict((await db.exec(select(Player.sofascore_id, Player.name).where(
+        col(Player.sofascore_id).in_([row[0] for row in rows])))).all())
+    return [SquadPlayer(
+        player_id=player_id,
+        player_name=names.get(player_id),
+        appearances=appearances,
+        starts=starts,
+        minutes=minutes,
+        rated_matches=rated,
+        average_rating=round(rating, 2) if rating is not None else None,
+    ) for player_id, appearances, starts, minutes, rated, rating in rows]
+
+
+async def get_player_appearances(db: AsyncSession, player_id: int,
+                                 season_id: int | None = None,
+                                 limit: int = 50) -> List[EventAppearance]:
+    query = select(EventAppearance).where(
+        EventAppearance.player_id == player_id)
+    if season_id is not None:
+        query = query.where(EventAppearance.season_id == season_id)
+    query = query.order_by(EventAppearance.event_id.desc()).limit(limit)
+    return (await db.exec(query)).all()
@@ -0,0 +1,302 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics.fixtures import (Fixtures, SeasonCache, load_fixtures,
+                                    season_events_version)
+from app.core.config import settings
+from app.logger import logger
+from app.models.analytics import EventPrediction
+from app.models.football import TournamentEvent
+
+
+# Dixon-Coles low score correction is searched on this grid.
+RHO_GRID = np.linspace(-0.25, 0.25, 101)
+
+
+class SeasonModel(NamedTuple):
+    """
+    Fitted Dixon-Coles parameters of one season.
+    """
+    team_ids: np.ndarray
+    attack: np.ndarray
+    defence: np.ndarray
+    home_advantage: float
+    rho: float
+    matches: int
+
+    def expected_goals(self, home_ids: np.ndarray, away_ids: np.ndarray
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (home, away) scoring rates, teams without results get average
+        strengths.
+        """
+        positions = {team_id: index
+                     for index, team_id in enumerate(self.team_ids.tolist())}
+        attack = np.append(self.attack, 1.0)
+        defence = np.append(self.defence, 1.0)
+        missing = len(self.team_ids)
+        home = np.array([positions.get(team_id, missing)
+                         for team_id in home_ids.tolist()], dtype=np.int64)
+        away = np.array([positions.get(team_id, missing)
+                         for team_id in away_ids.tolist()], dtype=np.int64)
+        return (self.home_advantage * attack[home] * defence[away],
+                attack[away] * defence[home])
+
+
+def poisson_pmf(rate: np.ndarray, max_goals: int) -> np.ndarray:
+    """
+    P(0..max_goals goals) for every rate, shaped (len(rate), max_goals + 1).
+    """
+    goals = np.arange(max_goals + 1)
+    log_factorial = np.cumsum(np.log(np.maximum(goals, 1)))
+    return np.exp(goals * np.log(rate)[:, None] - rate[:, None]
+                  - log_factorial)
+
+
+def dixon_coles_tau(home_goals: np.ndarray, away_goals: np.ndarray,
+                    home_rate: np.ndarray, away_rate: np.ndarray,
+                    rho: np.ndarray) -> np.ndarray:
+    """
+    Low score dependence correction, broadcast over a leading rho axis.
+    """
+    rho = np.asarray(rho, dtype=np.float64)[..., None]
+    tau = np.ones(np.broadcast_shapes(rho.shape, home_goals.shape))
+    tau = np.where((home_goals == 0) & (away_goals == 0),
+                   1 - home_rate * away_rate * rho, tau)
+    tau = np.where((home_goals == 0) & (away_goals == 1),
+                   1 + home_rate * rho, tau)
+    tau = np.where((home_goals == 1) & (away_goals == 0),
+                   1 + away_rate * rho, tau)
+    tau = np.where((home_goals == 1) & (away_goals == 1), 1 - rho, tau)
+    return tau
+
+
+def fit_season(team_ids: np.ndarray, home: np.ndarray, away: np.ndarray,
+               home_goals: np.ndarray, away_goals: np.ndarray,
+               weights: np.ndarray, prior: float = 1.0,
+               prior_home_goals: float = 1.5, prior_away_goals: float = 1.15,
+               iterations: int = 200, tolerance: float = 1e-8
+               ) -> SeasonModel:
+    """
+    Fits attack / defence strengths and home advantage of the Poisson
+    model by fixed point iteration of the (weighted) likelihood
+    equations, every step being a handful of bincounts. `prior` pulls
+    teams with few results towards average strength and the home
+    advantage towards the prior rates' ratio. The Dixon-Coles rho is
+    then picked by evaluating the likelihood on RHO_GRID at once.
+
+    A season without results, e.g. before its first matchday, predicts
+    every match at the prior league average rates.
+
+    Runs in the process pool, so it only takes and returns arrays.
+    """
+    size = len(team_ids)
+    prior_home_advantage = prior_home_goals / prior_away_goals
+    if not np.sum(weights) > 0:
+        return SeasonModel(team_ids=team_ids, attack=np.ones(size),
+                           defence=np.full(size, prior_away_goals),
+                           home_advantage=prior_home_advantage, rho=0.0,
+                           matches=0)
+
+    attack = np.ones(size)
+    defence = np.ones(size)
+    home_advantage = prior_home_advantage
+
+    def total(index: np.ndarray, values: np.ndarray) -> np.ndarray:
+        return np.bincount(index, weights=weights * values, minlength=size)
+
+    scored = total(home, home_goals) + total(away, away_goals)
+    conceded = total(home, away_goals) + total(away, home_goals)
+    home_scored = np.sum(weights * home_goals)
+
+    for _ in range(iterations):
+        previous = attack.copy()
+        attack = (scored + prior) / (
+            total(home, home_advantage * defence[away])
+            + total(away, defence[home]) + prior)
+        defence = (conceded + prior) / (
+            total(home, attack[away]) + total(away, home_advantage * attack[home])
+            + prior)
+        home_advantage = (home_scored + prior * prior_home_advantage) / (
+            np.sum(weights * attack[home] * defence[away]) + prior)
+
+        # Strengths are only defined up to a common factor.
+        scale = np.exp(np.mean(np.log(attack)))
+        attack /= scale
+        defence *= scale
+        if np.max(np.abs(attack - previous)) < tolerance:
+            break
+
+    home_rate = home_advantage * attack[home] * defence[away]
+    away_rate = attack[away] * defence[home]
+    tau = dixon_coles_tau(home_goals, away_goals, home_rate, away_rate,
+                          RHO_GRID)
+    log_likelihood = np.sum(weights * np.log(np.maximum(tau, 1e-12)), axis=1)
+    rho = float(RHO_GRID[np.argmax(log_likelihood)]) if len(home) else 0.0
+
+    return SeasonModel(team_ids=team_ids, attack=attack, defence=defence,
+                       home_advantage=float(home_advantage), rho=rho,
+                       matches=len(home))
+
+
+def fit_arguments(fixtures: Fixtures, decay: float) -> Tuple:
+    """
+    Finished matches of a single season fixture set, weighted by
+    exp(-decay * days before the latest result).
+    """
+    finished = fixtures.finished
+    starts = fixtures.start_timestamp[finished]
+    if len(starts) and not np.all(np.isnat(starts)):
+        latest = np.nanmax(starts)
+        days = (latest - starts) / np.timedelta64(1, 'D')
+        weights = np.exp(-decay * np.nan_to_num(days, nan=0.0))
+    else:
+        weights = np.ones(len(starts))
+
+    return (fixtures.team_ids,
+            fixtures.home[finished],
+            fixtures.away[finished],
+            fixtures.home_goals[finished].astype(np.float64),
+            fixtures.away_goals[finished].astype(np.float64),
+            weights,
+            settings.MODEL_PRIOR_WEIGHT,
+            settings.MODEL_PRIOR_HOME_GOALS,
+            settings.MODEL_PRIOR_AWAY_GOALS)
+
+
+def scoreline_matrix(model: SeasonModel, home_rate: np.ndarray,
+                     away_rate: np.ndarray, max_goals: int) -> np.ndarray:
+    """
+    Scoreline probabilities shaped (events, home goals, away goals).
+    """
+    matrix = (poisson_pmf(home_rate, max_goals)[:, :, None]
+              * poisson_pmf(away_rate, max_goals)[:, None, :])
+    rho = model.rho
+    matrix[:, 0, 0] *= 1 - home_rate * away_rate * rho
+    matrix[:, 0, 1] *= 1 + home_rate * rho
+    matrix[:, 1, 0] *= 1 + away_rate * rho
+    matrix[:, 1, 1] *= 1 - rho
+    return matrix / matrix.sum(axis=(1, 2), keepdims=True)
+
+
+_pool: ProcessPoolExecutor | None = None
+_model_cache = SeasonCache(settings.MODEL_CACHE_SIZE)
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.MODEL_PROCESS_WORKERS)
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def get_season_models(db: AsyncSession,
+                            seasons: Sequence[Tuple[int, int | None]]
+                            ) -> List[SeasonModel]:
+    """
+    Fitted models of seasons from normal time scores. Seasons whose
+    events changed since their last fit are refitted concurrently in the
+    process pool, the event loop only loads the arrays.
+    """
+    loop = asyncio.get_running_loop()
+    models: List[SeasonModel | None] = [None] * len(seasons)
+    pending = list()
+
+    # The session can't be shared between tasks, db work stays sequential.
+    for index, (tournament_id, season_id) in enumerate(seasons):
+        key = (tournament_id, season_id)
+        version = await season_events_version(db, tournament_id, season_id)
+        models[index] = _model_cache.get(key, version)
+        if models[index] is not None:
+            continue
+
+        fixtures = await load_fixtures(db, [key], score='normaltime')
+        future = loop.run_in_executor(
+            get_process_pool(), fit_season,
+            *fit_arguments(fixtures, settings.MODEL_TIME_DECAY))
+        pending.append((index, key, version, future))
+
+    fitted = await asyncio.gather(*(future for *_, future in pending))
+    for (index, key, version, _), model in zip(pending, fitted):
+        logger.info(f"Model: fitted season {key} on {model.matches} "
+                    f"matches, rho={model.rho}.")
+        _model_cache.set(key, version, model)
+        models[index] = model
+    return models
+
+
+def build_predictions(model: SeasonModel, events: Sequence[TournamentEvent],
+                      max_goals: int) -> List[EventPrediction]:
+    home_ids = np.array([event.home_team_id for event in events],
+                        dtype=np.int64)
+    away_ids = np.array([event.away_team_id for event in events],
+                        dtype=np.int64)
+    home_rate, away_rate = model.expected_goals(home_ids, away_ids)
+    matrix = scoreline_matrix(model, home_rate, away_rate,
+                              settings.MODEL_MAX_GOALS)
+
+    home_win = np.tril(matrix, k=-1).sum(axis=(1, 2))
+    draw = np.trace(matrix, axis1=1, axis2=2)
+    away_win = np.triu(matrix, k=1).sum(axis=(1, 2))
+    shown = matrix[:, :max_goals + 1, :max_goals + 1]
+
+    return [
+        EventPrediction(
+            event_id=event.sofascore_id,
+            home_team_id=event.home_team_id,
+            away_team_id=event.away_team_id,
+            start_timestamp=event.start_timestamp,
+            home_expected_goals=float(home_rate[i]),
+            away_expected_goals=float(away_rate[i]),
+            home_win=float(home_win[i]),
+            draw=float(draw[i]),
+            away_win=float(away_win[i]),
+            scorelines=np.round(shown[i], 6).tolist(),
+        ) for i, event in enumerate(events)
+    ]
+
+
+async def predict_events(db: AsyncSession,
+                         events: Sequence[TournamentEvent],
+                         max_goals: int = 5) -> List[EventPrediction]:
+    """
+    Predicts events grouped by season, one vectorized pass per season.
+    """
+    seasons: Dict[Tuple[int, int | None], List[TournamentEvent]] = dict()
+    for event in events:
+        seasons.setdefault((event.tournament_id, event.season_id),
+                           list()).append(event)
+
+    models = await get_season_models(db, list(seasons))
+
+    predictions: List[EventPrediction] = list()
+    for model, season_events in zip(models, seasons.values()):
+        predictions.extend(build_predictions(model, season_events, max_goals))
+    return predictions
+
+
+async def get_upcoming_events(db: AsyncSession,
+                              tournament_id: int | None = None,
+                              season_id: int | None = None
+                              ) -> List[TournamentEvent]:
+    query = select(TournamentEvent).where(
+        TournamentEvent.status_type == 'notstarted')
+    if tournament_id is not None:
+        query = query.where(TournamentEvent.tournament_id == tournament_id)
+    if season_id is not None:
+        query = query.where(TournamentEvent.season_id == season_id)
+    query = query.order_by(TournamentEvent.start_timestamp,
+                           TournamentEvent.sofascore_id)
+    return (await db.exec(query)).all()
@@ -0,0 +1,209 @@
+import asyncio
+from enum import Enum
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics.elo import ratings_version
+from app.analytics.fixtures import (Fixtures, SeasonCache, load_fixtures,
+                                    load_team_names, season_events_version)
+from app.analytics.poisson import get_process_pool, get_season_models
+from app.analytics.standings import compute_standings
+from app.core.config import settings
+from app.models.analytics import SeasonSimulation, TeamSimulation
+from app.models.football import TeamRating
+
+
+# Positions counted by TeamSimulation.top_four.
+TOP_SPOTS = 4
+
+
+class SimulationModel(str, Enum):
+    DIXON_COLES = "dixon_coles"
+    ELO = "elo"
+
+
+class SimulationInput(NamedTuple):
+    """
+    Current table and remaining fixtures of one season, in team slots.
+    """
+    points: np.ndarray
+    goal_difference: np.ndarray
+    goals_for: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+    home_rate: np.ndarray
+    away_rate: np.ndarray
+
+
+def simulate_chunk(seed: np.random.SeedSequence, runs: int,
+                   data: SimulationInput) -> np.ndarray:
+    """
+    Plays the remaining fixtures `runs` times and returns how often each
+    team finished in each position, shaped (teams, positions).
+
+    Goals are drawn from independent Poissons for the whole
+    (runs, matches) matrix at once and folded into per team totals with
+    one-hot matrix products, so there is no per match or per run loop.
+    """
+    rng = np.random.default_rng(seed)
+    teams = len(data.points)
+    matches = len(data.home)
+
+    home_goals = rng.poisson(data.home_rate, size=(runs, matches))
+    away_goals = rng.poisson(data.away_rate, size=(runs, matches))
+
+    home_onehot = np.zeros((matches, teams), dtype=np.float32)
+    home_onehot[np.arange(matches), data.home] = 1
+    away_onehot = np.zeros((matches, teams), dtype=np.float32)
+    away_onehot[np.arange(matches), data.away] = 1
+
+    home_points = np.where(home_goals > away_goals, 3,
+                           (home_goals == away_goals).astype(np.int64))
+    away_points = np.where(away_goals > home_goals, 3,
+                           (home_goals == away_goals).astype(np.int64))
+    difference = (home_goals - away_goals).astype(np.float32)
+
+    points = data.points + (home_points.astype(np.float32) @ home_onehot
+                            + away_points.astype(np.float32) @ away_onehot)
+    goal_difference = data.goal_difference + (difference @ home_onehot
+                                              - difference @ away_onehot)
+    goals_for = data.goals_for + (home_goals.astype(np.float32) @ home_onehot
+                                  + away_goals.astype(np.float32) @ away_onehot)
+
+    # Points, goal difference, goals for, then a coin toss.
+    order = np.lexsort((rng.random((runs, teams)), -goals_for,
+                        -goal_difference, -points), axis=-1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order,
+                      np.broadcast_to(np.arange(teams), order.shape), axis=-1)
+
+    cells = np.arange(teams) * teams + positions
+    return np.bincount(cells.reshape(-1),
+                       minlength=teams * teams).reshape(teams, teams)
+
+
+async def simulate(data: SimulationInput, runs: int, seed: int) -> np.ndarray:
+    """
+    Splits the runs in SIMULATION_CHUNK_SIZE chunks over the process pool.
+    Each chunk gets its own child of SeedSequence(seed), so results only
+    depend on the seed, not on the scheduling.
+    """
+    chunk_size = settings.SIMULATION_CHUNK_SIZE
+    chunks = [min(chunk_size, runs - start)
+              for start in range(0, runs, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    loop = asyncio.get_running_loop()
+    counts = await asyncio.gather(*(
+        loop.run_in_executor(get_process_pool(), simulate_chunk,
+                             chunk_seed, chunk_runs, data)
+        for chunk_seed, chunk_runs in zip(seeds, chunks)))
+    return np.sum(counts, axis=0)
+
+
+async def elo_rates(db: AsyncSession, fixtures: Fixtures,
+                    home: np.ndarray, away: np.ndarray
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scoring rates from the Elo difference around the season's average
+    home and away goals: 400 points multiply the rate ratio by 10.
+    """
+    rows = (await db.exec(select(TeamRating.team_id, TeamRating.rating).where(
+        TeamRating.team_id.in_(fixtures.team_ids.tolist())))).all()
+    ratings = dict(rows)
+    rating = np.array([ratings.get(team_id, settings.ELO_INITIAL_RATING)
+                       for team_id in fixtures.team_ids.tolist()])
+
+    finished = fixtures.finished
+    average_home = fixtures.home_goals[finished].mean() if finished.any() else 1.5
+    average_away = fixtures.away_goals[finished].mean() if finished.any() else 1.1
+    difference = rating[home] - rating[away]
+    return (average_home * 10 ** (difference / 800),
+            average_away * 10 ** (-difference / 800))
+
+
+_simulation_cache = SeasonCache(settings.SIMULATION_CACHE_SIZE)
+
+
+async def simulate_season(db: AsyncSession, tournament_id: int,
+                          season_id: int, runs: int,
+                          model: SimulationModel = SimulationModel.DIXON_COLES,
+                          relegation_spots: int = 3,
+                          seed: int = 0) -> SeasonSimulation:
+    """
+    Title, top four and relegation probabilities from `runs` simulations
+    of the season's remaining fixtures, memoized until its events change
+    (and, for Elo, until the ratings move).
+    """
+    key = (tournament_id, season_id, runs, model, relegation_spots, seed)
+    version = await season_events_version(db, tournament_id, season_id)
+    if model == SimulationModel.ELO:
+        version = (version, await ratings_version(db))
+    cached = _simulation_cache.get(key, version)
+    if cached is not None:
+        return cached
+
+    fixtures = await load_fixtures(db, [(tournament_id, season_id)])
+    teams = fixtures.slots
+    if relegation_spots > max(teams - TOP_SPOTS, 0):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"relegation_spots must leave the top {TOP_SPOTS} of "
+                   f"the {teams} teams out of the relegation zone.")
+
+    table = compute_standings(fixtures)
+    upcoming = fixtures.upcoming
+    home, away = fixtures.home[upcoming], fixtures.away[upcoming]
+
+    if model == SimulationModel.ELO:
+        home_rate, away_rate = await elo_rates(db, fixtures, home, away)
+    else:
+        season_model, = await get_season_models(
+            db, [(tournament_id, season_id)])
+        home_rate, away_rate = season_model.expected_goals(
+            fixtures.team_ids[home], fixtures.team_ids[away])
+
+    data = SimulationInput(
+        points=table.points.astype(np.float32),
+        goal_difference=table.goal_difference.astype(np.float32),
+        goals_for=table.goals_for.astype(np.float32),
+        home=home,
+        away=away,
+        home_rate=home_rate,
+        away_rate=away_rate,
+    )
+    counts = await simulate(data, runs, seed)
+    probabilities = counts / runs
+
+    team_names = await load_team_names(db, fixtures.team_ids)
+
+    rows: List[TeamSimulation] = list()
+    for slot, team_id in enumerate(fixtures.team_ids.tolist()):
+        positions = probabilities[slot]
+        rows.append(TeamSimulation(
+            team_id=team_id,
+            team_name=team_names.get(team_id),
+            points=int(table.points[slot]),
+            expected_position=float(np.dot(np.arange(1, teams + 1), positions)),
+            title=float(positions[0]),
+            top_four=float(positions[:TOP_SPOTS].sum()),
+            relegation=float(positions[teams - relegation_spots:].sum())
+            if relegation_spots else 0.0,
+            positions=np.round(positions, 6).tolist(),
+        ))
+    rows.sort(key=lambda row: row.expected_position)
+
+    result = SeasonSimulation(
+        tournament_id=tournament_id,
+        season_id=season_id,
+        runs=runs,
+        model=model.value,
+        remaining_matches=len(home),
+        teams=rows,
+    )
+    _simulation_cache.set(key, version, result)
+    return result
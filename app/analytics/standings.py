@@ -0,0 +1,305 @@
+from typing import Dict, List, NamedTuple, Sequence
+
+import numpy as np
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics.fixtures import (Fixtures, SeasonCache, SeasonKey,
+                                    load_fixtures, load_team_names,
+                                    season_events_version)
+from app.core.config import settings
+from app.models.analytics import (SeasonStandings, StandingRow,
+                                  StandingsHistory, TeamStandingsHistory,
+                                  TieBreaker)
+
+
+DEFAULT_TIE_BREAKERS = (TieBreaker.POINTS, TieBreaker.GOAL_DIFFERENCE,
+                        TieBreaker.GOALS_FOR)
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+
+class Table(NamedTuple):
+    """
+    Standings columns, one entry per team slot of the fixtures.
+    """
+    played: np.ndarray
+    wins: np.ndarray
+    draws: np.ndarray
+    losses: np.ndarray
+    goals_for: np.ndarray
+    goals_against: np.ndarray
+    goal_difference: np.ndarray
+    points: np.ndarray
+    position: np.ndarray
+
+
+def scatter(index: np.ndarray, weights: np.ndarray, size: int) -> np.ndarray:
+    return np.bincount(index, weights=weights, minlength=size).astype(np.int64)
+
+
+def head_to_head(fixtures: Fixtures, group: np.ndarray,
+                 win_points: int = WIN_POINTS,
+                 draw_points: int = DRAW_POINTS) -> List[np.ndarray]:
+    """
+    Points and goal difference of every slot counting only the finished
+    matches against teams of the same `group` (teams still tied on the
+    previous criteria).
+    """
+    mask = fixtures.finished & (group[fixtures.home] == group[fixtures.away])
+    home, away = fixtures.home[mask], fixtures.away[mask]
+    home_goals, away_goals = fixtures.home_goals[mask], fixtures.away_goals[mask]
+
+    home_points = np.where(home_goals > away_goals, win_points,
+                           np.where(home_goals == away_goals, draw_points, 0))
+    away_points = np.where(away_goals > home_goals, win_points,
+                           np.where(home_goals == away_goals, draw_points, 0))
+    difference = home_goals - away_goals
+
+    size = fixtures.slots
+    points = scatter(home, home_points, size) + scatter(away, away_points, size)
+    goal_difference = (scatter(home, difference, size)
+                       - scatter(away, difference, size))
+    return [points, goal_difference]
+
+
+def tie_groups(keys: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Numbers the slots so that slots with identical `keys` share a group.
+    """
+    _, group = np.unique(np.stack(keys, axis=1), axis=0, return_inverse=True)
+    return group.reshape(-1)
+
+
+def compute_standings(fixtures: Fixtures,
+                      tie_breakers: Sequence[TieBreaker] = DEFAULT_TIE_BREAKERS,
+                      win_points: int = WIN_POINTS,
+                      draw_points: int = DRAW_POINTS) -> Table:
+    """
+    Computes the tables of every season in `fixtures` at once.
+
+    All totals are scatter-adds over the match arrays. Head-to-head
+    criteria are evaluated among the teams still tied on the criteria
+    before them, e.g. (points, head_to_head, goal_difference) for
+    La Liga style rules. Remaining ties are broken by team id.
+    """
+    size = fixtures.slots
+    finished = fixtures.finished
+    home, away = fixtures.home[finished], fixtures.away[finished]
+    home_goals = fixtures.home_goals[finished]
+    away_goals = fixtures.away_goals[finished]
+
+    home_win = home_goals > away_goals
+    away_win = away_goals > home_goals
+    draw = home_goals == away_goals
+
+    played = scatter(home, np.ones(len(home)), size) + \
+        scatter(away, np.ones(len(away)), size)
+    wins = scatter(home, home_win, size) + scatter(away, away_win, size)
+    draws = scatter(home, draw, size) + scatter(away, draw, size)
+    goals_for = scatter(home, home_goals, size) + \
+        scatter(away, away_goals, size)
+    goals_against = scatter(home, away_goals, size) + \
+        scatter(away, home_goals, size)
+    points = win_points * wins + draw_points * draws
+
+    criteria = {
+        TieBreaker.POINTS: points,
+        TieBreaker.GOAL_DIFFERENCE: goals_for - goals_against,
+        TieBreaker.GOALS_FOR: goals_for,
+        TieBreaker.WINS: wins,
+    }
+
+    # Sort keys, most significant first, the table always leads.
+    keys: List[np.ndarray] = [fixtures.table]
+    for tie_breaker in tie_breakers:
+        if tie_breaker in criteria:
+            keys.append(-criteria[tie_breaker])
+            continue
+
+        h2h_points, h2h_difference = head_to_head(
+            fixtures, tie_groups(keys), win_points, draw_points)
+        keys.append(-(h2h_points if tie_breaker == TieBreaker.HEAD_TO_HEAD
+                      else h2h_difference))
+
+    # lexsort treats the last key as the primary one.
+    order = np.lexsort([fixtures.team_ids] + keys[::-1])
+    sorted_table = fixtures.table[order]
+    first = np.searchsorted(sorted_table, sorted_table, side='left')
+    position = np.empty(size, dtype=np.int64)
+    position[order] = np.arange(size) - first + 1
+
+    return Table(
+        played=played,
+        wins=wins,
+        draws=draws,
+        losses=played - wins - draws,
+        goals_for=goals_for,
+        goals_against=goals_against,
+        goal_difference=goals_for - goals_against,
+        points=points,
+        position=position,
+    )
+
+
+def standing_rows(fixtures: Fixtures, table: Table, index: int,
+                  team_names: Dict[int, str]) -> List[StandingRow]:
+    slots = fixtures.slots_of(index)
+    slots = slots[np.argsort(table.position[slots])]
+
+    return [
+        StandingRow(
+            position=int(table.position[slot]),
+            team_id=int(fixtures.team_ids[slot]),
+            team_name=team_names.get(int(fixtures.team_ids[slot])),
+            played=int(table.played[slot]),
+            wins=int(table.wins[slot]),
+            draws=int(table.draws[slot]),
+            losses=int(table.losses[slot]),
+            goals_for=int(table.goals_for[slot]),
+            goals_against=int(table.goals_against[slot]),
+            goal_difference=int(table.goal_difference[slot]),
+            points=int(table.points[slot]),
+        ) for slot in slots
+    ]
+
+
+async def get_standings(db: AsyncSession,
+                        seasons: Sequence[SeasonKey],
+                        tie_breakers: Sequence[TieBreaker] = DEFAULT_TIE_BREAKERS
+                        ) -> List[SeasonStandings]:
+    """
+    Standings of many seasons from one query and one vectorized pass.
+    """
+    fixtures = await load_fixtures(db, seasons)
+    table = compute_standings(fixtures, tie_breakers)
+    team_names = await load_team_names(db, fixtures.team_ids)
+
+    return [
+        SeasonStandings(
+            tournament_id=tournament_id,
+            season_id=season_id,
+            standings=standing_rows(fixtures, table, index, team_names),
+        ) for index, (tournament_id, season_id) in enumerate(fixtures.seasons)
+    ]
+
+
+HISTORY_TIE_BREAKERS = (TieBreaker.POINTS, TieBreaker.GOAL_DIFFERENCE,
+                        TieBreaker.GOALS_FOR, TieBreaker.WINS)
+
+
+class TableHistory(NamedTuple):
+    """
+    Cumulative standings after every match date, shaped (dates, slots).
+    """
+    dates: np.ndarray
+    points: np.ndarray
+    goal_difference: np.ndarray
+    goals_for: np.ndarray
+    position: np.ndarray
+
+
+def compute_standings_history(fixtures: Fixtures,
+                              tie_breakers: Sequence[TieBreaker] = DEFAULT_TIE_BREAKERS,
+                              win_points: int = WIN_POINTS,
+                              draw_points: int = DRAW_POINTS) -> TableHistory:
+    """
+    Table of a single season after every date with finished matches.
+
+    Per date deltas are scattered into a (dates, slots) matrix and turned
+    into running totals with one cumsum, then every row is ranked at once
+    with a lexsort along the last axis. Head-to-head criteria are not
+    supported here.
+    """
+    size = fixtures.slots
+    finished = fixtures.finished & ~np.isnat(fixtures.start_timestamp)
+    home, away = fixtures.home[finished], fixtures.away[finished]
+    home_goals = fixtures.home_goals[finished]
+    away_goals = fixtures.away_goals[finished]
+
+    dates, day = np.unique(
+        fixtures.start_timestamp[finished].astype('datetime64[D]'),
+        return_inverse=True)
+    cells = len(dates) * size
+
+    def matrix(slot: np.ndarray, values: np.ndarray) -> np.ndarray:
+        return np.bincount(day.reshape(-1) * size + slot, weights=values,
+                           minlength=cells).reshape(len(dates), size)
+
+    home_points = np.where(home_goals > away_goals, win_points,
+                           np.where(home_goals == away_goals, draw_points, 0))
+    away_points = np.where(away_goals > home_goals, win_points,
+                           np.where(home_goals == away_goals, draw_points, 0))
+    difference = home_goals - away_goals
+
+    points = matrix(home, home_points) + matrix(away, away_points)
+    goal_difference = matrix(home, difference) - matrix(away, difference)
+    goals_for = matrix(home, home_goals) + matrix(away, away_goals)
+    wins = matrix(home, home_goals > away_goals) + \
+        matrix(away, away_goals > home_goals)
+
+    totals = {
+        TieBreaker.POINTS: points,
+        TieBreaker.GOAL_DIFFERENCE: goal_difference,
+        TieBreaker.GOALS_FOR: goals_for,
+        TieBreaker.WINS: wins,
+    }
+    totals = {key: np.cumsum(value, axis=0).astype(np.int64)
+              for key, value in totals.items()}
+
+    team_ids = np.broadcast_to(fixtures.team_ids, (len(dates), size))
+    keys = [team_ids] + [-totals[tie_breaker]
+                         for tie_breaker in reversed(tie_breakers)
+                         if tie_breaker in totals]
+    order = np.lexsort(keys, axis=-1)
+    position = np.empty((len(dates), size), dtype=np.int64)
+    np.put_along_axis(position, order,
+                      np.broadcast_to(np.arange(1, size + 1), order.shape),
+                      axis=-1)
+
+    return TableHistory(
+        dates=dates,
+        points=totals[TieBreaker.POINTS],
+        goal_difference=totals[TieBreaker.GOAL_DIFFERENCE],
+        goals_for=totals[TieBreaker.GOALS_FOR],
+        position=position,
+    )
+
+
+_history_cache = SeasonCache(settings.STANDINGS_HISTORY_CACHE_SIZE)
+
+
+async def get_standings_history(
+        db: AsyncSession, tournament_id: int, season_id: int,
+        tie_breakers: Sequence[TieBreaker] = DEFAULT_TIE_BREAKERS
+) -> StandingsHistory:
+    """
+    Points and position of every team after each match date, cached
+    until the season's events change.
+    """
+    key = (tournament_id, season_id, tuple(tie_breakers))
+    version = await season_events_version(db, tournament_id, season_id)
+
+    cached = _history_cache.get(key, version)
+    if cached is not None:
+        return cached
+
+    fixtures = await load_fixtures(db, [(tournament_id, season_id)])
+    history = compute_standings_history(fixtures, tie_breakers)
+    team_names = await load_team_names(db, fixtures.team_ids)
+
+    result = StandingsHistory(
+        tournament_id=tournament_id,
+        season_id=season_id,
+        dates=history.dates.tolist(),
+        teams=[
+            TeamStandingsHistory(
+                team_id=int(team_id),
+                team_name=team_names.get(int(team_id)),
+                points=history.points[:, slot].tolist(),
+                positions=history.position[:, slot].tolist(),
+            ) for slot, team_id in enumerate(fixtures.team_ids)
+        ],
+    )
+
+    _history_cache.set(key, version, result)
+    return result
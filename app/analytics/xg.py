@@ -0,0 +1,222 @@
+from datetime import datetime
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+from sqlmodel import col, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics.fixtures import load_team_names
+from app.core.config import settings
+from app.models.analytics import (SeasonTeamXG, SeasonXG, ShotDensity,
+                                  TeamMatchXG, TeamXG)
+from app.models.football import SHOT_OUTCOMES, EventShot, TournamentEvent
+
+
+GOAL = SHOT_OUTCOMES.index('goal')
+
+
+class Shots(NamedTuple):
+    """
+    Shots as flat arrays, xg is NaN where sofascore has none.
+    """
+    event_id: np.ndarray
+    team_id: np.ndarray
+    opponent_id: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    xg: np.ndarray
+    outcome: np.ndarray
+
+    @property
+    def goal(self) -> np.ndarray:
+        return self.outcome == GOAL
+
+
+async def load_shots(db: AsyncSession, season_id: int | None = None,
+                     team_id: int | None = None) -> Shots:
+    """
+    Shots of a season, of a team (taken and faced) or of a team in a
+    season, in one columnar query.
+    """
+    query = select(EventShot.event_id, EventShot.team_id,
+                   EventShot.opponent_id, EventShot.x, EventShot.y,
+                   EventShot.xg, EventShot.outcome)
+    if season_id is not None:
+        query = query.where(EventShot.season_id == season_id)
+    if team_id is not None:
+        query = query.where(or_(EventShot.team_id == team_id,
+                                EventShot.opponent_id == team_id))
+    rows = (await db.exec(query)).all()
+
+    columns = list(zip(*rows)) if rows else [()] * len(Shots._fields)
+    dtypes = (np.int64, np.int64, np.int64, np.float64, np.float64,
+              np.float64, np.int16)
+    return Shots(*(np.array(column, dtype=dtype)
+                   for column, dtype in zip(columns, dtypes)))
+
+
+async def load_event_times(db: AsyncSession, event_ids: np.ndarray
+                           ) -> Dict[int, datetime | None]:
+    if not len(event_ids):
+        return dict()
+    rows = await db.exec(select(TournamentEvent.sofascore_id,
+                                TournamentEvent.start_timestamp).where(
+        col(TournamentEvent.sofascore_id).in_(event_ids.tolist())))
+    return dict(rows.all())
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Mean of the last `window` values at every position, of fewer at the
+    start.
+    """
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    end = np.arange(1, len(values) + 1)
+    start = np.maximum(end - window, 0)
+    return (sums[end] - sums[start]) / (end - start)
+
+
+def shot_density(shots: Shots, mask: np.ndarray,
+                 bins: int) -> ShotDensity:
+    """
+    Shots, xg and goals per cell of a bins x bins grid over the pitch
+    coordinates, every shot is binned once.
+    """
+    x = np.clip((shots.x[mask] * bins / 100).astype(np.int64), 0, bins - 1)
+    y = np.clip((shots.y[mask] * bins / 100).astype(np.int64), 0, bins - 1)
+    cells = x * bins + y
+    size = bins * bins
+
+    counts = np.bincount(cells, minlength=size)
+    xg = np.bincount(cells, weights=np.nan_to_num(shots.xg[mask]),
+                     minlength=size)
+    goals = np.bincount(cells, weights=shots.goal[mask], minlength=size)
+    return ShotDensity(
+        bins=bins,
+        shots=int(mask.sum()),
+        counts=counts.reshape(bins, bins).tolist(),
+        xg=np.round(xg, 4).reshape(bins, bins).tolist(),
+        goals=goals.astype(np.int64).reshape(bins, bins).tolist(),
+    )
+
+
+async def get_team_xg(db: AsyncSession, team_id: int,
+                      season_id: int | None = None,
+                      window: int = settings.XG_TREND_WINDOW) -> TeamXG:
+    """
+    xG for and against of a team per match, in kick off order, with the
+    rolling xG difference over the last `window` matches.
+    """
+    shots = await load_shots(db, season_id=season_id, team_id=team_id)
+    events, match = np.unique(shots.event_id, return_inverse=True)
+    count = len(events)
+
+    own = shots.team_id == team_id
+    xg = np.nan_to_num(shots.xg)
+
+    def per_match(weights: np.ndarray) -> np.ndarray:
+        return np.bincount(match, weights=weights, minlength=count)
+
+    xg_for, xg_against = per_match(xg * own), per_match(xg * ~own)
+    shots_for, shots_against = per_match(own), per_match(~own)
+    goals_for = per_match(shots.goal & own)
+    goals_against = per_match(shots.goal & ~own)
+    opponents = np.zeros(count, dtype=np.int64)
+    opponents[match] = np.where(own, shots.opponent_id, shots.team_id)
+
+    times = await load_event_times(db, events)
+    order = sorted(range(count), key=lambda index: (
+        times.get(int(events[index])) is None,
+        times.get(int(events[index])) or 0, int(events[index])))
+    difference = (xg_for - xg_against)[order]
+    trend = rolling_mean(difference, window)
+
+    matches: List[TeamMatchXG] = list()
+    for position, index in enumerate(order):
+        matches.append(TeamMatchXG(
+            event_id=int(events[index]),
+            start_timestamp=times.get(int(events[index])),
+            opponent_id=int(opponents[index]),
+            shots_for=int(shots_for[index]),
+            shots_against=int(shots_against[index]),
+            goals_for=int(goals_for[index]),
+            goals_against=int(goals_against[index]),
+            xg_for=round(float(xg_for[index]), 4),
+            xg_against=round(float(xg_against[index]), 4),
+            xg_difference=round(float(difference[position]), 4),
+            rolling_xg_difference=round(float(trend[position]), 4),
+        ))
+
+    return TeamXG(
+        team_id=team_id,
+        season_id=season_id,
+        matches=count,
+        shots_for=int(shots_for.sum()),
+        shots_against=int(shots_against.sum()),
+        goals_for=int(goals_for.sum()),
+        goals_against=int(goals_against.sum()),
+        xg_for=round(float(xg_for.sum()), 4),
+        xg_against=round(float(xg_against.sum()), 4),
+        xg_difference=round(float(difference.sum()), 4),
+        trend=matches,
+    )
+
+
+async def get_season_xg(db: AsyncSession, tournament_id: int,
+                        season_id: int) -> SeasonXG:
+    """
+    xG for and against of every team of a season, from one pass over
+    the season's shots.
+    """
+    shots = await load_shots(db, season_id=season_id)
+    shooters = len(shots.team_id)
+    team_ids, slots = np.unique(
+        np.concatenate((shots.team_id, shots.opponent_id)),
+        return_inverse=True)
+    teams = len(team_ids)
+    shooter, opponent = slots[:shooters], slots[shooters:]
+
+    xg = np.nan_to_num(shots.xg)
+    xg_for = np.bincount(shooter, weights=xg, minlength=teams)
+    xg_against = np.bincount(opponent, weights=xg, minlength=teams)
+    goals_for = np.bincount(shooter, weights=shots.goal, minlength=teams)
+    goals_against = np.bincount(opponent, weights=shots.goal,
+                                minlength=teams)
+    played = np.unique(np.stack((
+        slots, np.concatenate((shots.event_id, shots.event_id)))), axis=1)
+    matches = np.bincount(played[0], minlength=teams)
+
+    team_names = await load_team_names(db, team_ids)
+    rows = [SeasonTeamXG(
+        team_id=int(team_id),
+        team_name=team_names.get(int(team_id)),
+        matches=int(matches[slot]),
+        goals_for=int(goals_for[slot]),
+        goals_against=int(goals_against[slot]),
+        xg_for=round(float(xg_for[slot]), 4),
+        xg_against=round(float(xg_against[slot]), 4),
+        xg_difference=round(float(xg_for[slot] - xg_against[slot]), 4),
+    ) for slot, team_id in enumerate(team_ids.tolist())]
+    rows.sort(key=lambda row: -row.xg_difference)
+
+    return SeasonXG(tournament_id=tournament_id, season_id=season_id,
+                    teams=rows)
+
+
+async def get_shot_density(db: AsyncSession, season_id: int | None = None,
+                           team_id: int | None = None,
+                           against: bool = False,
+                           bins: int = settings.SHOT_DENSITY_BINS
+                           ) -> ShotDensity:
+    """
+    Where shots were taken from, by a team (or against it with
+    `against`) or by everyone in a season.
+    """
+    shots = await load_shots(db, season_id=season_id, team_id=team_id)
+    if team_id is None:
+        mask = np.ones(len(shots.team_id), dtype=bool)
+    elif against:
+        mask = shots.opponent_id == team_id
+    else:
+        mask = shots.team_id == team_id
+    return shot_density(shots, mask, bins)
@@ -4,7 +4,8 @@ from fastapi import APIRouter
 
 
 router = APIRouter(prefix="/v1")
-routes = ("user", 'scraping', "tournament", "category", )
+routes = ("user", 'scraping', "tournament", "category", "event", "team",
+          "stats", "player", )
 
 for module_name in routes:
     api_module = import_module(f"app.api.routes.v1.{module_name}")
@@ -1,15 +1,22 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.db.session import get_session
+from app.core.response_cache import (CATEGORIES, TOURNAMENTS, dump_json,
+                                     response_cache)
 from app.models.football import CategoryPublic, PublicCategoryWithTournament
-from app.crud.tournament import category_service
+from app.crud.tournament import LoadProfile, category_service
 
 from app.logger import logger
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
+categories_adapter = TypeAdapter(List[CategoryPublic])
+categories_with_tournaments_adapter = TypeAdapter(
+    List[PublicCategoryWithTournament])
+
 
 @router.get(
     "/",
@@ -19,9 +26,13 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 )
 async def get_categories(*,
                          session: AsyncSession = Depends(get_session)):
-    try:
+    async def build() -> bytes:
         categories = await category_service.get_all_categories(db=session)
-        return categories
+        return dump_json(categories_adapter, categories)
+
+    try:
+        return await response_cache.response(
+            "categories", (CATEGORIES,), build)
     except Exception as e:
         logger.error(f"Get Categories: Unexpected error {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -37,9 +48,14 @@ async def get_categories(*,
 async def get_categories_with_tournaments(*,
                                           session: AsyncSession = Depends(
                                               get_session)):
+    async def build() -> bytes:
+        categories = await category_service.get_all_categories(
+            db=session, profile=LoadProfile.SHALLOW)
+        return dump_json(categories_with_tournaments_adapter, categories)
+
     try:
-        categories = await category_service.get_all_categories(db=session)
-        return categories
+        return await response_cache.response(
+            "categories:tournaments", (CATEGORIES, TOURNAMENTS), build)
     except Exception as e:
         logger.error(f"Get Categories: Unexpected error {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,148 @@
+import os
+import tempfile
+from datetime import datetime
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.logger import logger
+from app.core.config import settings
+
+from app.models.base import Page
+from app.exports.arrow import (ARROW_MEDIA_TYPES, ArrowFormat, select_schema,
+                               write_events)
+from app.exports.events import events_export_query
+from app.models.analytics import EventPrediction
+from app.models.football import PublicTournamentEventWithTeams
+from app.analytics.poisson import get_upcoming_events, predict_events
+from app.db.session import get_session
+from app.crud.tournament import LoadProfile, tournament_event_service
+
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    summary="Get football events, oldest kick off first.",
+    response_model=Page[PublicTournamentEventWithTeams]
+)
+async def get_events(*,
+                     tournament_id: int | None = None,
+                     season_id: int | None = None,
+                     team_id: int | None = None,
+                     status_type: str | None = None,
+                     start_from: datetime | None = None,
+                     start_to: datetime | None = None,
+                     cursor: str | None = None,
+                     limit: int = Query(settings.DEFAULT_PAGE_SIZE,
+                                        ge=1, le=settings.MAX_PAGE_SIZE),
+                     session: AsyncSession = Depends(get_session),):
+    try:
+        events, next_cursor = await tournament_event_service.get_events_page(
+            session,
+            cursor=cursor,
+            limit=limit,
+            tournament_id=tournament_id,
+            season_id=season_id,
+            team_id=team_id,
+            status_type=status_type,
+            start_from=start_from,
+            start_to=start_to,
+            profile=LoadProfile.WITH_TEAMS,
+        )
+
+        return Page(items=events, next_cursor=next_cursor)
+    except HTTPException:
+        raise
+    except ResponseValidationError as rve:
+        logger.error(f"Get Events: Response error {str(rve)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(rve)
+        )
+    except Exception as e:
+        logger.error(f"Get Events: Unexpected error {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=str(e))
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Download events as a Parquet or Arrow IPC file.",
+    response_class=FileResponse,
+)
+async def export_events_file(*,
+                             format: ArrowFormat = ArrowFormat.PARQUET,
+                             tournament_id: int | None = None,
+                             season_id: int | None = None,
+                             start_from: datetime | None = None,
+                             start_to: datetime | None = None,
+                             columns: List[str] | None = Query(None)):
+    try:
+        schema = select_schema(columns)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=str(exc))
+
+    query = events_export_query(tournament_id=tournament_id,
+                                season_id=season_id,
+                                start_from=start_from,
+                                start_to=start_to,
+                                columns=schema.names)
+
+    # Both writers need a seekable sink, the file is removed once sent.
+    fd, path = tempfile.mkstemp(suffix=f".{format.value}")
+    os.close(fd)
+    try:
+        await write_events(query, path, format, schema)
+    except Exception as e:
+        os.unlink(path)
+        logger.error(f"Export Events: Unexpected error {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=str(e))
+
+    return FileResponse(
+        path,
+        media_type=ARROW_MEDIA_TYPES[format],
+        filename=f"events.{format.value}",
+        background=BackgroundTask(os.unlink, path),
+    )
+
+
+@router.get(
+    "/predictions",
+    status_code=status.HTTP_200_OK,
+    summary="Predict every upcoming (not started) event.",
+)
+async def get_upcoming_predictions(*,
+                                   tournament_id: int | None = None,
+                                   season_id: int | None = None,
+                                   max_goals: int = Query(5, ge=0, le=10),
+                                   session: AsyncSession = Depends(get_session)
+                                   ) -> List[EventPrediction]:
+    events = await get_upcoming_events(session, tournament_id=tournament_id,
+                                       season_id=season_id)
+    return await predict_events(session, events, max_goals=max_goals)
+
+
+@router.get(
+    "/{event_id}/prediction",
+    status_code=status.HTTP_200_OK,
+    summary="Scoreline probabilities of an event.",
+)
+async def get_event_prediction(*,
+                               event_id: int,
+                               max_goals: int = Query(5, ge=0, le=10),
+                               session: AsyncSession = Depends(get_session)
+                               ) -> EventPrediction:
+    event = await tournament_event_service.get_event_by_id(session, event_id)
+    if event is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=f"No event found with ID {event_id}.")
+    prediction, = await predict_events(session, [event], max_goals=max_goals)
+    return prediction
@@ -0,0 +1,70 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics.heatmaps import get_player_heatmap
+from app.analytics.players import get_player_appearances, get_player_seasons
+from app.core.config import settings
+from app.crud.tournament import player_service
+from app.db.session import get_session
+from app.models.analytics import PlayerHeatmap, PlayerSeasonTotals
+from app.models.football import EventAppearanceBase, PlayerBase
+
+
+router = APIRouter(prefix="/players", tags=["players"])
+
+
+@router.get(
+    "/{player_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Get a player by ID.",
+    response_model=PlayerBase,
+)
+async def get_player(*,
+                     player_id: int,
+                     session: AsyncSession = Depends(get_session)):
+    return await player_service.get_player_by_id(session, player_id)
+
+
+@router.get(
+    "/{player_id}/seasons",
+    status_code=status.HTTP_200_OK,
+    summary="Appearances, minutes and average rating of a player per "
+            "season.",
+    response_model=List[PlayerSeasonTotals],
+)
+async def get_player_season_totals(*,
+                                   player_id: int,
+                                   session: AsyncSession = Depends(
+                                       get_session)):
+    return await get_player_seasons(session, player_id)
+
+
+@router.get(
+    "/{player_id}/appearances",
+    status_code=status.HTTP_200_OK,
+    summary="Latest lineup appearances of a player.",
+    response_model=List[EventAppearanceBase],
+)
+async def get_appearances(*,
+                          player_id: int,
+                          season_id: int | None = None,
+                          limit: int = Query(settings.DEFAULT_PAGE_SIZE,
+                                             ge=1, le=settings.MAX_PAGE_SIZE),
+                          session: AsyncSession = Depends(get_session)):
+    return await get_player_appearances(session, player_id,
+                                        season_id=season_id, limit=limit)
+
+
+@router.get(
+    "/{player_id}/heatmap",
+    status_code=status.HTTP_200_OK,
+    summary="Heatmap of a player summed over the stored matches, or over "
+            "those of a season.",
+)
+async def get_heatmap(*,
+                      player_id: int,
+                      season_id: int | None = None,
+                      session: AsyncSession = Depends(get_session)
+                      ) -> PlayerHeatmap:
+    return await get_player_heatmap(session, player_id, season_id=season_id)
@@ -0,0 +1,69 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics.leaderboards import get_leaderboard, get_stat_keys
+from app.analytics.xg import get_shot_density
+from app.core.config import settings
+from app.db.session import get_session
+from app.models.analytics import (LeaderboardScope, ShotDensity,
+                                  StatLeaderboard)
+from app.models.football import StatKey
+
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get(
+    "/keys",
+    status_code=status.HTTP_200_OK,
+    summary="Statistic keys stored from match statistics.",
+    response_model=List[StatKey],
+)
+async def get_statistic_keys(session: AsyncSession = Depends(get_session)):
+    return await get_stat_keys(session)
+
+
+@router.get(
+    "/leaderboard",
+    status_code=status.HTTP_200_OK,
+    summary="Teams ranked by their average of a statistic, or the best "
+            "single match values of it.",
+)
+async def get_stat_leaderboard(
+    *,
+    stat: str,
+    season_id: int | None = None,
+    period: str = "ALL",
+    scope: LeaderboardScope = LeaderboardScope.TEAM,
+    ascending: bool = False,
+    min_matches: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=settings.MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session)
+) -> StatLeaderboard:
+    return await get_leaderboard(session, stat, season_id=season_id,
+                                 period=period, scope=scope,
+                                 ascending=ascending,
+                                 min_matches=min_matches, limit=limit)
+
+
+@router.get(
+    "/shots/density",
+    status_code=status.HTTP_200_OK,
+    summary="Shots, xG and goals per pitch cell of a season or a team.",
+)
+async def get_shot_location_density(
+    *,
+    season_id: int | None = None,
+    team_id: int | None = None,
+    against: bool = False,
+    bins: int = Query(settings.SHOT_DENSITY_BINS, ge=1, le=100),
+    session: AsyncSession = Depends(get_session)
+) -> ShotDensity:
+    if season_id is None and team_id is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="A season or a team is required.")
+
+    return await get_shot_density(session, season_id=season_id,
+                                  team_id=team_id, against=against,
+                                  bins=bins)
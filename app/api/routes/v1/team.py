@@ -0,0 +1,163 @@
+from datetime import datetime
+from typing import List
+from arq.connections import ArqRedis
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.logger import logger
+
+from app.analytics.aggregates import get_team_aggregates
+from app.analytics.elo import get_current_ratings, get_rating_history
+from app.analytics.players import get_squad
+from app.analytics.xg import get_team_xg
+from app.api.routes.v1.scraping import get_scrape_job_status
+from app.core.config import settings
+from app.core.jobs import enqueue_unique, get_redis
+from app.crud.tournament import LoadProfile, tournament_event_service
+from app.db.session import get_session
+from app.models.analytics import HeadToHead, SquadPlayer, TeamXG
+from app.models.football import (PublicTournamentEventWithTeams,
+                                 TeamSeasonAggregateBase,
+                                 TeamRatingBase, TeamRatingSnapshotBase)
+from app.models.jobs import ScrapeJob
+
+
+router = APIRouter(prefix="/teams", tags=["teams"])
+
+
+@router.get(
+    "/ratings",
+    status_code=status.HTTP_200_OK,
+    summary="Current Elo ratings, best first.",
+    response_model=List[TeamRatingBase],
+)
+async def get_team_ratings(*,
+                           limit: int | None = Query(None, ge=1),
+                           session: AsyncSession = Depends(get_session)):
+    return await get_current_ratings(session, limit=limit)
+
+
+@router.post(
+    "/ratings/rebuild",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a full replay of the Elo ratings.",
+)
+async def rebuild_team_ratings(redis: ArqRedis = Depends(get_redis)
+                               ) -> ScrapeJob:
+    job = await enqueue_unique(redis, 'update_ratings_job',
+                               dedupe_key="ratings:rebuild", rebuild=True)
+    logger.info(f"Ratings rebuild job {job.job_id} queued.")
+
+    return await get_scrape_job_status(redis, job)
+
+
+@router.get(
+    "/{team_id}/ratings/history",
+    status_code=status.HTTP_200_OK,
+    summary="Elo rating of a team after each of its matches.",
+    response_model=List[TeamRatingSnapshotBase],
+)
+async def get_team_rating_history(*,
+                                  team_id: int,
+                                  limit: int | None = Query(None, ge=1),
+                                  session: AsyncSession = Depends(get_session)):
+    return await get_rating_history(session, team_id, limit=limit)
+
+
+@router.get(
+    "/{team_id}/aggregates",
+    status_code=status.HTTP_200_OK,
+    summary="Running totals and form of a team per season, latest first.",
+    response_model=List[TeamSeasonAggregateBase],
+)
+async def get_team_season_aggregates(*,
+                                     team_id: int,
+                                     season_id: int | None = None,
+                                     session: AsyncSession = Depends(get_session)):
+    return await get_team_aggregates(session, team_id, season_id=season_id)
+
+
+@router.get(
+    "/{team_id}/events",
+    status_code=status.HTTP_200_OK,
+    summary="Latest events of a team across all tournaments, newest first.",
+    response_model=List[PublicTournamentEventWithTeams],
+)
+async def get_team_events(*,
+                          team_id: int,
+                          status_type: str | None = None,
+                          start_from: datetime | None = None,
+                          start_to: datetime | None = None,
+                          limit: int = Query(settings.DEFAULT_PAGE_SIZE,
+                                             ge=1, le=settings.MAX_PAGE_SIZE),
+                          session: AsyncSession = Depends(get_session)):
+    try:
+        return await tournament_event_service.get_team_events(
+            session, team_id,
+            limit=limit,
+            status_type=status_type,
+            start_from=start_from,
+            start_to=start_to,
+            profile=LoadProfile.WITH_TEAMS,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get Team Events: Unexpected error {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=str(e))
+
+
+@router.get(
+    "/{team_id}/h2h/{opponent_id}",
+    status_code=status.HTTP_200_OK,
+    summary="Latest meetings of two teams and the record over them.",
+    response_model=HeadToHead,
+)
+async def get_head_to_head(*,
+                           team_id: int,
+                           opponent_id: int,
+                           limit: int = Query(10, ge=1,
+                                              le=settings.MAX_PAGE_SIZE),
+                           session: AsyncSession = Depends(get_session)):
+    if team_id == opponent_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="A team has no head to head with itself.")
+    try:
+        return await tournament_event_service.get_head_to_head(
+            session, team_id, opponent_id, limit=limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get Head To Head: Unexpected error {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=str(e))
+
+
+@router.get(
+    "/{team_id}/xg",
+    status_code=status.HTTP_200_OK,
+    summary="xG for and against of a team per match, with its trend.",
+)
+async def get_team_expected_goals(*,
+                                  team_id: int,
+                                  season_id: int | None = None,
+                                  window: int = Query(
+                                      settings.XG_TREND_WINDOW, ge=1),
+                                  session: AsyncSession = Depends(get_session)
+                                  ) -> TeamXG:
+    return await get_team_xg(session, team_id, season_id=season_id,
+                             window=window)
+
+
+@router.get(
+    "/{team_id}/players",
+    status_code=status.HTTP_200_OK,
+    summary="Minutes and average rating of every player of a team.",
+    response_model=List[SquadPlayer],
+)
+async def get_team_players(*,
+                           team_id: int,
+                           season_id: int | None = None,
+                           session: AsyncSession = Depends(get_session)):
+    return await get_squad(session, team_id, season_id=season_id)
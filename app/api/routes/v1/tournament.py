@@ -1,46 +1,90 @@
+from datetime import datetime
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.logger import logger
+from app.core.config import settings
+from app.core.response_cache import (CATEGORIES, SEASONS, TOURNAMENTS,
+                                     dump_json, response_cache)
 
 from app.models.football import (PublicTournamentWithSeasons,
+                                 TeamSeasonAggregateBase,
                                  Tournament, TournamentBase, TournamentSeason, TournamentSeasonBase,
                                  TournamentWithCategoryPublic,)
+from app.models.base import Page
+from app.models.analytics import (SeasonSimulation, SeasonStandings,
+                                  SeasonXG, StandingsBatchRequest,
+                                  StandingsHistory, TieBreaker)
+from app.analytics.aggregates import get_season_aggregates
+from app.analytics.simulation import SimulationModel, simulate_season
+from app.analytics.xg import get_season_xg
+from app.analytics.standings import (DEFAULT_TIE_BREAKERS,
+                                     HISTORY_TIE_BREAKERS, get_standings,
+                                     get_standings_history)
+from app.exports.events import (EXPORT_MEDIA_TYPES, ExportFormat,
+                                events_export_query, export_events)
 from app.db.session import get_session
 from app.crud.tournament import (
-    tournament_service, tournament_season_service,
+    LoadProfile, tournament_service, tournament_season_service,
 )
 
 
 router = APIRouter(prefix="/tournaments", tags=["tournaments"])
 
+tournaments_page_adapter = TypeAdapter(Page[PublicTournamentWithSeasons])
+
+
+async def get_tournament_season(
+    tournament_id: int,
+    season_id: int,
+    session: AsyncSession = Depends(get_session)
+) -> TournamentSeason:
+    """
+    Dependency resolving the season of the path, 404 unless it belongs to
+    the tournament of the path.
+    """
+    season = await tournament_season_service.get_tournament_season_by_id(
+        session, season_id)
+    if season.tournament_id != tournament_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail="Tournament season not found.")
+    return season
+
 
 @router.get(
     "/",
     status_code=status.HTTP_200_OK,
     summary="Get all football tournaments.",
-    response_model=List[PublicTournamentWithSeasons]
+    response_model=Page[PublicTournamentWithSeasons]
 )
 async def get_tournaments(*,
                           category: str | None = None,
                           name: str | None = None,
+                          cursor: str | None = None,
+                          limit: int = Query(settings.DEFAULT_PAGE_SIZE,
+                                             ge=1, le=settings.MAX_PAGE_SIZE),
                           session: AsyncSession = Depends(get_session),):
+    async def build() -> bytes:
+        tournaments, next_cursor = await tournament_service.get_tournaments_page(
+            session,
+            cursor=cursor,
+            limit=limit,
+            category=category or None,
+            name=name or None,
+            profile=LoadProfile.WITH_SEASONS,
+        )
+        return dump_json(tournaments_page_adapter,
+                         dict(items=tournaments, next_cursor=next_cursor))
+
     try:
-        if category is not None and category != '':
-            tournaments = await tournament_service.get_tournaments_by_category(
-                session,
-                category
-            )
-        elif name is not None and name != '':
-            tournaments = await tournament_service.get_tournaments_by_name(
-                session,
-                name
-            )
-        else:
-            tournaments = await tournament_service.get_all_tournaments(session)
-
-        return tournaments
+        return await response_cache.response(
+            f"tournaments:{category}:{name}:{cursor}:{limit}",
+            (CATEGORIES, TOURNAMENTS, SEASONS), build)
+    except HTTPException:
+        raise
     except ResponseValidationError as rve:
         logger.error(f"Get Tournaments: Response error {str(rve)}")
         raise HTTPException(
@@ -60,15 +104,22 @@ async def get_tournaments(*,
 async def get_tournament_seasons(
     *,
     tournament_id: int,
+    cursor: str | None = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE,
+                       ge=1, le=settings.MAX_PAGE_SIZE),
     session: AsyncSession = Depends(get_session)
-) -> List[TournamentSeason]:
+) -> Page[TournamentSeason]:
     try:
-        tournament_seasons = await tournament_season_service.get_tournament_seasons_by_tournament(
+        tournament_seasons, next_cursor = await tournament_season_service.get_tournament_seasons_page(
             db=session,
-            tournament_id=tournament_id
+            tournament_id=tournament_id,
+            cursor=cursor,
+            limit=limit,
         )
 
-        return tournament_seasons
+        return Page(items=tournament_seasons, next_cursor=next_cursor)
+    except HTTPException:
+        raise
 
     except ResponseValidationError as rve:
         logger.error(f"Get Seasons By Tournament: Response error {str(rve)}")
@@ -80,3 +131,143 @@ async def get_tournament_seasons(
         logger.error(f"Get Seasons By Tournament: Unexpected error {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=str(e))
+
+
+@router.get(
+    "/{tournament_id}/seasons/{season_id}/events/export",
+    status_code=status.HTTP_200_OK,
+    summary="Stream the events of a tournament season as NDJSON or CSV.",
+    response_class=StreamingResponse,
+)
+async def export_season_events(
+    *,
+    tournament_id: int,
+    season_id: int,
+    format: ExportFormat = ExportFormat.NDJSON,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+    season: TournamentSeason = Depends(get_tournament_season),
+):
+    query = events_export_query(tournament_id=tournament_id,
+                                season_id=season_id,
+                                start_from=start_from,
+                                start_to=start_to)
+    filename = f"events_{tournament_id}_{season_id}.{format.value}"
+
+    return StreamingResponse(
+        export_events(query, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/{tournament_id}/seasons/{season_id}/standings",
+    status_code=status.HTTP_200_OK,
+    summary="League table of a tournament season.",
+)
+async def get_season_standings(
+    *,
+    tournament_id: int,
+    season_id: int,
+    tie_breakers: List[TieBreaker] = Query(list(DEFAULT_TIE_BREAKERS)),
+    season: TournamentSeason = Depends(get_tournament_season),
+    session: AsyncSession = Depends(get_session)
+) -> SeasonStandings:
+    standings, = await get_standings(session, [(tournament_id, season_id)],
+                                     tie_breakers)
+    return standings
+
+
+@router.get(
+    "/{tournament_id}/seasons/{season_id}/aggregates",
+    status_code=status.HTTP_200_OK,
+    summary="Stored running totals and form of every team in a season.",
+    response_model=List[TeamSeasonAggregateBase],
+)
+async def get_season_aggregates_table(
+    *,
+    tournament_id: int,
+    season_id: int,
+    season: TournamentSeason = Depends(get_tournament_season),
+    session: AsyncSession = Depends(get_session)
+):
+    return await get_season_aggregates(session, season_id)
+
+
+@router.get(
+    "/{tournament_id}/seasons/{season_id}/standings/history",
+    status_code=status.HTTP_200_OK,
+    summary="Points and position of every team after each match date.",
+)
+async def get_season_standings_history(
+    *,
+    tournament_id: int,
+    season_id: int,
+    tie_breakers: List[TieBreaker] = Query(list(DEFAULT_TIE_BREAKERS)),
+    season: TournamentSeason = Depends(get_tournament_season),
+    session: AsyncSession = Depends(get_session)
+) -> StandingsHistory:
+    unsupported = set(tie_breakers) - set(HISTORY_TIE_BREAKERS)
+    if unsupported:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported tie breakers: "
+                   f"{', '.join(sorted(t.value for t in unsupported))}.")
+
+    return await get_standings_history(session, tournament_id, season_id,
+                                       tie_breakers)
+
+
+@router.get(
+    "/{tournament_id}/seasons/{season_id}/simulation",
+    status_code=status.HTTP_200_OK,
+    summary="Monte Carlo simulation of the season's remaining fixtures.",
+)
+async def get_season_simulation(
+    *,
+    tournament_id: int,
+    season_id: int,
+    runs: int = Query(100_000, ge=1, le=settings.SIMULATION_MAX_RUNS),
+    model: SimulationModel = SimulationModel.DIXON_COLES,
+    relegation_spots: int = Query(3, ge=0),
+    seed: int = Query(0, ge=0),
+    season: TournamentSeason = Depends(get_tournament_season),
+    session: AsyncSession = Depends(get_session)
+) -> SeasonSimulation:
+    return await simulate_season(session, tournament_id, season_id,
+                                 runs=runs, model=model,
+                                 relegation_spots=relegation_spots,
+                                 seed=seed)
+
+
+@router.get(
+    "/{tournament_id}/seasons/{season_id}/xg",
+    status_code=status.HTTP_200_OK,
+    summary="xG for and against of every team in a season.",
+)
+async def get_season_expected_goals(
+    *,
+    tournament_id: int,
+    season_id: int,
+    season: TournamentSeason = Depends(get_tournament_season),
+    session: AsyncSession = Depends(get_session)
+) -> SeasonXG:
+    return await get_season_xg(session, tournament_id, season_id)
+
+
+@router.post(
+    "/standings",
+    status_code=status.HTTP_200_OK,
+    summary="League tables of many tournament seasons in one call.",
+)
+async def get_batch_standings(
+    *,
+    request: StandingsBatchRequest,
+    session: AsyncSession = Depends(get_session)
+) -> List[SeasonStandings]:
+    return await get_standings(
+        session,
+        [(season.tournament_id, season.season_id) for season in request.seasons],
+        request.tie_breakers,
+    )
@@ -3,7 +3,11 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.core.config import settings
 
+from app.analytics.poisson import shutdown_process_pool
 from app.api.routes import router as api_router
+from app.core.http_client import create_scraper_client
+from app.core.jobs import create_redis_pool
+from app.core.response_cache import response_cache
 from app.db.session import engine
 
 warnings.filterwarnings(
@@ -11,11 +15,26 @@ warnings.filterwarnings(
 )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client for the whole process, shared by every scrape.
+    app.state.scraper_client = create_scraper_client()
+    # Scrapes run on the arq worker, the api only enqueues them.
+    app.state.redis = await create_redis_pool()
+    # Catalog cache versions are shared with the worker through redis.
+    response_cache.attach_redis(app.state.redis)
+    yield
+    await app.state.redis.aclose()
+    shutdown_process_pool()
+    await app.state.scraper_client.aclose()
+
+
 def get_application():
     app = FastAPI(
         title=settings.PROJECT_NAME,
         version=settings.VERSION,
         docs_url="/docs",
+        lifespan=lifespan,
     )
     app.include_router(api_router, prefix="/api")
     return app
@@ -9,6 +9,8 @@ class Settings(BaseSettings):
     # project settings.
     VERSION: str = Field("0.0.1")
     PROJECT_NAME: str = Field("Footstats Backend API.")
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 500
 
     # postgres settings
     POSTGRES_DRIVERNAME: str = "postgresql"
@@ -20,5 +22,101 @@ class Settings(BaseSettings):
     POSTGRES_ECHO: bool = False
     POSTGRES_POOL_SIZE: int = 5
 
+    # redis settings
+    REDIS_HOST: str = "redis"
+    REDIS_PORT: int = 6379
+    REDIS_DB: int = 0
+
+    # background scrape jobs (arq)
+    SCRAPE_WORKER_MAX_JOBS: int = 10
+    SCRAPE_JOB_TIMEOUT: int = 60 * 60
+    SCRAPE_JOB_KEEP_RESULT: int = 24 * 60 * 60
+    SCRAPE_BATCH_CONCURRENCY: int = 8
+    SCRAPE_WORKER_STATS_INTERVAL: int = 5
+
+    # scraper http client settings
+    SCRAPER_HTTP2: bool = True
+    SCRAPER_MAX_CONNECTIONS: int = 20
+    SCRAPER_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    SCRAPER_KEEPALIVE_EXPIRY: float = 30.0
+    SCRAPER_TIMEOUT: float = 20.0
+    SCRAPER_CONNECT_TIMEOUT: float = 5.0
+
+    # scraper rate limiting (per host)
+    SCRAPER_INITIAL_CONCURRENCY: int = 4
+    SCRAPER_MIN_CONCURRENCY: int = 1
+    SCRAPER_MAX_CONCURRENCY: int = 32
+    SCRAPER_INITIAL_RATE: float = 5.0
+    SCRAPER_MIN_RATE: float = 0.5
+    SCRAPER_MAX_RATE: float = 50.0
+    SCRAPER_BURST: float = 10.0
+    SCRAPER_DECREASE_FACTOR: float = 0.5
+    SCRAPER_LATENCY_SPIKE_RATIO: float = 3.0
+    SCRAPER_THROTTLE_BACKOFF: float = 30.0
+    SCRAPER_MAX_RETRIES: int = 3
+
+    # raw scrape response cache
+    SCRAPE_CACHE_ENABLED: bool = True
+    SCRAPE_CACHE_DIR: str = "stats/initial_data"
+    SCRAPE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    SCRAPE_CACHE_DEFAULT_TTL: int = 60 * 60
+    SCRAPE_CACHE_NEGATIVE_TTL: int = 60 * 60
+
+    # catalog response cache, shared through redis when enabled
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_TTL: int = 60 * 60
+    RESPONSE_CACHE_SHARED: bool = False
+
+    # rows fetched per server side cursor round trip in exports
+    EXPORT_BATCH_SIZE: int = 2000
+    # rows per parquet row group
+    EXPORT_ROW_GROUP_SIZE: int = 128 * 1024
+
+    # seasons kept in the standings history cache
+    STANDINGS_HISTORY_CACHE_SIZE: int = 256
+
+    # team elo ratings, changing the formula triggers a rebuild
+    ELO_K: float = 20.0
+    ELO_HOME_ADVANTAGE: float = 65.0
+    ELO_INITIAL_RATING: float = 1500.0
+    ELO_BATCH_SIZE: int = 5000
+
+    # dixon-coles match model, decay is per day before the latest result
+    MODEL_PROCESS_WORKERS: int = 2
+    MODEL_CACHE_SIZE: int = 256
+    MODEL_TIME_DECAY: float = 0.0019
+    MODEL_PRIOR_WEIGHT: float = 1.0
+    # league average rates a season starts from before it has results
+    MODEL_PRIOR_HOME_GOALS: float = 1.5
+    MODEL_PRIOR_AWAY_GOALS: float = 1.15
+    MODEL_MAX_GOALS: int = 10
+
+    # monte carlo season simulations
+    SIMULATION_MAX_RUNS: int = 1_000_000
+    SIMULATION_CHUNK_SIZE: int = 10_000
+    SIMULATION_CACHE_SIZE: int = 128
+
+    # results kept in the team_season_aggregate form string
+    TEAM_FORM_LENGTH: int = 5
+
+    # matches whose details are fetched at once by the match scraper
+    MATCH_SCRAPER_CONCURRENCY: int = 8
+
+    # matches per transaction when importing stored match details, a
+    # season of lineups fits in one
+    DETAIL_IMPORT_BATCH_SIZE: int = 400
+
+    # xg trends and shot location density
+    XG_TREND_WINDOW: int = 5
+    SHOT_DENSITY_BINS: int = 20
+
+    # zlib level of the stored heatmap grids
+    HEATMAP_COMPRESSION_LEVEL: int = 6
+
+    # downloaded sitemap indexes
+    SITEMAP_DIR: str = "scraping/files"
+    SITEMAP_BATCH_SIZE: int = 5000
+
 
 settings = Settings()
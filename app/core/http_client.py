@@ -0,0 +1,37 @@
+from fastapi import Request
+from httpx import AsyncClient, Limits, Timeout
+
+from app.core.config import settings
+
+
+def create_scraper_client() -> AsyncClient:
+    """
+    Creates the pooled client used for every SofaScore request.
+
+    The client is meant to live as long as the process (FastAPI lifespan
+    or arq worker startup) so connections are kept alive and reused
+    instead of doing a TCP + TLS handshake per url.
+    """
+    limits = Limits(
+        max_connections=settings.SCRAPER_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.SCRAPER_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.SCRAPER_KEEPALIVE_EXPIRY,
+    )
+    timeout = Timeout(
+        settings.SCRAPER_TIMEOUT,
+        connect=settings.SCRAPER_CONNECT_TIMEOUT,
+    )
+
+    return AsyncClient(
+        http2=settings.SCRAPER_HTTP2,
+        limits=limits,
+        timeout=timeout,
+        follow_redirects=True,
+    )
+
+
+async def get_scraper_client(request: Request) -> AsyncClient:
+    """
+    Dependency returning the application wide scraper client.
+    """
+    return request.app.state.scraper_client
@@ -0,0 +1,148 @@
+import os
+import socket
+import time
+from typing import Any, Dict
+from uuid import uuid4
+
+import orjson
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+from arq.jobs import Job, JobStatus
+from fastapi import Request
+
+from app.core.config import settings
+
+
+REDIS_SETTINGS = RedisSettings(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    database=settings.REDIS_DB
+)
+
+PROGRESS_KEY = "scrape:progress:{job_id}"
+DEDUPE_KEY = "scrape:dedupe:{key}"
+WORKER_STATS_KEY = "scrape:worker-stats:{worker}"
+
+# Deletes a dedupe key only while it still points at the given job, so
+# a finished job's key is released by exactly one request.
+RELEASE_DEDUPE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Job states which block enqueuing another job with the same dedupe key.
+ACTIVE_JOB_STATUSES = (JobStatus.deferred, JobStatus.queued,
+                       JobStatus.in_progress)
+
+
+class JobProgress:
+    """
+    Progress counters of a running job, stored in a redis hash so the
+    api workers can report them while the arq worker is busy.
+    """
+
+    def __init__(self, redis: ArqRedis, job_id: str):
+        self.redis = redis
+        self.key = PROGRESS_KEY.format(job_id=job_id)
+
+    async def update(self, **fields: Any) -> None:
+        await self.redis.hset(
+            self.key, mapping={k: str(v) for k, v in fields.items()})
+        await self.redis.expire(self.key, settings.SCRAPE_JOB_KEEP_RESULT)
+
+    async def increment(self, field: str, amount: int = 1) -> None:
+        await self.redis.hincrby(self.key, field, amount)
+        await self.redis.expire(self.key, settings.SCRAPE_JOB_KEEP_RESULT)
+
+
+async def get_job_progress(redis: ArqRedis,
+                           job_id: str) -> Dict[str, int | str]:
+    data = await redis.hgetall(PROGRESS_KEY.format(job_id=job_id))
+
+    progress = dict()
+    for key, value in data.items():
+        value = value.decode()
+        progress[key.decode()] = int(value) if value.isdigit() else value
+    return progress
+
+
+async def enqueue_unique(redis: ArqRedis, function: str,
+                         dedupe_key: str, **kwargs: Any) -> Job:
+    """
+    Enqueues a job unless one with the same dedupe key is still queued
+    or running, in which case that job is returned instead.
+
+    The key is claimed with SET NX before enqueuing, so of concurrent
+    requests only one enqueues and the others get its job.
+    """
+    key = DEDUPE_KEY.format(key=dedupe_key)
+    job_id = uuid4().hex
+
+    while True:
+        if await redis.set(key, job_id, nx=True,
+                           ex=settings.SCRAPE_JOB_TIMEOUT):
+            try:
+                return await redis.enqueue_job(function, _job_id=job_id,
+                                               **kwargs)
+            except Exception:
+                await redis.delete(key)
+                raise
+
+        existing_id = await redis.get(key)
+        if existing_id is None:
+            # Expired or released in between, claim it again.
+            continue
+
+        job = Job(existing_id.decode(), redis)
+        job_status = await job.status()
+        # not_found: the claiming request has not enqueued it yet.
+        if (job_status in ACTIVE_JOB_STATUSES
+                or job_status == JobStatus.not_found):
+            return job
+        await redis.eval(RELEASE_DEDUPE_SCRIPT, 1, key, existing_id)
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def publish_worker_stats(redis: ArqRedis, worker: str,
+                               stats: Dict[str, Any]) -> None:
+    """
+    Stores a worker's scraper stats for the api workers, expiring after
+    a few missed publishes so stopped workers drop out.
+    """
+    await redis.set(
+        WORKER_STATS_KEY.format(worker=worker),
+        orjson.dumps(dict(stats, published_at=time.time())),
+        ex=settings.SCRAPE_WORKER_STATS_INTERVAL * 3)
+
+
+async def get_worker_stats(redis: ArqRedis) -> Dict[str, Dict[str, Any]]:
+    """
+    Last published scraper stats of every running worker, by worker.
+    """
+    keys = [key async for key in redis.scan_iter(
+        match=WORKER_STATS_KEY.format(worker='*'))]
+    if not keys:
+        return dict()
+
+    prefix = WORKER_STATS_KEY.format(worker='')
+    stats = dict()
+    for key, value in zip(keys, await redis.mget(keys)):
+        if value is not None:
+            stats[key.decode().removeprefix(prefix)] = orjson.loads(value)
+    return stats
+
+
+async def create_redis_pool() -> ArqRedis:
+    return await create_pool(REDIS_SETTINGS)
+
+
+async def get_redis(request: Request) -> ArqRedis:
+    """
+    Dependency returning the application wide arq redis pool.
+    """
+    return request.app.state.redis
@@ -0,0 +1,229 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+from app.logger import logger
+
+
+# Responses telling us we are going too fast (or got blocked), 503 is how
+# sofascore sheds load.
+THROTTLE_STATUS_CODES = (403, 429, 503)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses a `Retry-After` header, either delay seconds or an HTTP date.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Token bucket pacing the request rate (requests / second).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveLimiter:
+    """
+    Per host limiter combining a token bucket with AIMD concurrency.
+
+    Every healthy response grows the concurrency limit by 1 / limit (about
+    +1 per round trip) and nudges the rate up. Throttling responses
+    (403 / 429 / 503), other server errors, transport errors and latency
+    spikes cut both limit and rate multiplicatively, at most once per
+    cooldown window so a burst of in-flight failures doesn't collapse the
+    limit to the floor. `Retry-After` pauses the whole host until the
+    given time, throttling responses without one pause it for
+    SCRAPER_THROTTLE_BACKOFF.
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+
+        self.min_concurrency = settings.SCRAPER_MIN_CONCURRENCY
+        self.max_concurrency = settings.SCRAPER_MAX_CONCURRENCY
+        self.min_rate = settings.SCRAPER_MIN_RATE
+        self.max_rate = settings.SCRAPER_MAX_RATE
+
+        self.limit = float(settings.SCRAPER_INITIAL_CONCURRENCY)
+        self.bucket = TokenBucket(rate=settings.SCRAPER_INITIAL_RATE,
+                                  capacity=settings.SCRAPER_BURST)
+
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.latency_ewma: float | None = None
+        self.last_decrease = 0.0
+
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.latency_spikes = 0
+
+        self._condition = asyncio.Condition()
+
+    @property
+    def permits(self) -> int:
+        return max(self.min_concurrency, int(self.limit))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Waits for a concurrency permit, any `Retry-After` pause and a
+        rate token before letting the request through.
+        """
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self.in_flight < self.permits)
+            self.in_flight += 1
+
+        try:
+            delay = self.blocked_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.bucket.acquire()
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def record(self, status_code: int, latency: float,
+               retry_after: str | None = None) -> None:
+        """
+        Feeds a response back into the controller.
+        """
+        self.requests += 1
+
+        throttled = status_code in THROTTLE_STATUS_CODES
+        if throttled or status_code >= 500:
+            if throttled:
+                self.throttled += 1
+            else:
+                self.errors += 1
+            self._decrease()
+
+            delay = parse_retry_after(retry_after)
+            if delay is None and throttled:
+                delay = settings.SCRAPER_THROTTLE_BACKOFF
+            if delay is not None:
+                self.blocked_until = max(self.blocked_until,
+                                         time.monotonic() + delay)
+            logger.warning(
+                f"Rate limiter: {self.host} answered {status_code}, "
+                f"pausing {delay or 0.0:.1f}s with {self.permits} permits.")
+            return
+
+        if (self.latency_ewma is not None
+                and latency > self.latency_ewma * settings.SCRAPER_LATENCY_SPIKE_RATIO):
+            self.latency_spikes += 1
+            self._decrease()
+        else:
+            self._increase()
+
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = (0.2 * latency) + (0.8 * self.latency_ewma)
+
+    def record_error(self) -> None:
+        """
+        Feeds a transport error (timeout, reset connection) back.
+        """
+        self.requests += 1
+        self.errors += 1
+        self._decrease()
+
+    def _increase(self) -> None:
+        self.limit = min(float(self.max_concurrency),
+                         self.limit + 1 / self.limit)
+        self.bucket.rate = min(self.max_rate,
+                               self.bucket.rate + 1 / self.limit)
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        cooldown = max(1.0, self.latency_ewma or 0.0)
+        if now - self.last_decrease < cooldown:
+            return
+
+        self.last_decrease = now
+        factor = settings.SCRAPER_DECREASE_FACTOR
+        self.limit = max(float(self.min_concurrency), self.limit * factor)
+        self.bucket.rate = max(self.min_rate, self.bucket.rate * factor)
+
+    def metrics(self) -> Dict[str, Any]:
+        return dict(
+            permits=self.permits,
+            limit=round(self.limit, 2),
+            in_flight=self.in_flight,
+            rate=round(self.bucket.rate, 2),
+            latency_ewma=self.latency_ewma,
+            blocked_for=max(0.0, self.blocked_until - time.monotonic()),
+            requests=self.requests,
+            throttled=self.throttled,
+            errors=self.errors,
+            latency_spikes=self.latency_spikes,
+        )
+
+
+class HostLimiterRegistry:
+    """
+    Keeps one AdaptiveLimiter per host.
+    """
+
+    def __init__(self):
+        self._limiters: Dict[str, AdaptiveLimiter] = dict()
+
+    def get(self, url: str) -> AdaptiveLimiter:
+        host = urlsplit(url).netloc or url
+        if host not in self._limiters:
+            self._limiters[host] = AdaptiveLimiter(host)
+        return self._limiters[host]
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {host: limiter.metrics()
+                for host, limiter in self._limiters.items()}
+
+
+host_limiters = HostLimiterRegistry()
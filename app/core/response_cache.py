@@ -0,0 +1,195 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Sequence
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.logger import logger
+
+
+VERSION_KEY = "catalog:version:{namespace}"
+RESPONSE_KEY = "catalog:response:{key}"
+
+# Data sets the catalog routes are built from, bumped by the services.
+CATEGORIES = "category"
+TOURNAMENTS = "tournament"
+SEASONS = "season"
+
+
+def dump_json(adapter: TypeAdapter, data: Any) -> bytes:
+    """
+    Validates ORM objects against the response model and serializes
+    them, like FastAPI does for `response_model`.
+    """
+    return adapter.dump_json(
+        adapter.validate_python(data, from_attributes=True))
+
+
+class CachedResponse(NamedTuple):
+    content: bytes
+    stored_at: float
+
+
+class ResponseCache:
+    """
+    Read-through cache of serialized catalog responses.
+
+    Entries are keyed by the route key plus the current version of every
+    namespace the response is built from. Writes bump the versions instead
+    of deleting entries, so stale bodies are simply never looked up again
+    and age out of the bounded in-process LRU.
+
+    Once a redis client is attached the versions live in redis, so a
+    scrape on the arq worker invalidates every api worker, and with
+    `shared` the bodies are stored there too.
+    """
+
+    def __init__(self, max_bytes: int, ttl: int, shared: bool = False,
+                 enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.shared = shared
+        self.enabled = enabled
+        self.redis: Redis | None = None
+
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._size = 0
+        self._versions: Dict[str, int] = dict()
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def attach_redis(self, redis: Redis | None) -> None:
+        self.redis = redis
+
+    async def versions(self, namespaces: Sequence[str]
+                       ) -> Dict[str, int] | None:
+        """
+        Current versions of `namespaces`, None when redis is attached but
+        unreachable: the local counters don't follow the other workers'
+        bumps, keys built from them could collide with redis versions.
+        """
+        if self.redis is None:
+            return {ns: self._versions.get(ns, 0) for ns in namespaces}
+        try:
+            values = await self.redis.mget(
+                [VERSION_KEY.format(namespace=ns) for ns in namespaces])
+        except RedisError as exc:
+            logger.error(f"Response cache: version read error {str(exc)}")
+            return None
+        return {ns: int(value or 0) for ns, value in zip(namespaces, values)}
+
+    async def bump(self, *namespaces: str) -> None:
+        """
+        Invalidates every cached response built from `namespaces`.
+        """
+        for namespace in namespaces:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            if self.redis is not None:
+                try:
+                    await self.redis.incr(VERSION_KEY.format(namespace=namespace))
+                except RedisError as exc:
+                    logger.error(
+                        f"Response cache: version bump error {str(exc)}")
+
+    def _get_local(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry.stored_at > self.ttl:
+            self._forget(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.content
+
+    def _set_local(self, key: str, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        self._forget(key)
+        self._entries[key] = CachedResponse(content, time.time())
+        self._size += len(content)
+
+        while self._size > self.max_bytes:
+            old_key, _ = next(iter(self._entries.items()))
+            self._forget(old_key)
+            self.evictions += 1
+
+    def _forget(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.content)
+
+    async def get_or_set(self, key: str, namespaces: Sequence[str],
+                         build: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Returns the cached body for `key`, building and storing it on a
+        miss.
+        """
+        if not self.enabled:
+            return await build()
+
+        versions = await self.versions(namespaces)
+        if versions is None:
+            self.misses += 1
+            return await build()
+        key = key + "|" + ",".join(
+            f"{ns}:{version}" for ns, version in sorted(versions.items()))
+
+        content = self._get_local(key)
+        if content is not None:
+            self.hits += 1
+            return content
+
+        if self.shared and self.redis is not None:
+            try:
+                content = await self.redis.get(RESPONSE_KEY.format(key=key))
+            except RedisError as exc:
+                logger.error(f"Response cache: read error {str(exc)}")
+            if content is not None:
+                self.shared_hits += 1
+                self._set_local(key, content)
+                return content
+
+        self.misses += 1
+        content = await build()
+        self._set_local(key, content)
+
+        if self.shared and self.redis is not None:
+            try:
+                await self.redis.set(RESPONSE_KEY.format(key=key), content,
+                                     ex=self.ttl)
+            except RedisError as exc:
+                logger.error(f"Response cache: write error {str(exc)}")
+        return content
+
+    async def response(self, key: str, namespaces: Sequence[str],
+                       build: Callable[[], Awaitable[bytes]]) -> Response:
+        content = await self.get_or_set(key, namespaces, build)
+        return Response(content=content, media_type="application/json")
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            enabled=self.enabled,
+            shared=self.shared and self.redis is not None,
+            entries=len(self._entries),
+            size_bytes=self._size,
+            max_bytes=self.max_bytes,
+            hits=self.hits,
+            shared_hits=self.shared_hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL,
+    shared=settings.RESPONSE_CACHE_SHARED,
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
@@ -0,0 +1,257 @@
+import asyncio
+import gzip
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+import orjson
+
+from app.core.config import settings
+from app.logger import logger
+
+
+# Time to live (seconds) of raw responses, first matching pattern wins.
+# Tournament metadata barely changes, event lists carry live scores.
+SCRAPE_CACHE_TTLS: List[Tuple[str, int]] = [
+    (r'/unique-tournament/\d+$', 7 * 24 * 60 * 60),
+    (r'/unique-tournament/\d+/seasons$', 24 * 60 * 60),
+    (r'/team-events/total$', 10 * 60),
+    (r'/season/\d+/events$', 10 * 60),
+    (r'/season/\d+/groups$', 24 * 60 * 60),
+    (r'/event/\d+/(statistics|shotmap|lineups)$', 60 * 60),
+]
+
+# Seconds after which the index is rebuilt from the directory, which
+# other worker processes write to as well.
+SCRAPE_CACHE_RESCAN_INTERVAL = 60
+
+# Eviction frees space down to this share of `max_bytes`, so the
+# directory is not rescanned on every write once it is full.
+SCRAPE_CACHE_EVICT_TO = 0.9
+
+
+class CacheEntry(NamedTuple):
+    status_code: int
+    content: bytes
+    stored_at: float
+
+
+class ScrapeCache:
+    """
+    On disk cache of raw SofaScore responses.
+
+    Entries are addressed by the sha256 of the url and stored gzip
+    compressed as `<json header>\\n<body>`. 404s are cached as negative
+    entries with their own ttl. Recency is tracked through the file mtime
+    (bumped on every hit) and the least recently used entries are evicted
+    once the directory grows over `max_bytes`.
+
+    The directory is shared by every worker process, so the in memory
+    index is only a view of it: entries written elsewhere are picked up
+    on a miss, and the directory is rescanned before evicting and every
+    `rescan_interval` seconds so `max_bytes` bounds all processes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int,
+                 default_ttl: int, negative_ttl: int,
+                 ttls: List[Tuple[str, int]] = SCRAPE_CACHE_TTLS,
+                 rescan_interval: float = SCRAPE_CACHE_RESCAN_INTERVAL):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in ttls]
+        self.rescan_interval = rescan_interval
+
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._scanned_at: float | None = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def ttl_for(self, url: str) -> int:
+        path = url.split('?', 1)[0]
+        for pattern, ttl in self.ttls:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.gz"
+
+    def _load_index(self, force: bool = False) -> None:
+        """
+        Rebuilds the index from the directory, least recently used first,
+        when forced or when the last scan is older than rescan_interval.
+        """
+        now = time.time()
+        if (not force and self._scanned_at is not None
+                and now - self._scanned_at < self.rescan_interval):
+            return
+
+        entries = list()
+        if self.directory.exists():
+            for path in self.directory.glob('*/*.gz'):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    # Evicted by another worker while scanning.
+                    continue
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+        self._index = OrderedDict()
+        self._size = 0
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._size += size
+        self._scanned_at = now
+
+    def _adopt(self, key: str, path: Path) -> bool:
+        """
+        Indexes an entry another worker wrote since the last scan.
+        """
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return False
+        self._forget(key)
+        self._index[key] = size
+        self._size += size
+        return True
+
+    def _forget(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    def _read(self, url: str) -> CacheEntry | None:
+        key = self._key(url)
+        path = self._path(key)
+
+        with self._lock:
+            self._load_index()
+            if key not in self._index and not self._adopt(key, path):
+                self.misses += 1
+                return None
+
+            try:
+                header, content = gzip.decompress(
+                    path.read_bytes()).split(b'\n', 1)
+            except (OSError, ValueError):
+                # Removed by another worker or a partially written file.
+                self._forget(key)
+                self.misses += 1
+                return None
+
+            header = orjson.loads(header)
+            ttl = (self.negative_ttl if header['status_code'] == 404
+                   else self.ttl_for(url))
+
+            if time.time() - header['stored_at'] > ttl:
+                self._forget(key)
+                path.unlink(missing_ok=True)
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            os.utime(path)
+            self._index.move_to_end(key)
+            if header['status_code'] == 404:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+
+            return CacheEntry(status_code=header['status_code'],
+                              content=content,
+                              stored_at=header['stored_at'])
+
+    def _write(self, url: str, status_code: int, content: bytes) -> None:
+        key = self._key(url)
+        path = self._path(key)
+        header = orjson.dumps(dict(url=url,
+                                   status_code=status_code,
+                                   stored_at=time.time()))
+        data = gzip.compress(header + b'\n' + content)
+
+        with self._lock:
+            self._load_index()
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Write then rename so readers never see a partial file.
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+            self._forget(key)
+            self._index[key] = len(data)
+            self._size += len(data)
+            self.stores += 1
+
+            if self._size > self.max_bytes:
+                self._evict(keep=key)
+
+    def _evict(self, keep: str) -> None:
+        """
+        Evicts the least recently used entries of the whole directory,
+        not only those this process wrote, down to SCRAPE_CACHE_EVICT_TO.
+        """
+        self._load_index(force=True)
+        target = self.max_bytes * SCRAPE_CACHE_EVICT_TO
+        for old_key in list(self._index):
+            if self._size <= target:
+                break
+            if old_key == keep:
+                continue
+            self._forget(old_key)
+            self._path(old_key).unlink(missing_ok=True)
+            self.evictions += 1
+
+    async def get(self, url: str) -> CacheEntry | None:
+        try:
+            return await asyncio.to_thread(self._read, url)
+        except Exception as exc:
+            logger.error(f"Scrape cache: read error for {url}: {str(exc)}")
+            return None
+
+    async def set(self, url: str, status_code: int, content: bytes) -> None:
+        try:
+            await asyncio.to_thread(self._write, url, status_code, content)
+        except Exception as exc:
+            logger.error(f"Scrape cache: write error for {url}: {str(exc)}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load_index()
+            return dict(
+                entries=len(self._index),
+                size_bytes=self._size,
+                max_bytes=self.max_bytes,
+                hits=self.hits,
+                negative_hits=self.negative_hits,
+                misses=self.misses,
+                expired=self.expired,
+                stores=self.stores,
+                evictions=self.evictions,
+            )
+
+
+scrape_cache = ScrapeCache(
+    directory=settings.SCRAPE_CACHE_DIR,
+    max_bytes=settings.SCRAPE_CACHE_MAX_BYTES,
+    default_ttl=settings.SCRAPE_CACHE_DEFAULT_TTL,
+    negative_ttl=settings.SCRAPE_CACHE_NEGATIVE_TTL,
+)
@@ -1,14 +1,28 @@
+import base64
+from datetime import datetime
+
+import orjson
 from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, Select, and_, false, or_, tuple_
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, NoResultFound
-from typing import Type, TypeVar, Generic, Optional, List
+from sqlalchemy.sql.base import ExecutableOption
+from typing import (Any, Dict, Type, TypeVar, Generic, Optional, List,
+                    Sequence, Tuple)
 from app.logger import logger
 
 
 # Generic type of models.
 T = TypeVar('T')
 
+# asyncpg caps a single statement at 32767 bind parameters.
+MAX_BIND_PARAMS = 32000
+
+# Columns which are never overwritten when a row already exists.
+UPSERT_IMMUTABLE_COLUMNS = ('id', 'created_at')
+
 
 class CRUDRepositoryException(Exception):
     """
@@ -17,13 +31,91 @@ class CRUDRepositoryException(Exception):
     pass
 
 
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Opaque keyset cursor holding the sort key of the last row of a page.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(list(values))).decode()
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(columns):
+            raise ValueError("cursor length mismatch")
+
+        decoded = list()
+        for column, value in zip(columns, values):
+            if value is not None and column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            decoded.append(value)
+        return decoded
+    except (ValueError, TypeError, orjson.JSONDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Invalid cursor.")
+
+
+def keyset_after(columns: Sequence[Any],
+                 values: Sequence[Any]) -> ColumnElement[bool]:
+    """
+    Rows after `values` in `columns` order with NULLs last. A plain row
+    comparison is NULL as soon as one value is, which would end the
+    listing at the first row with a NULL sort key.
+    """
+    column, value = columns[0], values[0]
+    rest = (keyset_after(columns[1:], values[1:]) if len(columns) > 1
+            else false())
+    if value is None:
+        # Only rows sharing the NULL and later in the other columns.
+        return and_(column.is_(None), rest)
+
+    if any(other.nullable for other in columns[1:]):
+        after = or_(column > value, and_(column == value, rest))
+    else:
+        after = tuple_(*columns) > tuple_(*values)
+    if column.nullable:
+        after = or_(after, column.is_(None))
+    return after
+
+
+def keyset_order(columns: Sequence[Any]) -> List[Any]:
+    return [column.asc().nulls_last() if column.nullable else column.asc()
+            for column in columns]
+
+
+def dedupe_rows(model: Type[T], rows: Sequence[Dict[str, Any]],
+                conflict_cols: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Full column values of `rows` built through the model, so python side
+    defaults (uuid, timestamps) apply the same way `create` does, keeping
+    the last row of every conflict key in first seen order.
+    """
+    columns = [column.name for column in model.__table__.columns]
+    unique_rows: Dict[tuple, Dict[str, Any]] = dict()
+    for row in rows:
+        entity = model(**row)
+        values = {name: getattr(entity, name) for name in columns}
+        key = tuple(values[name] for name in conflict_cols)
+        unique_rows[key] = values
+    return list(unique_rows.values())
+
+
+def upsert_chunk_size(chunk_size: int, column_count: int) -> int:
+    """
+    Rows per statement, capped so a chunk stays under MAX_BIND_PARAMS.
+    """
+    return max(1, min(chunk_size, MAX_BIND_PARAMS // max(1, column_count)))
+
+
 class CRUDRepository(Generic[T]):
     def __init__(self, model: Type[T]):
         self.model = model
 
-    async def get(self, db: AsyncSession, id: int) -> Optional[T]:
+    async def get(self, db: AsyncSession, id: int,
+                  options: Sequence[ExecutableOption] = ()) -> Optional[T]:
         try:
-            query = select(self.model).where(self.model.sofascore_id == id)
+            query = select(self.model).where(
+                self.model.sofascore_id == id).options(*options)
             result = await db.exec(query)
             entity = result.first()
 
@@ -34,9 +126,12 @@ class CRUDRepository(Generic[T]):
                 "AN unexpected error occured."
             )
 
-    async def get_or_error(self, db: AsyncSession, id: int) -> Optional[T]:
+    async def get_or_error(self, db: AsyncSession, id: int,
+                           options: Sequence[ExecutableOption] = ()
+                           ) -> Optional[T]:
         try:
-            query = select(self.model).where(self.model.sofascore_id == id)
+            query = select(self.model).where(
+                self.model.sofascore_id == id).options(*options)
             result = await db.exec(query)
             entity = result.first()
 
@@ -56,9 +151,10 @@ class CRUDRepository(Generic[T]):
                 f"Failed to get {self.model.__name__} by ID: {id}"
             )
 
-    async def get_all(self, db: AsyncSession) -> List[T]:
+    async def get_all(self, db: AsyncSession,
+                      options: Sequence[ExecutableOption] = ()) -> List[T]:
         try:
-            query = select(self.model)
+            query = select(self.model).options(*options)
             result = await db.exec(query)
             return result.all()
         except SQLAlchemyError as exc:
@@ -66,6 +162,46 @@ class CRUDRepository(Generic[T]):
             raise CRUDRepositoryException(
                 f"Failed to fetch all records for {self.model.__name__}")
 
+    async def get_page(self,
+                       db: AsyncSession,
+                       query: Select | None = None,
+                       order_by: Sequence[str] = ('sofascore_id',),
+                       cursor: str | None = None,
+                       limit: int = 50,
+                       options: Sequence[ExecutableOption] = (),
+                       ) -> Tuple[List[T], str | None]:
+        """
+        Keyset paginated listing ordered by the `order_by` columns, which
+        must end with a unique column. Returns the page and the cursor of
+        the next one (None on the last page).
+        """
+        columns = [self.model.__table__.c[name] for name in order_by]
+
+        if query is None:
+            query = select(self.model)
+        query = query.options(*options)
+
+        if cursor:
+            values = decode_cursor(cursor, columns)
+            query = query.where(keyset_after(columns, values))
+
+        query = query.order_by(*keyset_order(columns)).limit(limit + 1)
+
+        try:
+            result = await db.exec(query)
+            entities = result.all()
+        except SQLAlchemyError as exc:
+            logger.error(f"Database error: {str(exc)}")
+            raise CRUDRepositoryException(
+                f"Failed to fetch page of {self.model.__name__}")
+
+        next_cursor = None
+        if len(entities) > limit:
+            entities = entities[:limit]
+            next_cursor = encode_cursor(
+                [getattr(entities[-1], name) for name in order_by])
+        return entities, next_cursor
+
     async def create(self, db: AsyncSession, entity: T) -> T:
         try:
             db.add(entity)
@@ -112,3 +248,67 @@ class CRUDRepository(Generic[T]):
             await db.rollback()  # Rollback in case of failure
             raise CRUDRepositoryException(
                 f"Failed to delete {self.model.__name__}")
+
+    async def upsert_many(self,
+                          db: AsyncSession,
+                          rows: Sequence[Dict[str, Any]],
+                          conflict_cols: Sequence[str] = ('sofascore_id',),
+                          update_cols: Sequence[str] | None = None,
+                          chunk_size: int = 1000,
+                          commit: bool = True) -> List[T]:
+        """
+        Bulk insert or update rows with `INSERT ... ON CONFLICT DO UPDATE`.
+
+        Rows are deduplicated on the conflict columns (last one wins) and
+        written in chunks inside a single transaction. When `update_cols`
+        is None every column except the conflict, id and created_at
+        columns is overwritten.
+        """
+        if not rows:
+            if commit:
+                # Earlier uncommitted writes of the caller still land.
+                await db.commit()
+            return []
+
+        columns = [column.name for column in self.model.__table__.columns]
+        values_list = dedupe_rows(self.model, rows, conflict_cols)
+
+        if update_cols is None:
+            update_cols = [
+                name for name in columns
+                if name not in conflict_cols
+                and name not in UPSERT_IMMUTABLE_COLUMNS
+            ]
+
+        chunk_size = upsert_chunk_size(chunk_size, len(columns))
+
+        try:
+            entities: List[T] = list()
+            for start in range(0, len(values_list), chunk_size):
+                chunk = values_list[start:start + chunk_size]
+                stmt = insert(self.model).values(chunk)
+                if update_cols:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=list(conflict_cols),
+                        set_={name: stmt.excluded[name]
+                              for name in update_cols},
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(
+                        index_elements=list(conflict_cols))
+                stmt = stmt.returning(self.model)
+
+                result = await db.exec(
+                    stmt,
+                    execution_options={"populate_existing": True})
+                entities.extend(result.scalars().all())
+
+            if commit:
+                await db.commit()
+            return entities
+        except SQLAlchemyError as exc:
+            logger.error(
+                f"Database error during upsert of {self.model.__name__}: {str(exc)}")
+            await db.rollback()  # Rollback in case of failure
+            raise CRUDRepositoryException(
+                f"Failed to upsert {self.model.__name__}")
@@ -1,10 +1,19 @@
-from typing import List
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Sequence, Tuple
 from fastapi import status
 from fastapi.exceptions import HTTPException
 from sqlalchemy.exc import SQLAlchemyError
-from sqlmodel import col, select, or_
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy import union_all
+from sqlmodel import col, func, select, or_
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.logger import logger
+from app.core.config import settings
+from app.core.response_cache import (
+    CATEGORIES, SEASONS, TOURNAMENTS, response_cache,
+)
 
 from app.models.football import (
     Category, CategoryBase, Tournament, TournamentBase,
@@ -14,10 +23,61 @@ from app.models.football import (
     TournamentSeasonBase,
     Team, TournamentGroup,
     TeamBase, TournamentGroupBase,
+    EventSeed, EventSeedBase,
+    Player, PlayerBase,
 )
+from app.analytics.aggregates import (EventResult, apply_event_changes,
+                                      load_event_results, lock_seasons,
+                                      season_changes)
+from app.analytics.elo import mark_ratings_stale
+from app.models.analytics import HeadToHead
 from app.crud.base import CRUDRepository, CRUDRepositoryException
 
 
+class LoadProfile(str, Enum):
+    """
+    How much of the object graph a query loads. Relationships are
+    "noload" by default, so pick the smallest profile that covers the
+    response model.
+    """
+    NONE = "none"
+    SHALLOW = "shallow"
+    WITH_SEASONS = "with_seasons"
+    WITH_TEAMS = "with_teams"
+
+
+LOAD_PROFILES = {
+    Category: {
+        LoadProfile.SHALLOW: (selectinload(Category.tournaments),),
+    },
+    Tournament: {
+        LoadProfile.SHALLOW: (joinedload(Tournament.category),),
+        LoadProfile.WITH_SEASONS: (joinedload(Tournament.category),
+                                   selectinload(Tournament.seasons)),
+    },
+    TournamentSeason: {
+        LoadProfile.SHALLOW: (joinedload(TournamentSeason.tournament),),
+    },
+    TournamentEvent: {
+        LoadProfile.SHALLOW: (joinedload(TournamentEvent.tournament),),
+        LoadProfile.WITH_TEAMS: (joinedload(TournamentEvent.home_team),
+                                 joinedload(TournamentEvent.away_team)),
+    },
+}
+
+
+def load_options(model: type,
+                 profile: LoadProfile) -> Sequence[ExecutableOption]:
+    if profile == LoadProfile.NONE:
+        return ()
+
+    try:
+        return LOAD_PROFILES[model][profile]
+    except KeyError:
+        raise ValueError(
+            f"Load profile {profile.value} is not defined for {model.__name__}.")
+
+
 class CategoryService:
     def __init__(self, category_repo: CRUDRepository[Category]):
         self.category_repo: CRUDRepository[Category] = category_repo
@@ -34,6 +94,7 @@ class CategoryService:
                     slug=category_data.slug,
                 )
                 category = await self.category_repo.create(db, obj)
+                await response_cache.bump(CATEGORIES)
 
             return category
         except CRUDRepositoryException as exc:
@@ -49,11 +110,61 @@ class CategoryService:
                 detail="Unexpected error occurred."
             )
 
+    async def upsert_categories_many(
+            self, db: AsyncSession,
+            categories_data: List[CategoryBase],
+            commit: bool = True) -> List[Category]:
+        """
+        Bulk insert or update categories in a single transaction.
+        """
+        try:
+            rows = [category.model_dump() for category in categories_data]
+            categories = await self.category_repo.upsert_many(
+                db, rows,
+                conflict_cols=['sofascore_id'],
+                update_cols=['name', 'slug', 'updated_at'],
+                commit=commit)
+            # Uncommitted writes are bumped by the caller after its commit.
+            if commit:
+                await response_cache.bump(CATEGORIES)
+            return categories
+        except CRUDRepositoryException as exc:
+            logger.error(f"Repository error in CategoryService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while saving categories."
+            )
+        except Exception as exc:
+            logger.error(f"Unexpected error in CategoryService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Unexpected error occurred."
+            )
+
+    async def get_categories_page(
+            self, db: AsyncSession,
+            cursor: str | None = None,
+            limit: int = settings.DEFAULT_PAGE_SIZE,
+            profile: LoadProfile = LoadProfile.NONE,
+    ) -> Tuple[List[Category], str | None]:
+        try:
+            return await self.category_repo.get_page(
+                db, cursor=cursor, limit=limit,
+                options=load_options(Category, profile))
+        except CRUDRepositoryException as exc:
+            logger.error(f"Repository error in CategoryService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while fetching categories."
+            )
+
     async def get_all_categories(self,
                                  db: AsyncSession,
+                                 profile: LoadProfile = LoadProfile.NONE,
                                  ) -> List[Category]:
         try:
-            categories = await self.category_repo.get_all(db)
+            categories = await self.category_repo.get_all(
+                db, options=load_options(Category, profile))
             return categories
 
         except CRUDRepositoryException as exc:
@@ -97,6 +208,7 @@ class TournamentService:
                     category_id=tournament_data.category_id
                 )
                 tournament = await self.tournament_repo.create(db, tournament)
+                await response_cache.bump(TOURNAMENTS)
             return tournament
         except CRUDRepositoryException as exc:
             logger.error(f"Repository error in TournamentService: {str(exc)}")
@@ -109,8 +221,41 @@ class TournamentService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Unexpected error occurred.")
 
-    async def get_tournaments_by_category(self, db: AsyncSession,
-                                          category: str) -> List[Tournament]:
+    async def upsert_tournaments_many(
+            self, db: AsyncSession,
+            tournaments_data: List[TournamentBase],
+            update_cols: Sequence[str] | None = None,
+            commit: bool = True) -> List[Tournament]:
+        """
+        Bulk insert or update tournaments. `update_cols` limits which
+        columns overwrite an existing row (all of them by default).
+        """
+        try:
+            rows = [tournament.model_dump() for tournament in tournaments_data]
+            tournaments = await self.tournament_repo.upsert_many(
+                db, rows,
+                conflict_cols=['sofascore_id'],
+                update_cols=update_cols,
+                commit=commit)
+            # Uncommitted writes are bumped by the caller after its commit.
+            if commit:
+                await response_cache.bump(TOURNAMENTS)
+            return tournaments
+        except CRUDRepositoryException as exc:
+            logger.error(f"Repository error in TournamentService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while saving tournaments.")
+        except Exception as exc:
+            logger.error(f"Unexpected error in TournamentService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Unexpected error occurred.")
+
+    async def get_tournaments_by_category(
+            self, db: AsyncSession,
+            category: str,
+            profile: LoadProfile = LoadProfile.NONE) -> List[Tournament]:
         try:
             if isinstance(category, int) or category.isdigit():
                 category = int(category)
@@ -120,12 +265,14 @@ class TournamentService:
                     Category.sofascore_id == category
                 )
             else:
-                query = select(Category).join(
+                query = select(Tournament).join(
                     Category, Tournament.category_id == Category.sofascore_id
                 ).where(
                     Category.name == category
                 )
-            tournaments = await db.exec(query)
+            query = query.options(*load_options(Tournament, profile))
+            result = await db.exec(query)
+            tournaments = result.unique().all()
 
             return tournaments
         except CRUDRepositoryException as exc:
@@ -137,12 +284,16 @@ class TournamentService:
 
     async def get_tournaments_by_name(
             self, db: AsyncSession,
-            tournament_name: str) -> List[Tournament] | Tournament:
+            tournament_name: str,
+            profile: LoadProfile = LoadProfile.NONE
+    ) -> List[Tournament] | Tournament:
         try:
             query = select(Tournament).where(
-                col(Tournament.name).icontains(tournament_name))
+                col(Tournament.name).icontains(tournament_name)
+            ).options(*load_options(Tournament, profile))
 
-            tournaments = await db.exec(query)
+            result = await db.exec(query)
+            tournaments = result.unique().all()
 
             return tournaments
         except CRUDRepositoryException as exc:
@@ -152,9 +303,64 @@ class TournamentService:
                 detail="An error occured while fetching tournament by name."
             )
 
-    async def get_all_tournaments(self, db: AsyncSession) -> List[Tournament]:
+    async def get_tournament_by_id(
+            self, db: AsyncSession,
+            tournament_id: int,
+            profile: LoadProfile = LoadProfile.NONE) -> Tournament:
+        try:
+            tournament = await self.tournament_repo.get(
+                db, tournament_id, options=load_options(Tournament, profile))
+            if not tournament:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Tournament not found.")
+            return tournament
+        except CRUDRepositoryException as exc:
+            logger.error(f"Repository error in TournamentService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while fetching the tournament.")
+
+    async def get_tournaments_page(
+            self, db: AsyncSession,
+            cursor: str | None = None,
+            limit: int = settings.DEFAULT_PAGE_SIZE,
+            category: str | None = None,
+            name: str | None = None,
+            profile: LoadProfile = LoadProfile.NONE,
+    ) -> Tuple[List[Tournament], str | None]:
+        """
+        Keyset page of tournaments ordered by sofascore_id, optionally
+        filtered by category (id or name) and name.
+        """
+        try:
+            query = select(Tournament)
+            if category:
+                if category.isdigit():
+                    query = query.where(Tournament.category_id == int(category))
+                else:
+                    query = query.join(
+                        Category,
+                        Tournament.category_id == Category.sofascore_id
+                    ).where(Category.name == category)
+            if name:
+                query = query.where(col(Tournament.name).icontains(name))
+
+            return await self.tournament_repo.get_page(
+                db, query=query, cursor=cursor, limit=limit,
+                options=load_options(Tournament, profile))
+        except CRUDRepositoryException as exc:
+            logger.error(f"Repository error in TournamentService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while fetching tournaments.")
+
+    async def get_all_tournaments(
+            self, db: AsyncSession,
+            profile: LoadProfile = LoadProfile.NONE) -> List[Tournament]:
         try:
-            tournaments = await self.tournament_repo.get_all(db=db)
+            tournaments = await self.tournament_repo.get_all(
+                db=db, options=load_options(Tournament, profile))
             return tournaments
         except CRUDRepositoryException as exc:
             logger.error(f"Repository error in TournamentService: {str(exc)}")
@@ -215,8 +421,10 @@ class TournamentEventService:
                 detail_id=event_data.detail_id,
                 stage_id=event_data.stage_id,
                 tournament_id=event_data.tournament_id,
+                season_id=event_data.season_id,
                 home_team_id=event_data.home_team_id,
                 away_team_id=event_data.away_team_id,
+                home_score_current=event_data.home_score_current,
                 home_score_period_1=event_data.home_score_period_1,
                 home_score_period_2=event_data.home_score_period_2,
                 home_score_normaltime=event_data.home_score_normaltime,
@@ -226,14 +434,23 @@ class TournamentEventService:
                 away_score_period_2=event_data.away_score_period_2,
                 away_score_normaltime=event_data.away_score_normaltime,
                 away_score_extratime=event_data.away_score_extratime,
+                away_score_current=event_data.away_score_current,
                 away_score_penalties=event_data.away_score_penalties,
                 has_xg=event_data.has_xg,
+                start_timestamp=event_data.start_timestamp,
+                end_timestamp=event_data.end_timestamp,
                 status_code=event_data.status_code,
                 status_type=event_data.status_type,
                 status_description=event_data.status_description,
                 has_eventplayer_statistics=event_data.has_eventplayer_statistics or False,
                 has_eventplayer_heatmap=event_data.has_eventplayer_heatmap or False,
             )
+            # Lands with the event in the create commit.
+            await mark_ratings_stale(db, [(None, EventResult.of(event))])
+            if event.season_id is not None:
+                await apply_event_changes(
+                    db, event.tournament_id, event.season_id,
+                    [(None, EventResult.of(event))])
             event = await self.event_repo.create(db, event)
             return event
         except CRUDRepositoryException as exc:
@@ -249,9 +466,78 @@ class TournamentEventService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Unexpected error occurred.")
 
-    async def get_event_by_id(self, db: AsyncSession, event_id: int) -> TournamentEvent:
+    async def upsert_events_many(
+            self,
+            db: AsyncSession,
+            events_data: List[TournamentEventBase],
+            commit: bool = True,
+            full_season: bool = False) -> List[TournamentEvent]:
+        """
+        Bulk insert or update tournament events.
+
+        Existing events get their scores, status and timestamps refreshed,
+        so re-scraping a season keeps results up to date. Changed results
+        are applied to their season's team aggregates in the same
+        transaction, `full_season` telling that `events_data` holds every
+        event of its seasons.
+        """
         try:
-            event = await self.event_repo.get(db, event_id)
+            rows = [event.model_dump() for event in events_data]
+            # Read the previous results under the seasons' locks, or a
+            # concurrent ingest could apply the same change twice.
+            await lock_seasons(db, [row['season_id'] for row in rows])
+            previous = {result.event_id: result
+                        for result in await load_event_results(
+                            db, [row['sofascore_id'] for row in rows])}
+            # Seasons events move out of are updated too.
+            await lock_seasons(db, [result.season_id
+                                    for result in previous.values()])
+
+            # tournament_id is the partition key, so part of the unique key.
+            events = await self.event_repo.upsert_many(
+                db, rows,
+                conflict_cols=['sofascore_id', 'tournament_id'],
+                commit=False)
+
+            await mark_ratings_stale(db, [
+                (previous.get(event.sofascore_id), EventResult.of(event))
+                for event in events])
+
+            changes = list()
+            tournaments: Dict[int, int] = dict()
+            for event in events:
+                before = previous.get(event.sofascore_id)
+                changes.append((before, EventResult.of(event)))
+                # tournament_id is part of the key, moves stay within it.
+                for state in changes[-1]:
+                    if state is not None and state.season_id is not None:
+                        tournaments[state.season_id] = event.tournament_id
+            for season_id, pairs in season_changes(changes).items():
+                await apply_event_changes(db, tournaments[season_id],
+                                          season_id, pairs,
+                                          full_season=full_season)
+            if commit:
+                await db.commit()
+            return events
+        except CRUDRepositoryException as exc:
+            logger.error(
+                f"Repository error in TournamentEventService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while saving the tournament events.")
+        except Exception as exc:
+            logger.error(
+                f"Unexpected error in TournamentEventService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Unexpected error occurred.")
+
+    async def get_event_by_id(self, db: AsyncSession, event_id: int,
+                              profile: LoadProfile = LoadProfile.NONE
+                              ) -> TournamentEvent:
+        try:
+            event = await self.event_repo.get(
+                db, event_id, options=load_options(TournamentEvent, profile))
             return event
         except CRUDRepositoryException as exc:
             logger.error(
@@ -266,9 +552,170 @@ class TournamentEventService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Unexpected error occurred.")
 
-    async def get_all_events(self, db: AsyncSession) -> List[TournamentEvent]:
+    async def get_events_page(
+            self, db: AsyncSession,
+            cursor: str | None = None,
+            limit: int = settings.DEFAULT_PAGE_SIZE,
+            tournament_id: int | None = None,
+            season_id: int | None = None,
+            team_id: int | None = None,
+            status_type: str | None = None,
+            start_from: datetime | None = None,
+            start_to: datetime | None = None,
+            profile: LoadProfile = LoadProfile.NONE,
+    ) -> Tuple[List[TournamentEvent], str | None]:
+        """
+        Keyset page of events ordered by (start_timestamp, sofascore_id).
+        """
+        try:
+            query = select(TournamentEvent)
+            if tournament_id is not None:
+                query = query.where(
+                    TournamentEvent.tournament_id == tournament_id)
+            if season_id is not None:
+                query = query.where(TournamentEvent.season_id == season_id)
+            if team_id is not None:
+                query = query.where(or_(
+                    TournamentEvent.home_team_id == team_id,
+                    TournamentEvent.away_team_id == team_id))
+            if status_type:
+                query = query.where(TournamentEvent.status_type == status_type)
+            if start_from:
+                query = query.where(TournamentEvent.start_timestamp >= start_from)
+            if start_to:
+                query = query.where(TournamentEvent.start_timestamp < start_to)
+
+            return await self.event_repo.get_page(
+                db, query=query,
+                order_by=('start_timestamp', 'sofascore_id'),
+                cursor=cursor, limit=limit,
+                options=load_options(TournamentEvent, profile))
+        except CRUDRepositoryException as exc:
+            logger.error(
+                f"Repository error in TournamentEventService - get_events_page: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error occurred while fetching tournament events.")
+
+    async def get_team_events(
+            self, db: AsyncSession, team_id: int,
+            limit: int = settings.DEFAULT_PAGE_SIZE,
+            status_type: str | None = None,
+            start_from: datetime | None = None,
+            start_to: datetime | None = None,
+            profile: LoadProfile = LoadProfile.NONE,
+    ) -> List[TournamentEvent]:
+        """
+        Latest `limit` events of a team across all tournaments, newest
+        first.
+
+        Home and away events are read separately, each as a bounded scan
+        of its (team, start_timestamp) index, and only the ids of both
+        halves are merged, so the cost doesn't grow with the table.
+        """
+        try:
+            def side(team_column):
+                query = select(TournamentEvent.sofascore_id,
+                               TournamentEvent.start_timestamp).where(
+                    team_column == team_id,
+                    TournamentEvent.start_timestamp.is_not(None))
+                if status_type:
+                    query = query.where(
+                        TournamentEvent.status_type == status_type)
+                if start_from:
+                    query = query.where(
+                        TournamentEvent.start_timestamp >= start_from)
+                if start_to:
+                    query = query.where(
+                        TournamentEvent.start_timestamp < start_to)
+                return select(query.order_by(
+                    TournamentEvent.start_timestamp.desc()
+                ).limit(limit).subquery())
+
+            ids = union_all(side(TournamentEvent.home_team_id),
+                            side(TournamentEvent.away_team_id)).subquery()
+            query = select(TournamentEvent).where(
+                col(TournamentEvent.sofascore_id).in_(
+                    select(ids.c.sofascore_id))
+            ).order_by(TournamentEvent.start_timestamp.desc(),
+                       TournamentEvent.sofascore_id.desc()
+            ).limit(limit).options(*load_options(TournamentEvent, profile))
+
+            return (await db.exec(query)).unique().all()
+        except SQLAlchemyError as exc:
+            logger.error(
+                f"Database error in TournamentEventService - get_team_events: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error occurred while fetching team events.")
+
+    async def get_head_to_head_events(
+            self, db: AsyncSession, team_id: int, opponent_id: int,
+            limit: int = settings.DEFAULT_PAGE_SIZE,
+            status_type: str | None = None,
+            profile: LoadProfile = LoadProfile.NONE,
+    ) -> List[TournamentEvent]:
+        """
+        Latest `limit` meetings of two teams, whoever played at home,
+        newest first. Matches the unordered team pair index.
+        """
+        try:
+            first, second = sorted((team_id, opponent_id))
+            query = select(TournamentEvent).where(
+                func.least(TournamentEvent.home_team_id,
+                           TournamentEvent.away_team_id) == first,
+                func.greatest(TournamentEvent.home_team_id,
+                              TournamentEvent.away_team_id) == second,
+                TournamentEvent.start_timestamp.is_not(None))
+            if status_type:
+                query = query.where(TournamentEvent.status_type == status_type)
+            query = query.order_by(
+                TournamentEvent.start_timestamp.desc(),
+                TournamentEvent.sofascore_id.desc()
+            ).limit(limit).options(*load_options(TournamentEvent, profile))
+
+            return (await db.exec(query)).unique().all()
+        except SQLAlchemyError as exc:
+            logger.error(
+                f"Database error in TournamentEventService - get_head_to_head_events: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error occurred while fetching head to head events.")
+
+    async def get_head_to_head(
+            self, db: AsyncSession, team_id: int, opponent_id: int,
+            limit: int = settings.DEFAULT_PAGE_SIZE) -> HeadToHead:
+        events = await self.get_head_to_head_events(
+            db, team_id, opponent_id, limit=limit,
+            profile=LoadProfile.WITH_TEAMS)
+
+        record = dict(played=0, wins=0, draws=0, losses=0,
+                      goals_for=0, goals_against=0)
+        for event in events:
+            if event.status_type != 'finished':
+                continue
+            home = event.home_team_id == team_id
+            scored = event.home_score_current if home else event.away_score_current
+            conceded = event.away_score_current if home else event.home_score_current
+            record['played'] += 1
+            record['goals_for'] += scored
+            record['goals_against'] += conceded
+            if scored > conceded:
+                record['wins'] += 1
+            elif scored == conceded:
+                record['draws'] += 1
+            else:
+                record['losses'] += 1
+
+        return HeadToHead(team_id=team_id, opponent_id=opponent_id,
+                          events=events, **record)
+
+    async def get_all_events(self, db: AsyncSession,
+                             profile: LoadProfile = LoadProfile.NONE
+                             ) -> List[TournamentEvent]:
         try:
-            events = await self.tournament_event_repo.get_all(db)
+            events = await self.event_repo.get_all(
+                db, options=load_options(TournamentEvent, profile))
             if not events:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -289,17 +736,29 @@ class TournamentEventService:
 
     async def update_event(self, db: AsyncSession, event_id: int, event_data: TournamentEventBase) -> TournamentEvent:
         try:
-            event = await self.tournament_event_repo.get(db, event_id)
+            event = await self.event_repo.get(db, event_id)
             if not event:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Tournament event not found.")
+            # Re-read under the season's lock, as upsert_events_many does.
+            await lock_seasons(db, [event.season_id or event_data.season_id])
+            await db.refresh(event)
+            previous = EventResult.of(event)
 
             # Update event attributes
             event.slug = event_data.slug or event.slug
             event.detail_id = event_data.detail_id or event.detail_id
             event.home_team_id = event_data.home_team_id or event.home_team_id
             event.away_team_id = event_data.away_team_id or event.away_team_id
+            # An event never moves to another season, it only gets one.
+            event.season_id = event.season_id or event_data.season_id
+            event.status_code = event_data.status_code or event.status_code
+            event.status_description = event_data.status_description or event.status_description
+            event.status_type = event_data.status_type or event.status_type
+            # A corrected result may well be 0.
+            event.home_score_current = event_data.home_score_current
+            event.away_score_current = event_data.away_score_current
             event.home_score_period_1 = event_data.home_score_period_1 or event.home_score_period_1
             event.away_score_period_1 = event_data.away_score_period_1 or event.away_score_period_1
             event.home_score_period_2 = event_data.home_score_period_2 or event.home_score_period_2
@@ -314,7 +773,12 @@ class TournamentEventService:
             event.has_eventplayer_statistics = event_data.has_eventplayer_statistics or event.has_eventplayer_statistics
             event.has_eventplayer_heatmap = event_data.has_eventplayer_heatmap
 
-            updated_event = await self.tournament_event_repo.update(db, event)
+            await mark_ratings_stale(db, [(previous, EventResult.of(event))])
+            for season_id, pairs in season_changes(
+                    [(previous, EventResult.of(event))]).items():
+                await apply_event_changes(
+                    db, event.tournament_id, season_id, pairs)
+            updated_event = await self.event_repo.update(db, event)
             return updated_event
         except CRUDRepositoryException as exc:
             logger.error(
@@ -331,13 +795,13 @@ class TournamentEventService:
 
     async def delete_event(self, db: AsyncSession, event_id: int) -> None:
         try:
-            event = await self.tournament_event_repo.get(db, event_id)
+            event = await self.event_repo.get(db, event_id)
             if not event:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Tournament event not found.")
 
-            await self.tournament_event_repo.delete(db, event)
+            await self.event_repo.delete(db, event)
         except CRUDRepositoryException as exc:
             logger.error(
                 f"Repository error in TournamentEventService - delete_event: {str(exc)}")
@@ -369,6 +833,7 @@ class TournamentSeasonService:
                 tournament_id=season_data.tournament_id
             )
             created_season = await self.tournament_season_repo.create(db, tournament_season)
+            await response_cache.bump(SEASONS)
             return created_season
         except CRUDRepositoryException as exc:
             logger.error(
@@ -386,11 +851,12 @@ class TournamentSeasonService:
     async def get_tournament_seasons_by_tournament(
             self,
             db: AsyncSession,
-            tournament_id: int) -> List[TournamentSeason]:
+            tournament_id: int,
+            profile: LoadProfile = LoadProfile.NONE) -> List[TournamentSeason]:
         try:
             query = select(TournamentSeason).where(
                 TournamentSeason.tournament_id == tournament_id
-            )
+            ).options(*load_options(TournamentSeason, profile))
             result = await db.exec(query)
             seasons = result.all()
 
@@ -414,13 +880,39 @@ class TournamentSeasonService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Unexpected error occurred.")
 
-    async def get_tournament_season_by_id(self, db: AsyncSession, season_id: int) -> TournamentSeason:
+    async def get_tournament_seasons_page(
+            self,
+            db: AsyncSession,
+            tournament_id: int,
+            cursor: str | None = None,
+            limit: int = settings.DEFAULT_PAGE_SIZE,
+            profile: LoadProfile = LoadProfile.NONE,
+    ) -> Tuple[List[TournamentSeason], str | None]:
         try:
-            season = await self.tournament_season_repo.get(db, season_id)
+            query = select(TournamentSeason).where(
+                TournamentSeason.tournament_id == tournament_id)
+            return await self.tournament_season_repo.get_page(
+                db, query=query, cursor=cursor, limit=limit,
+                options=load_options(TournamentSeason, profile))
+        except CRUDRepositoryException as exc:
+            logger.error(
+                f"Repository error in TournamentSeasonService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error occurred while fetching tournament seasons.")
+
+    async def get_tournament_season_by_id(self, db: AsyncSession, season_id: int,
+                                          profile: LoadProfile = LoadProfile.NONE
+                                          ) -> TournamentSeason:
+        try:
+            season = await self.tournament_season_repo.get(
+                db, season_id, options=load_options(TournamentSeason, profile))
             if not season:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail="Tournament season not found.")
             return season
+        except HTTPException:
+            raise
         except CRUDRepositoryException as exc:
             logger.error(
                 f"Repository error in TournamentSeasonService: {str(exc)}")
@@ -435,9 +927,11 @@ class TournamentSeasonService:
                 detail="Unexpected error occurred.")
 
     async def get_all_tournament_seasons(
-            self, db: AsyncSession) -> List[TournamentSeason]:
+            self, db: AsyncSession,
+            profile: LoadProfile = LoadProfile.NONE) -> List[TournamentSeason]:
         try:
-            seasons = await self.tournament_season_repo.get_all(db)
+            seasons = await self.tournament_season_repo.get_all(
+                db, options=load_options(TournamentSeason, profile))
             return seasons
         except CRUDRepositoryException as exc:
             logger.error(
@@ -466,6 +960,7 @@ class TournamentSeasonService:
             season.tournament_id = season_data.tournament_id
 
             updated_season = await self.tournament_season_repo.update(db, season)
+            await response_cache.bump(SEASONS)
             return updated_season
         except CRUDRepositoryException as exc:
             logger.error(
@@ -489,6 +984,7 @@ class TournamentSeasonService:
                     detail="Tournament season not found.")
 
             await self.tournament_season_repo.delete(db, season)
+            await response_cache.bump(SEASONS)
         except CRUDRepositoryException as exc:
             logger.error(
                 f"Repository error in TournamentSeasonService: {str(exc)}")
@@ -502,6 +998,38 @@ class TournamentSeasonService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Unexpected error occurred.")
 
+    async def upsert_seasons_many(
+            self,
+            db: AsyncSession,
+            seasons_data: List[TournamentSeasonBase],
+            commit: bool = True) -> List[TournamentSeason]:
+        """
+        Bulk insert or update tournament seasons.
+        """
+        try:
+            rows = [season.model_dump() for season in seasons_data]
+            seasons = await self.tournament_season_repo.upsert_many(
+                db, rows,
+                conflict_cols=['sofascore_id'],
+                update_cols=['name', 'year', 'tournament_id', 'updated_at'],
+                commit=commit)
+            # Uncommitted writes are bumped by the caller after its commit.
+            if commit:
+                await response_cache.bump(SEASONS)
+            return seasons
+        except CRUDRepositoryException as exc:
+            logger.error(
+                f"Repository error in TournamentSeasonService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error occurred while saving tournament seasons.")
+        except Exception as exc:
+            logger.error(
+                f"Unexpected error in TournamentSeasonService: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Unexpected error occurred.")
+
     async def get_or_create_season(self, db: AsyncSession,
                                    season_data: TournamentSeasonBase
                                    ) -> TournamentSeason:
@@ -519,6 +1047,7 @@ class TournamentSeasonService:
                 )
 
                 season = await self.tournament_season_repo.create(db, season)
+                await response_cache.bump(SEASONS)
 
             return season
         except CRUDRepositoryException as exc:
@@ -574,6 +1103,33 @@ class TeamService:
                 detail="Unexpected error occurred."
             )
 
+    async def upsert_teams_many(self,
+                                db: AsyncSession,
+                                teams_data: List[TeamBase],
+                                commit: bool = True) -> List[Team]:
+        """
+        Bulk insert or update teams. Country and ranking are left
+        untouched on existing rows since event payloads don't carry them.
+        """
+        try:
+            rows = [team.model_dump() for team in teams_data]
+            teams = await self.team_repo.upsert_many(
+                db, rows,
+                conflict_cols=['sofascore_id'],
+                update_cols=['name', 'name_code', 'slug', 'updated_at'],
+                commit=commit)
+            return teams
+        except CRUDRepositoryException as exc:
+            logger.error(
+                f"Repository error in TeamService - upsert_teams_many: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error saving teams.")
+        except Exception as exc:
+            logger.error(
+                f"Unexpected error in TeamService - upsert_teams_many: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Unexpected error occurred.")
+
     async def create_team(self, db: AsyncSession, team_data: TeamBase) -> Team:
         try:
             new_team = await self.team_repo.create(db, team_data)
@@ -648,20 +1204,31 @@ class TeamService:
 
     # Extra Functions
 
+    @staticmethod
+    def teams_of_events_query(*conditions):
+        """
+        Teams playing in the events matching `conditions`, home or away.
+        """
+        home = select(TournamentEvent.home_team_id).where(*conditions)
+        away = select(TournamentEvent.away_team_id).where(*conditions)
+        return select(Team).where(
+            col(Team.sofascore_id).in_(union_all(home, away))
+        ).order_by(Team.name)
+
     async def get_team_by_tournament(self, db: AsyncSession, tournament_id: int, season_id: int) -> List[Team]:
         try:
-            query = select(Team).join(TournamentEvent).where(
-                or_(
-                    TournamentEvent.tournament_id == tournament_id,
-                    TournamentEvent.season_id == season_id
-                )
+            query = self.teams_of_events_query(
+                TournamentEvent.tournament_id == tournament_id,
+                TournamentEvent.season_id == season_id,
             )
             result = await db.exec(query)
-            teams = result.scalars().all()
+            teams = result.all()
             if not teams:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                     detail="No teams found for the given tournament and season.")
             return teams
+        except HTTPException:
+            raise
         except Exception as exc:
             logger.error(
                 f"Unexpected error in TeamService - get_team_by_tournament: {str(exc)}")
@@ -670,16 +1237,18 @@ class TeamService:
 
     async def get_team_by_tournament_group(self, db: AsyncSession, group_id: int, season_id: int) -> List[Team]:
         try:
-            query = select(Team).join(TournamentEvent).where(
+            query = self.teams_of_events_query(
                 TournamentEvent.stage_id == group_id,
-                TournamentEvent.season_id == season_id
+                TournamentEvent.season_id == season_id,
             )
             result = await db.exec(query)
-            teams = result.scalars().all()
+            teams = result.all()
             if not teams:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                     detail="No teams found for the given tournament group and season.")
             return teams
+        except HTTPException:
+            raise
         except Exception as exc:
             logger.error(
                 f"Unexpected error in TeamService - get_team_by_tournament_group: {str(exc)}")
@@ -688,15 +1257,16 @@ class TeamService:
 
     async def get_team_by_season(self, db: AsyncSession, season_id: int) -> List[Team]:
         try:
-            query = select(Team).join(TournamentEvent).where(
-                TournamentEvent.season_id == season_id
-            )
+            query = self.teams_of_events_query(
+                TournamentEvent.season_id == season_id)
             result = await db.exec(query)
-            teams = result.scalars().all()
+            teams = result.all()
             if not teams:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                     detail="No teams found for the given season.")
             return teams
+        except HTTPException:
+            raise
         except Exception as exc:
             logger.error(
                 f"Unexpected error in TeamService - get_team_by_season: {str(exc)}")
@@ -801,6 +1371,90 @@ class TournamentGroupService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Unexpected error occurred.")
 
 
+class PlayerService:
+    def __init__(self, player_repo: CRUDRepository[Player]):
+        self.player_repo = player_repo
+
+    async def get_player_by_id(self, db: AsyncSession,
+                               player_id: int) -> Player:
+        try:
+            player = await self.player_repo.get(db, player_id)
+            if not player:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Player not found.")
+            return player
+        except HTTPException:
+            raise
+        except CRUDRepositoryException as exc:
+            logger.error(
+                f"Repository error in PlayerService - get_player_by_id: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error fetching player.")
+        except Exception as exc:
+            logger.error(
+                f"Unexpected error in PlayerService - get_player_by_id: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Unexpected error occurred.")
+
+    async def upsert_players_many(self,
+                                  db: AsyncSession,
+                                  players_data: List[PlayerBase],
+                                  update_cols: Sequence[str] | None = None,
+                                  commit: bool = True) -> List[Player]:
+        """
+        Bulk insert or update players. Lineups and sitemaps each carry
+        part of a player, `update_cols` keeps the other part.
+        """
+        try:
+            rows = [player.model_dump() for player in players_data]
+            players = await self.player_repo.upsert_many(
+                db, rows,
+                conflict_cols=['sofascore_id'],
+                update_cols=update_cols,
+                commit=commit)
+            return players
+        except CRUDRepositoryException as exc:
+            logger.error(
+                f"Repository error in PlayerService - upsert_players_many: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error saving players.")
+        except Exception as exc:
+            logger.error(
+                f"Unexpected error in PlayerService - upsert_players_many: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Unexpected error occurred.")
+
+
+class EventSeedService:
+    def __init__(self, event_seed_repo: CRUDRepository[EventSeed]):
+        self.event_seed_repo = event_seed_repo
+
+    async def upsert_seeds_many(self,
+                                db: AsyncSession,
+                                seeds_data: List[EventSeedBase],
+                                commit: bool = True) -> List[EventSeed]:
+        """
+        Bulk insert or update event seeds keyed by their custom id.
+        """
+        try:
+            rows = [seed.model_dump() for seed in seeds_data]
+            seeds = await self.event_seed_repo.upsert_many(
+                db, rows,
+                conflict_cols=['custom_id'],
+                commit=commit)
+            return seeds
+        except CRUDRepositoryException as exc:
+            logger.error(
+                f"Repository error in EventSeedService - upsert_seeds_many: {str(exc)}")
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                                detail="Error saving event seeds.")
+        except Exception as exc:
+            logger.error(
+                f"Unexpected error in EventSeedService - upsert_seeds_many: {str(exc)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Unexpected error occurred.")
+
+
 tournament_service = TournamentService(
     tournament_repo=CRUDRepository(model=Tournament))
 category_service = CategoryService(
@@ -814,3 +1468,9 @@ tournament_event_service = TournamentEventService(
 team_service = TeamService(
     team_repo=CRUDRepository(model=Team)
 )
+event_seed_service = EventSeedService(
+    event_seed_repo=CRUDRepository(model=EventSeed)
+)
+player_service = PlayerService(
+    player_repo=CRUDRepository(model=Player)
+)
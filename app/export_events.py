@@ -0,0 +1,46 @@
+"""
+Writes tournament events to a local Parquet or Arrow IPC file.
+
+    python -m app.export_events stats/exports/events.parquet
+    python -m app.export_events epl.arrow --format arrow --tournament 17
+"""
+import argparse
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+from app.exports.arrow import ArrowFormat, select_schema, write_events
+from app.exports.events import events_export_query
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('path')
+    parser.add_argument('--format', type=ArrowFormat,
+                        default=ArrowFormat.PARQUET,
+                        choices=list(ArrowFormat))
+    parser.add_argument('--tournament', type=int)
+    parser.add_argument('--season', type=int)
+    parser.add_argument('--start-from', type=datetime.fromisoformat)
+    parser.add_argument('--start-to', type=datetime.fromisoformat)
+    parser.add_argument('--columns', nargs='+', help="defaults to all")
+    args = parser.parse_args()
+
+    try:
+        schema = select_schema(args.columns)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    query = events_export_query(tournament_id=args.tournament,
+                                season_id=args.season,
+                                start_from=args.start_from,
+                                start_to=args.start_to,
+                                columns=schema.names)
+
+    Path(args.path).parent.mkdir(parents=True, exist_ok=True)
+    rows = asyncio.run(write_events(query, args.path, args.format, schema))
+    print(f"Exported {rows} events to {args.path}.")
+
+
+if __name__ == '__main__':
+    main()
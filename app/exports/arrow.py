@@ -0,0 +1,184 @@
+from enum import Enum
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Select
+
+from app.core.config import settings
+from app.exports.events import stream_rows
+
+
+SCORE = pa.int16()
+STATUS = pa.dictionary(pa.int16(), pa.string())
+TIMESTAMP = pa.timestamp('s', tz='UTC')
+
+# Typed columns of tournament_event, stored timestamps are naive utc.
+EVENT_ARROW_SCHEMA = pa.schema([
+    ('sofascore_id', pa.int64()),
+    ('slug', pa.string()),
+    ('detail_id', pa.int64()),
+    ('stage_id', pa.int64()),
+    ('tournament_id', pa.int64()),
+    ('season_id', pa.int64()),
+    ('home_team_id', pa.int64()),
+    ('away_team_id', pa.int64()),
+    ('status_code', pa.int16()),
+    ('status_description', STATUS),
+    ('status_type', STATUS),
+    ('home_score_current', SCORE),
+    ('home_score_period_1', SCORE),
+    ('home_score_period_2', SCORE),
+    ('home_score_normaltime', SCORE),
+    ('home_score_extratime', SCORE),
+    ('home_score_penalties', SCORE),
+    ('away_score_current', SCORE),
+    ('away_score_period_1', SCORE),
+    ('away_score_period_2', SCORE),
+    ('away_score_normaltime', SCORE),
+    ('away_score_extratime', SCORE),
+    ('away_score_penalties', SCORE),
+    ('has_xg', pa.bool_()),
+    ('has_eventplayer_statistics', pa.bool_()),
+    ('has_eventplayer_heatmap', pa.bool_()),
+    ('start_timestamp', TIMESTAMP),
+    ('end_timestamp', TIMESTAMP),
+])
+
+# Known values of the dictionary columns, unseen ones are appended while
+# exporting.
+STATUS_VOCABULARY: Dict[str, Sequence[str]] = dict(
+    status_type=('notstarted', 'inprogress', 'finished', 'postponed',
+                 'canceled', 'interrupted', 'delayed', 'willcontinue'),
+    status_description=('Not started', 'Ended', 'AET', 'AP', 'Postponed',
+                        'Canceled', 'Interrupted', 'Abandoned', 'Removed',
+                        'Halftime', '1st half', '2nd half'),
+)
+
+
+class DictionaryEncoder:
+    """
+    Encodes a dictionary column of every batch of one export against one
+    dictionary that only grows. An Arrow IPC file takes a single
+    dictionary per field plus deltas, a batch bringing its own dictionary
+    would replace it.
+    """
+
+    def __init__(self, type: pa.DictionaryType, values: Sequence[str] = ()):
+        self.type = type
+        self.values = list(values)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, column: Sequence[str | None]) -> pa.DictionaryArray:
+        indices = list()
+        for value in column:
+            if value is not None and value not in self.codes:
+                self.codes[value] = len(self.values)
+                self.values.append(value)
+            indices.append(None if value is None else self.codes[value])
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=self.type.index_type),
+            pa.array(self.values, type=self.type.value_type))
+
+
+class ArrowFormat(str, Enum):
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+ARROW_MEDIA_TYPES = {
+    ArrowFormat.PARQUET: "application/vnd.apache.parquet",
+    ArrowFormat.ARROW: "application/vnd.apache.arrow.file",
+}
+
+
+def select_schema(columns: Sequence[str] | None = None) -> pa.Schema:
+    """
+    Schema pruned to `columns`, raises ValueError on unknown names.
+    """
+    if not columns:
+        return EVENT_ARROW_SCHEMA
+
+    unknown = set(columns) - set(EVENT_ARROW_SCHEMA.names)
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}.")
+    return pa.schema([EVENT_ARROW_SCHEMA.field(name) for name in columns])
+
+
+def dictionary_encoders(schema: pa.Schema) -> Dict[str, DictionaryEncoder]:
+    return {field.name: DictionaryEncoder(
+                field.type, STATUS_VOCABULARY.get(field.name, ()))
+            for field in schema
+            if pa.types.is_dictionary(field.type)}
+
+
+def to_record_batch(rows: Sequence[Dict[str, Any]], schema: pa.Schema,
+                    encoders: Dict[str, DictionaryEncoder]
+                    ) -> pa.RecordBatch:
+    arrays = list()
+    for field in schema:
+        column = [row[field.name] for row in rows]
+        if field.name in encoders:
+            arrays.append(encoders[field.name].encode(column))
+        else:
+            arrays.append(pa.array(column, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+async def write_events(query: Select, sink: str | BinaryIO,
+                       format: ArrowFormat, schema: pa.Schema) -> int:
+    """
+    Streams the rows of `query` (selecting exactly the `schema` columns)
+    into a zstd compressed Parquet or Arrow IPC file. Returns the row
+    count.
+    """
+    return await write_batches(stream_rows(query), sink, format, schema)
+
+
+async def write_batches(batches: AsyncIterator[Sequence[Dict[str, Any]]],
+                        sink: str | BinaryIO, format: ArrowFormat,
+                        schema: pa.Schema) -> int:
+    """
+    Writes batches of rows into a Parquet or Arrow IPC file.
+
+    Parquet row groups are buffered up to EXPORT_ROW_GROUP_SIZE rows so
+    readers get large, well compressed column chunks. Arrow IPC batches
+    share their dictionaries, new values go out as dictionary deltas.
+    """
+    if format == ArrowFormat.PARQUET:
+        writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_file(
+            sink, schema,
+            options=pa.ipc.IpcWriteOptions(compression='zstd',
+                                           emit_dictionary_deltas=True))
+    encoders = dictionary_encoders(schema)
+
+    written = 0
+    buffered: List[pa.RecordBatch] = list()
+    buffered_rows = 0
+
+    def flush() -> None:
+        nonlocal buffered_rows
+        if buffered:
+            writer.write_table(pa.Table.from_batches(buffered, schema=schema))
+            buffered.clear()
+            buffered_rows = 0
+
+    try:
+        async for rows in batches:
+            batch = to_record_batch(rows, schema, encoders)
+            written += batch.num_rows
+            if format == ArrowFormat.ARROW:
+                writer.write_batch(batch)
+                continue
+
+            buffered.append(batch)
+            buffered_rows += batch.num_rows
+            if buffered_rows >= settings.EXPORT_ROW_GROUP_SIZE:
+                flush()
+        flush()
+    finally:
+        writer.close()
+
+    return written
@@ -0,0 +1,105 @@
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+import orjson
+from sqlalchemy import Select, select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.football import TournamentEvent, TournamentEventBase
+
+
+# Every scraped column, in model order.
+EXPORT_COLUMNS: List[str] = list(TournamentEventBase.model_fields)
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def events_export_query(tournament_id: int | None = None,
+                        season_id: int | None = None,
+                        start_from: datetime | None = None,
+                        start_to: datetime | None = None,
+                        columns: Sequence[str] = EXPORT_COLUMNS) -> Select:
+    """
+    Plain column select (no ORM objects) of the events to export, in kick
+    off order.
+    """
+    query = select(*(getattr(TournamentEvent, name) for name in columns))
+    if tournament_id is not None:
+        query = query.where(TournamentEvent.tournament_id == tournament_id)
+    if season_id is not None:
+        query = query.where(TournamentEvent.season_id == season_id)
+    if start_from:
+        query = query.where(TournamentEvent.start_timestamp >= start_from)
+    if start_to:
+        query = query.where(TournamentEvent.start_timestamp < start_to)
+    return query.order_by(TournamentEvent.start_timestamp,
+                          TournamentEvent.sofascore_id)
+
+
+async def stream_rows(query: Select,
+                      batch_size: int = settings.EXPORT_BATCH_SIZE
+                      ) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+    """
+    Yields the rows of `query` in batches through a server side cursor.
+
+    The session is owned by the generator: request scoped sessions are
+    closed before a streaming response starts sending.
+    """
+    async with SessionLocal() as db:
+        result = await db.stream(
+            query.execution_options(yield_per=batch_size))
+        async for rows in result.mappings().partitions():
+            yield rows
+
+
+async def encode_ndjson(rows: AsyncIterator[Sequence[Dict[str, Any]]]
+                        ) -> AsyncIterator[bytes]:
+    async for batch in rows:
+        yield b"".join(
+            orjson.dumps(row, option=orjson.OPT_NAIVE_UTC
+                         | orjson.OPT_APPEND_NEWLINE)
+            for row in map(dict, batch))
+
+
+async def encode_csv(rows: AsyncIterator[Sequence[Dict[str, Any]]],
+                     columns: Sequence[str] = EXPORT_COLUMNS
+                     ) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    async for batch in rows:
+        writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value
+             for value in row.values()]
+            for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Header only export.
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+EXPORT_ENCODERS = {
+    ExportFormat.NDJSON: encode_ndjson,
+    ExportFormat.CSV: encode_csv,
+}
+
+
+def export_events(query: Select, format: ExportFormat) -> AsyncIterator[bytes]:
+    return EXPORT_ENCODERS[format](stream_rows(query))
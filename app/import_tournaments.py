@@ -0,0 +1,65 @@
+"""
+Imports tournaments in process, without going through the api.
+
+    python -m app.import_tournaments 17 8 23
+    python -m app.import_tournaments --file scraping/top_european_leagues.json
+"""
+import argparse
+import asyncio
+import json
+from typing import List
+
+from app.core.http_client import create_scraper_client
+from app.core.jobs import create_redis_pool
+from app.core.response_cache import response_cache
+from app.db.session import SessionLocal
+from app.scrapers.tournament import ingest_tournaments_batch
+
+
+def load_tournament_ids(path: str) -> List[int]:
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return [int(tournament['sofascore_id']) for tournament in data]
+
+
+async def import_tournaments(tournament_ids: List[int]) -> None:
+    # Writes bump the catalog cache versions the api workers read, a
+    # bump kept in this process would leave them serving stale pages.
+    redis = await create_redis_pool()
+    response_cache.attach_redis(redis)
+    client = create_scraper_client()
+    try:
+        async with SessionLocal() as db:
+            result = await ingest_tournaments_batch(
+                db=db,
+                client=client,
+                tournament_ids=tournament_ids,
+            )
+    finally:
+        await client.aclose()
+        response_cache.attach_redis(None)
+        await redis.aclose()
+
+    print(f"Imported {result['tournaments']} tournaments, "
+          f"{result['seasons']} seasons.")
+    if result['failed']:
+        print(f"Failed: {result['failed']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('tournament_ids', nargs='*', type=int)
+    parser.add_argument('--file', help="json list with sofascore_id keys")
+    args = parser.parse_args()
+
+    tournament_ids = list(args.tournament_ids)
+    if args.file:
+        tournament_ids.extend(load_tournament_ids(args.file))
+    if not tournament_ids:
+        parser.error("no tournament ids given")
+
+    asyncio.run(import_tournaments(tournament_ids))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+from datetime import date, datetime
+from enum import Enum
+from typing import List
+from sqlmodel import SQLModel
+
+from app.models.football import PublicTournamentEventWithTeams
+
+
+class TieBreaker(str, Enum):
+    POINTS = "points"
+    GOAL_DIFFERENCE = "goal_difference"
+    GOALS_FOR = "goals_for"
+    WINS = "wins"
+    HEAD_TO_HEAD = "head_to_head"
+    HEAD_TO_HEAD_GOAL_DIFFERENCE = "head_to_head_goal_difference"
+
+
+class SeasonRef(SQLModel):
+    tournament_id: int
+    season_id: int
+
+
+class StandingRow(SQLModel):
+    position: int
+    team_id: int
+    team_name: str | None = None
+    played: int
+    wins: int
+    draws: int
+    losses: int
+    goals_for: int
+    goals_against: int
+    goal_difference: int
+    points: int
+
+
+class SeasonStandings(SQLModel):
+    tournament_id: int
+    season_id: int
+    standings: List[StandingRow]
+
+
+class TeamStandingsHistory(SQLModel):
+    team_id: int
+    team_name: str | None = None
+    points: List[int]
+    positions: List[int]
+
+
+class StandingsHistory(SQLModel):
+    tournament_id: int
+    season_id: int
+    dates: List[date]
+    teams: List[TeamStandingsHistory]
+
+
+class StandingsBatchRequest(SQLModel):
+    seasons: List[SeasonRef]
+    tie_breakers: List[TieBreaker] = [TieBreaker.POINTS,
+                                      TieBreaker.GOAL_DIFFERENCE,
+                                      TieBreaker.GOALS_FOR]
+
+
+class EventPrediction(SQLModel):
+    event_id: int
+    home_team_id: int
+    away_team_id: int
+    start_timestamp: datetime | None = None
+    home_expected_goals: float
+    away_expected_goals: float
+    home_win: float
+    draw: float
+    away_win: float
+    # scorelines[home goals][away goals]
+    scorelines: List[List[float]]
+
+
+class TeamSimulation(SQLModel):
+    team_id: int
+    team_name: str | None = None
+    points: int
+    expected_position: float
+    title: float
+    top_four: float
+    relegation: float
+    # probability of finishing 1st, 2nd, ...
+    positions: List[float]
+
+
+class SeasonSimulation(SQLModel):
+    tournament_id: int
+    season_id: int
+    runs: int
+    model: str
+    remaining_matches: int
+    teams: List[TeamSimulation]
+
+
+class HeadToHead(SQLModel):
+    """
+    Record of `team_id` against `opponent_id` over the returned events.
+    """
+    team_id: int
+    opponent_id: int
+    played: int
+    wins: int
+    draws: int
+    losses: int
+    goals_for: int
+    goals_against: int
+    events: List[PublicTournamentEventWithTeams]
+
+
+class LeaderboardScope(str, Enum):
+    # average of every team over its matches
+    TEAM = "team"
+    # single team performances in one match
+    MATCH = "match"
+
+
+class LeaderboardRow(SQLModel):
+    position: int
+    team_id: int
+    team_name: str | None = None
+    # set for match leaderboards
+    event_id: int | None = None
+    # matches averaged, set for team leaderboards
+    matches: int | None = None
+    value: float
+
+
+class StatLeaderboard(SQLModel):
+    stat_key: str
+    stat_name: str
+    period: str
+    scope: LeaderboardScope
+    season_id: int | None = None
+    rows: List[LeaderboardRow]
+
+
+class TeamMatchXG(SQLModel):
+    event_id: int
+    start_timestamp: datetime | None = None
+    opponent_id: int
+    shots_for: int
+    shots_against: int
+    goals_for: int
+    goals_against: int
+    xg_for: float
+    xg_against: float
+    xg_difference: float
+    # mean xg difference of the last `window` matches
+    rolling_xg_difference: float
+
+
+class TeamXG(SQLModel):
+    team_id: int
+    season_id: int | None = None
+    matches: int
+    shots_for: int
+    shots_against: int
+    goals_for: int
+    goals_against: int
+    xg_for: float
+    xg_against: float
+    xg_difference: float
+    # per match, in kick off order
+    trend: List[TeamMatchXG]
+
+
+class SeasonTeamXG(SQLModel):
+    team_id: int
+    team_name: str | None = None
+    matches: int
+    goals_for: int
+    goals_against: int
+    xg_for: float
+    xg_against: float
+    xg_difference: float
+
+
+class SeasonXG(SQLModel):
+    tournament_id: int
+    season_id: int
+    teams: List[SeasonTeamXG]
+
+
+class ShotDensity(SQLModel):
+    bins: int
+    shots: int
+    # [x bin][y bin], x from the attacked goal line
+    counts: List[List[int]]
+    xg: List[List[float]]
+    goals: List[List[int]]
+
+
+class PlayerHeatmap(SQLModel):
+    player_id: int
+    season_id: int | None = None
+    matches: int
+    points: int
+    # [x cells, y cells] over the 0-100 pitch coordinates
+    shape: List[int]
+    grid: List[List[int]]
+
+
+class PlayerSeasonTotals(SQLModel):
+    season_id: int | None = None
+    appearances: int
+    starts: int
+    minutes: int
+    rated_matches: int
+    average_rating: float | None = None
+
+
+class SquadPlayer(SQLModel):
+    player_id: int
+    player_name: str | None = None
+    appearances: int
+    starts: int
+    minutes: int
+    rated_matches: int
+    average_rating: float | None = None
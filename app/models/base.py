@@ -1,4 +1,6 @@
 from datetime import datetime
+from typing import Generic, List, TypeVar
+from pydantic import BaseModel
 from sqlmodel import Field, SQLModel
 from uuid import UUID
 from uuid_extensions import uuid7
@@ -25,3 +27,11 @@ class TimestampMixin(SQLModel):
 
 class DeleteResponse(SQLModel):
     deleted: int
+
+
+ItemT = TypeVar('ItemT')
+
+
+class Page(BaseModel, Generic[ItemT]):
+    items: List[ItemT]
+    next_cursor: str | None = None
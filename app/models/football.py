@@ -1,7 +1,12 @@
 from datetime import datetime
-from typing import List, Optional
+from uuid import UUID
+from typing import Any, Dict, List, Optional
+from sqlalchemy import (REAL, Column, Index, Integer, LargeBinary, SmallInteger,
+                        text)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import RelationshipProperty
 from sqlmodel import Field, SQLModel, Relationship
+from uuid_extensions import uuid7
 
 from app.models.base import TimestampMixin, IdMixin
 
@@ -10,6 +15,18 @@ class Base(IdMixin, TimestampMixin):
     pass
 
 
+class KeyedBase(Base):
+    """
+    Base of tables keyed on their own columns, the uuid stays an indexed
+    column outside the primary key as the migrations create it.
+    """
+    id: UUID = Field(default_factory=uuid7, index=True, nullable=False)
+
+
+# Relationships below never load by themselves ("noload"), every query
+# picks what it needs through a loading profile in app/crud/tournament.py.
+
+
 class CategoryBase(SQLModel):
     sofascore_id: int | None = Field(default=None, primary_key=True)
     name: str
@@ -21,7 +38,7 @@ class Category(Base, CategoryBase, table=True):
 
     tournaments: List["Tournament"] = Relationship(back_populates="category",
                                                    sa_relationship_kwargs={
-                                                       "lazy": "selectin",
+                                                       "lazy": "noload",
                                                    })
 
 
@@ -54,19 +71,19 @@ class Tournament(Base, TournamentBase, table=True):
 
     category: Category | None = Relationship(back_populates="tournaments",
                                              sa_relationship_kwargs={
-                                                 "lazy": "selectin",
+                                                 "lazy": "noload",
                                              })
 
     seasons: List["TournamentSeason"] = Relationship(
         back_populates="tournament",
         sa_relationship_kwargs={
-            "lazy": "selectin"
+            "lazy": "noload"
         })
 
     events: List["TournamentEvent"] | None = Relationship(
         back_populates="tournament",
         sa_relationship_kwargs={
-            "lazy": "selectin"
+            "lazy": "noload"
         }
     )
 
@@ -85,10 +102,17 @@ class TournamentSeasonBase(SQLModel):
 class TournamentSeason(Base, TournamentSeasonBase, table=True):
     __tablename__ = "tournament_season"
 
-    tournament: Optional[Tournament] = Relationship(back_populates="seasons")
+    tournament: Optional[Tournament] = Relationship(
+        back_populates="seasons",
+        sa_relationship_kwargs={
+            "lazy": "noload"
+        })
 
     groups: List["TournamentGroup"] = Relationship(
-        back_populates="tournament_season")
+        back_populates="tournament_season",
+        sa_relationship_kwargs={
+            "lazy": "noload"
+        })
 
 
 class PublicTournamentSeasonWithTournaments(TournamentSeasonBase):
@@ -106,11 +130,17 @@ class TournamentGroup(Base, TournamentGroupBase, table=True):
     __tablename__ = "tournament_group"
 
     tournament_season: TournamentSeason = Relationship(
-        back_populates="groups"
+        back_populates="groups",
+        sa_relationship_kwargs={
+            "lazy": "noload"
+        }
     )
 
     stages: Optional["TournamentEvent"] = Relationship(
-        back_populates="stage"
+        back_populates="stage",
+        sa_relationship_kwargs={
+            "lazy": "noload"
+        }
     )
 
 
@@ -130,7 +160,7 @@ class Team(Base, TeamBase, table=True):
         back_populates="home_team",
         sa_relationship_kwargs={
             'primaryjoin': 'TournamentEvent.home_team_id == Team.sofascore_id',
-            "lazy": 'joined',
+            "lazy": "noload",
         }
     )
 
@@ -138,7 +168,7 @@ class Team(Base, TeamBase, table=True):
         back_populates="away_team",
         sa_relationship_kwargs={
             'primaryjoin': 'TournamentEvent.away_team_id == Team.sofascore_id',
-            "lazy": 'joined',
+            "lazy": "noload",
         })
 
 
@@ -150,7 +180,12 @@ class TournamentEventBase(SQLModel):
     stage_id: int | None = Field(
         default=None, foreign_key="tournament_group.sofascore_id")
 
-    tournament_id: int = Field(foreign_key="tournament.sofascore_id")
+    # Partition key of tournament_event, so part of its primary key.
+    tournament_id: int = Field(foreign_key="tournament.sofascore_id",
+                               primary_key=True)
+
+    season_id: int | None = Field(
+        default=None, foreign_key="tournament_season.sofascore_id")
 
     home_team_id: int = Field(foreign_key="team.sofascore_id")
 
@@ -182,18 +217,47 @@ class TournamentEventBase(SQLModel):
     end_timestamp: datetime | None = Field(default=None)
 
 
-class TournamentEvent(Base, TournamentEventBase, table=True):
+class TournamentEvent(KeyedBase, TournamentEventBase, table=True):
     __tablename__ = "tournament_event"
+    __table_args__ = (
+        # A season's events in kick off order.
+        Index('ix_tournament_event_season_id_start_timestamp',
+              'season_id', 'start_timestamp'),
+        # A team's fixtures, newest first, one index per side.
+        Index('ix_tournament_event_home_team_id_start_timestamp',
+              'home_team_id', 'start_timestamp'),
+        Index('ix_tournament_event_away_team_id_start_timestamp',
+              'away_team_id', 'start_timestamp'),
+        # Meetings of two teams whatever the venue.
+        Index('ix_tournament_event_team_pair_start_timestamp',
+              text('least(home_team_id, away_team_id)'),
+              text('greatest(home_team_id, away_team_id)'),
+              'start_timestamp'),
+        # Hash partitions of the tournament, created by the migration.
+        # Unique keys have to contain the partition key: the primary key
+        # is (sofascore_id, tournament_id) and bulk upserts conflict on it.
+        # sofascore_id alone isn't unique, so the per event detail tables
+        # can't have a foreign key to it.
+        {'postgresql_partition_by': 'HASH (tournament_id)'},
+    )
 
-    stage: Optional[TournamentGroup] = Relationship(back_populates="stages")
+    stage: Optional[TournamentGroup] = Relationship(
+        back_populates="stages",
+        sa_relationship_kwargs={
+            "lazy": "noload"
+        })
 
-    tournament: Tournament = Relationship(back_populates="events")
+    tournament: Tournament = Relationship(
+        back_populates="events",
+        sa_relationship_kwargs={
+            "lazy": "noload"
+        })
 
     home_team: Team | None = Relationship(
         back_populates='home_events',
         sa_relationship_kwargs={
             'primaryjoin': 'TournamentEvent.home_team_id == Team.sofascore_id',
-            "lazy": 'joined',
+            "lazy": "noload",
         }
     )
 
@@ -201,9 +265,311 @@ class TournamentEvent(Base, TournamentEventBase, table=True):
         back_populates='away_events',
         sa_relationship_kwargs={
             'primaryjoin': 'TournamentEvent.away_team_id == Team.sofascore_id',
-            "lazy": 'joined',
+            "lazy": "noload",
         })
 
 
 class PublicTournamentWithSeasons(TournamentWithCategoryPublic):
     seasons: List[TournamentSeasonBase] | None = None
+
+
+class PublicTournamentEventWithTeams(TournamentEventBase):
+    home_team: TeamBase | None = None
+    away_team: TeamBase | None = None
+
+
+class EventSeedBase(SQLModel):
+    custom_id: str = Field(primary_key=True)
+    sofascore_id: int | None = Field(default=None, index=True)
+    slug: str | None = None
+    sofascore_link: str | None = None
+    lastmod: datetime | None = None
+
+
+class EventSeed(KeyedBase, EventSeedBase, table=True):
+    """
+    Event urls loaded from the sitemap, waiting to be scraped.
+    """
+    __tablename__ = "event_seed"
+
+
+class TeamRatingBase(SQLModel):
+    team_id: int = Field(primary_key=True, foreign_key="team.sofascore_id")
+    rating: float
+    matches: int = 0
+    last_event_id: int | None = None
+    last_played_at: datetime | None = None
+
+
+class TeamRating(KeyedBase, TeamRatingBase, table=True):
+    """
+    Current Elo rating of a team.
+    """
+    __tablename__ = "team_rating"
+
+
+class TeamRatingSnapshotBase(SQLModel):
+    # No foreign key to tournament_event, see TournamentEvent.
+    event_id: int = Field(primary_key=True)
+    team_id: int = Field(primary_key=True, foreign_key="team.sofascore_id")
+    start_timestamp: datetime | None = None
+    rating_before: float
+    rating_after: float
+
+
+class TeamRatingSnapshot(KeyedBase, TeamRatingSnapshotBase, table=True):
+    """
+    Rating of a team before and after every rated event.
+    """
+    __tablename__ = "team_rating_snapshot"
+    __table_args__ = (
+        Index('ix_team_rating_snapshot_team_id_start_timestamp',
+              'team_id', 'start_timestamp'),
+    )
+
+
+class RatingCheckpointBase(SQLModel):
+    name: str = Field(primary_key=True)
+    formula: str
+    events: int = 0
+    last_event_id: int | None = None
+    last_start_timestamp: datetime | None = None
+    # Kick off of the earliest result that changed behind the checkpoint,
+    # ratings are replayed from there on the next update.
+    rewind_from: datetime | None = None
+
+
+class RatingCheckpoint(KeyedBase, RatingCheckpointBase, table=True):
+    """
+    Progress of a rating engine, a changed formula forces a rebuild.
+    """
+    __tablename__ = "rating_checkpoint"
+
+
+class TeamSeasonAggregateBase(SQLModel):
+    season_id: int = Field(primary_key=True,
+                           foreign_key="tournament_season.sofascore_id")
+    team_id: int = Field(primary_key=True, foreign_key="team.sofascore_id",
+                         index=True)
+    tournament_id: int = Field(foreign_key="tournament.sofascore_id")
+    played: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    points: int = 0
+    # Latest results, oldest first, e.g. "WDLWW".
+    form: str = ""
+    form_event_ids: List[int] = Field(
+        default_factory=list,
+        sa_column=Column(ARRAY(Integer), nullable=False,
+                         server_default='{}'))
+    last_played_at: datetime | None = None
+
+
+class TeamSeasonAggregate(KeyedBase, TeamSeasonAggregateBase, table=True):
+    """
+    Running totals of a team in a season, kept up to date by the event
+    writes instead of being aggregated on read.
+    """
+    __tablename__ = "team_season_aggregate"
+
+
+class EventDetailBase(SQLModel):
+    event_id: int = Field(primary_key=True)
+    # links key of the endpoint, e.g. "event_statistic".
+    kind: str = Field(primary_key=True)
+    # False when sofascore has no such detail for the event.
+    found: bool = True
+    # Raw response, only kept for kinds without a parsed table.
+    payload: Dict[str, Any] | None = Field(
+        default=None, sa_column=Column(JSONB, nullable=True))
+    fetched_at: datetime = Field(default_factory=datetime.now)
+
+
+class EventDetail(KeyedBase, EventDetailBase, table=True):
+    """
+    Which details of a match are stored, so detail scrapes skip them and
+    resume where they stopped.
+    """
+    __tablename__ = "event_detail"
+
+
+class StatKeyBase(SQLModel):
+    # sofascore statistic key, e.g. "ballPossession".
+    key: str = Field(unique=True, index=True)
+    name: str
+    group_name: str | None = None
+
+
+class StatKey(StatKeyBase, table=True):
+    """
+    Dictionary of the statistic keys, event_statistic rows only store
+    their small integer code.
+    """
+    __tablename__ = "stat_key"
+
+    id: int | None = Field(default=None, primary_key=True,
+                           sa_type=SmallInteger)
+
+
+class EventStatisticBase(SQLModel):
+    # No foreign key to tournament_event, see TournamentEvent.
+    event_id: int = Field(primary_key=True)
+    stat_key_id: int = Field(primary_key=True, foreign_key="stat_key.id",
+                             sa_type=SmallInteger)
+    # "ALL", "1ST" or "2ND".
+    period: str = Field(primary_key=True)
+    # "home" or "away".
+    team_side: str = Field(primary_key=True)
+    season_id: int | None = Field(
+        default=None, foreign_key="tournament_season.sofascore_id")
+    team_id: int = Field(foreign_key="team.sofascore_id")
+    value: float
+
+
+class EventStatistic(EventStatisticBase, table=True):
+    """
+    One statistic of one team in one period of a match. Rows are narrow
+    on purpose (no id or timestamps), a season holds tens of thousands.
+
+    The leaderboard indexes cover their queries, so season averages and
+    top single match values are read from the index alone.
+    """
+    __tablename__ = "event_statistic"
+    __table_args__ = (
+        Index('ix_event_statistic_season_id_stat_key_id_period_value',
+              'season_id', 'stat_key_id', 'period', 'value',
+              postgresql_include=['team_id', 'event_id']),
+        Index('ix_event_statistic_stat_key_id_period_value',
+              'stat_key_id', 'period', 'value',
+              postgresql_include=['team_id', 'event_id']),
+    )
+
+
+# Shot columns store the position of their value in these, 0 for values
+# not listed.
+SHOT_BODY_PARTS = ('other', 'right-foot', 'left-foot', 'head')
+SHOT_SITUATIONS = ('other', 'regular', 'assisted', 'corner', 'set-piece',
+                   'free-kick', 'fast-break', 'throw-in-set-piece',
+                   'penalty')
+SHOT_OUTCOMES = ('other', 'goal', 'save', 'miss', 'block', 'post')
+
+
+class EventShotBase(SQLModel):
+    # No foreign key to tournament_event, see TournamentEvent.
+    event_id: int = Field(primary_key=True)
+    shot_id: int = Field(primary_key=True)
+    season_id: int | None = Field(
+        default=None, foreign_key="tournament_season.sofascore_id")
+    team_id: int = Field(foreign_key="team.sofascore_id")
+    opponent_id: int = Field(foreign_key="team.sofascore_id")
+    player_id: int | None = None
+    is_home: bool
+    minute: int = Field(sa_type=SmallInteger)
+    added_time: int | None = Field(default=None, sa_type=SmallInteger)
+    # sofascore pitch coordinates (0-100), x from the attacked goal line.
+    x: float = Field(sa_type=REAL)
+    y: float = Field(sa_type=REAL)
+    xg: float | None = Field(default=None, sa_type=REAL)
+    xgot: float | None = Field(default=None, sa_type=REAL)
+    body_part: int = Field(default=0, sa_type=SmallInteger)
+    situation: int = Field(default=0, sa_type=SmallInteger)
+    outcome: int = Field(default=0, sa_type=SmallInteger)
+
+
+class EventShot(EventShotBase, table=True):
+    """
+    One shot of a match, coded into narrow columns (no id or timestamps)
+    so a season loads straight into arrays.
+    """
+    __tablename__ = "event_shot"
+    __table_args__ = (
+        Index('ix_event_shot_season_id', 'season_id'),
+        Index('ix_event_shot_team_id_season_id', 'team_id', 'season_id'),
+        Index('ix_event_shot_opponent_id_season_id',
+              'opponent_id', 'season_id'),
+    )
+
+
+class EventPlayerHeatmapBase(SQLModel):
+    # No foreign key to tournament_event, see TournamentEvent.
+    event_id: int = Field(primary_key=True)
+    player_id: int = Field(primary_key=True)
+    season_id: int | None = Field(
+        default=None, foreign_key="tournament_season.sofascore_id")
+    team_id: int | None = Field(default=None,
+                                foreign_key="team.sofascore_id")
+    # Raw points rasterized into the grid.
+    points: int
+
+
+class EventPlayerHeatmap(EventPlayerHeatmapBase, table=True):
+    """
+    Heatmap of a player in a match as a zlib compressed grid of uint16
+    counts, see app/analytics/heatmaps.py for its layout.
+    """
+    __tablename__ = "event_player_heatmap"
+    __table_args__ = (
+        Index('ix_event_player_heatmap_player_id_season_id',
+              'player_id', 'season_id'),
+    )
+
+    grid: bytes = Field(sa_type=LargeBinary)
+
+
+class PlayerBase(SQLModel):
+    sofascore_id: int | None = Field(default=None, primary_key=True)
+    name: str
+    slug: str | None = None
+    short_name: str | None = None
+    # "G", "D", "M" or "F".
+    position: str | None = None
+    height: int | None = None
+    country: str | None = None
+    date_of_birth: datetime | None = None
+    sofascore_link: str | None = None
+
+
+class Player(KeyedBase, PlayerBase, table=True):
+    __tablename__ = "player"
+
+
+class EventAppearanceBase(SQLModel):
+    # No foreign key to tournament_event, see TournamentEvent.
+    event_id: int = Field(primary_key=True)
+    player_id: int = Field(primary_key=True,
+                           foreign_key="player.sofascore_id")
+    season_id: int | None = Field(
+        default=None, foreign_key="tournament_season.sofascore_id")
+    team_id: int = Field(foreign_key="team.sofascore_id")
+    is_home: bool
+    # Position in this lineup, "G", "D", "M" or "F".
+    position: str | None = None
+    shirt_number: int | None = Field(default=None, sa_type=SmallInteger)
+    # On the bench at kick off.
+    substitute: bool = False
+    captain: bool = False
+    minutes: int = Field(default=0, sa_type=SmallInteger)
+    rating: float | None = Field(default=None, sa_type=REAL)
+
+
+class EventAppearance(EventAppearanceBase, table=True):
+    """
+    A player in the lineup of a match, narrow like the other per match
+    detail tables.
+
+    The (player, season) and (team, season) indexes include the minutes
+    and ratings, so player and squad totals are index only aggregates.
+    """
+    __tablename__ = "event_appearance"
+    __table_args__ = (
+        Index('ix_event_appearance_player_id_season_id',
+              'player_id', 'season_id',
+              postgresql_include=['minutes', 'rating', 'substitute']),
+        Index('ix_event_appearance_team_id_season_id',
+              'team_id', 'season_id',
+              postgresql_include=['player_id', 'minutes', 'rating',
+                                  'substitute']),
+    )
@@ -0,0 +1,14 @@
+from typing import Any, Dict, List
+from sqlmodel import SQLModel
+
+
+class ScrapeJob(SQLModel):
+    job_id: str
+    status: str
+    progress: Dict[str, int | str] = {}
+    result: Any | None = None
+    error: str | None = None
+
+
+class TournamentBatchRequest(SQLModel):
+    tournament_ids: List[int]
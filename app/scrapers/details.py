@@ -0,0 +1,52 @@
+from datetime import datetime
+from enum import Enum
+from typing import (Any, Awaitable, Callable, Dict, NamedTuple, Sequence,
+                    Tuple)
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.football import TournamentEvent
+
+
+class DetailKind(str, Enum):
+    """
+    Per match detail endpoints, values are their `links` keys.
+    """
+    STATISTICS = "event_statistic"
+    SHOTMAP = "event_shotmaps"
+    LINEUPS = "event_lineups"
+    # one request per player who played, see app/scrapers/heatmap.py
+    HEATMAPS = "event_player_heatmap"
+
+
+class MatchRef(NamedTuple):
+    """
+    Plain values of an event, safe to use after a rollback.
+    """
+    event_id: int
+    tournament_id: int
+    season_id: int | None
+    home_team_id: int
+    away_team_id: int
+    start_timestamp: datetime | None
+    has_heatmaps: bool = False
+
+
+# Selected in MatchRef order.
+MATCH_REF_COLUMNS = (
+    TournamentEvent.sofascore_id,
+    TournamentEvent.tournament_id,
+    TournamentEvent.season_id,
+    TournamentEvent.home_team_id,
+    TournamentEvent.away_team_id,
+    TournamentEvent.start_timestamp,
+    TournamentEvent.has_eventplayer_heatmap,
+)
+
+
+# (event, payload) pairs of one detail kind.
+MatchPayloads = Sequence[Tuple[MatchRef, Dict[str, Any]]]
+
+# Writes the parsed rows of a batch of matches inside the caller's
+# transaction, with one statement per table for the whole batch.
+DetailHandler = Callable[[AsyncSession, MatchPayloads], Awaitable[None]]
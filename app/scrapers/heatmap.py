@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, Dict, Sequence
+
+from httpx import AsyncClient
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics.heatmaps import encode_grid, rasterize
+from app.crud.base import CRUDRepository
+from app.models.football import (EventAppearance, EventDetail,
+                                 EventPlayerHeatmap)
+from app.scrapers.details import DetailKind, MatchPayloads
+from app.scrapers.sofascore import scrape_event_detail
+
+
+heatmap_repo = CRUDRepository(model=EventPlayerHeatmap)
+
+
+def lineup_players(payload: Dict[str, Any] | None) -> Dict[int, str]:
+    """
+    player id -> side of everyone who played, from a lineups payload.
+    """
+    players = dict()
+    for side in ('home', 'away'):
+        for entry in ((payload or dict()).get(side) or dict()).get(
+                'players') or []:
+            player_id = (entry.get('player') or dict()).get('id')
+            minutes = (entry.get('statistics') or dict()).get('minutesPlayed')
+            if player_id is not None and minutes:
+                players[player_id] = side
+    return players
+
+
+async def stored_lineup_players(db: AsyncSession, event_ids: Sequence[int]
+                                ) -> Dict[int, Dict[int, str]]:
+    """
+    Players of the events whose lineups were stored by an earlier run,
+    from event_appearance or a raw payload not imported yet.
+    """
+    if not event_ids:
+        return dict()
+    rows = await db.exec(select(EventDetail.event_id, EventDetail.payload).where(
+        EventDetail.kind == DetailKind.LINEUPS.value,
+        col(EventDetail.event_id).in_(list(event_ids))))
+    players = {event_id: lineup_players(payload)
+               for event_id, payload in rows.all()}
+
+    appearances = await db.exec(select(
+        EventAppearance.event_id, EventAppearance.player_id,
+        EventAppearance.is_home,
+    ).where(col(EventAppearance.event_id).in_(list(players)),
+            EventAppearance.minutes > 0))
+    for event_id, player_id, is_home in appearances.all():
+        players[event_id][player_id] = 'home' if is_home else 'away'
+    return players
+
+
+async def fetch_heatmaps(client: AsyncClient, event_id: int,
+                         players: Dict[int, str]) -> Dict[str, Any]:
+    """
+    Heatmap points of every player of a match, raises if any request
+    failed so the match is tried again as a whole.
+    """
+    player_ids = list(players)
+    results = await asyncio.gather(*(
+        scrape_event_detail(client, event_id, DetailKind.HEATMAPS.value,
+                            player_id=player_id)
+        for player_id in player_ids))
+
+    heatmaps = dict()
+    for player_id, result in zip(player_ids, results):
+        if result is None:
+            continue
+        heatmaps[player_id] = dict(
+            side=players[player_id],
+            points=[(point['x'], point['y'])
+                    for point in result.get('heatmap') or []
+                    if 'x' in point and 'y' in point])
+    return dict(players=heatmaps)
+
+
+async def store_event_heatmaps(db: AsyncSession,
+                               matches: MatchPayloads) -> None:
+    """
+    Rasterizes and writes the heatmaps of matches, without committing.
+    """
+    rows = list()
+    for event, payload in matches:
+        for player_id, heatmap in (payload.get('players') or dict()).items():
+            points = heatmap['points']
+            rows.append(dict(
+                event_id=event.event_id,
+                player_id=int(player_id),
+                season_id=event.season_id,
+                team_id=(event.home_team_id if heatmap['side'] == 'home'
+                         else event.away_team_id),
+                points=len(points),
+                grid=encode_grid(rasterize(points)),
+            ))
+
+    await heatmap_repo.upsert_many(db, rows,
+                                   conflict_cols=['event_id', 'player_id'],
+                                   commit=False)
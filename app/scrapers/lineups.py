@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.base import CRUDRepository
+from app.crud.tournament import player_service
+from app.models.football import EventAppearance, PlayerBase
+from app.scrapers.details import MatchPayloads, MatchRef
+
+
+# Sitemaps only carry the link of a player, lineups the rest.
+LINEUP_PLAYER_COLUMNS = ['name', 'slug', 'short_name', 'position', 'height',
+                         'country', 'date_of_birth', 'updated_at']
+
+appearance_repo = CRUDRepository(model=EventAppearance)
+
+
+def parse_player(player: Dict[str, Any]) -> PlayerBase:
+    birth = player.get('dateOfBirthTimestamp')
+    return PlayerBase(
+        sofascore_id=player['id'],
+        name=player.get('name') or player.get('slug') or str(player['id']),
+        slug=player.get('slug'),
+        short_name=player.get('shortName'),
+        position=player.get('position'),
+        height=player.get('height'),
+        country=(player.get('country') or dict()).get('name'),
+        date_of_birth=datetime.fromtimestamp(birth) if birth else None,
+    )
+
+
+def shirt_number(entry: Dict[str, Any]) -> int | None:
+    number = entry.get('shirtNumber', entry.get('jerseyNumber'))
+    try:
+        return int(number) if number is not None else None
+    except ValueError:
+        return None
+
+
+def parse_lineups(event: MatchRef, payload: Dict[str, Any]
+                  ) -> Tuple[List[PlayerBase], List[Dict[str, Any]]]:
+    players = list()
+    appearances = list()
+    for side in ('home', 'away'):
+        for entry in (payload.get(side) or dict()).get('players') or []:
+            player = entry.get('player') or dict()
+            if player.get('id') is None:
+                continue
+            statistics = entry.get('statistics') or dict()
+            players.append(parse_player(player))
+            appearances.append(dict(
+                event_id=event.event_id,
+                player_id=player['id'],
+                season_id=event.season_id,
+                team_id=(event.home_team_id if side == 'home'
+                         else event.away_team_id),
+                is_home=side == 'home',
+                position=entry.get('position') or player.get('position'),
+                shirt_number=shirt_number(entry),
+                substitute=bool(entry.get('substitute')),
+                captain=bool(entry.get('captain')),
+                minutes=statistics.get('minutesPlayed') or 0,
+                rating=statistics.get('rating'),
+            ))
+    return players, appearances
+
+
+async def store_event_lineups(db: AsyncSession,
+                              matches: MatchPayloads) -> None:
+    """
+    Writes `event_lineups` payloads, without committing.
+
+    Players are deduplicated over the whole batch first, so a season of
+    lineups is one player upsert and one appearance upsert however often
+    each player appears.
+    """
+    players: Dict[int, PlayerBase] = dict()
+    appearances: List[Dict[str, Any]] = list()
+    for event, payload in matches:
+        event_players, event_appearances = parse_lineups(event, payload)
+        players.update((player.sofascore_id, player)
+                       for player in event_players)
+        appearances.extend(event_appearances)
+
+    if not players:
+        return
+    await player_service.upsert_players_many(
+        db, list(players.values()), update_cols=LINEUP_PLAYER_COLUMNS,
+        commit=False)
+    await appearance_repo.upsert_many(db, appearances,
+                                      conflict_cols=['event_id', 'player_id'],
+                                      commit=False)
@@ -0,0 +1,278 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Sequence, Set, Tuple
+from httpx import AsyncClient
+from sqlmodel import col, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.logger import logger
+from app.core.config import settings
+from app.core.jobs import JobProgress
+from app.crud.base import CRUDRepository
+from app.models.football import EventDetail, TournamentEvent
+from app.scrapers.details import (MATCH_REF_COLUMNS, DetailHandler,
+                                  DetailKind, MatchRef)
+from app.scrapers.heatmap import (fetch_heatmaps, lineup_players,
+                                  stored_lineup_players, store_event_heatmaps)
+from app.scrapers.lineups import store_event_lineups
+from app.scrapers.shotmap import store_event_shots
+from app.scrapers.sofascore import scrape_event_detail
+from app.scrapers.statistics import store_event_statistics
+
+
+# Kinds without a handler keep their raw payload in event_detail.
+DETAIL_HANDLERS: Dict[DetailKind, DetailHandler] = {
+    DetailKind.STATISTICS: store_event_statistics,
+    DetailKind.SHOTMAP: store_event_shots,
+    DetailKind.LINEUPS: store_event_lineups,
+    DetailKind.HEATMAPS: store_event_heatmaps,
+}
+
+detail_repo = CRUDRepository(model=EventDetail)
+
+
+class MatchDetails(NamedTuple):
+    event: MatchRef
+    # kind -> payload, None when sofascore has none
+    details: Dict[DetailKind, Dict[str, Any] | None]
+    failed: List[DetailKind]
+
+
+class MatchScraper:
+    """
+    Fetches the statistics, shotmap, lineups and player heatmaps of
+    finished matches.
+
+    Up to `concurrency` matches are fetched at once (sofascore pacing is
+    left to the per host limiter) while a single writer stores every
+    match in its own transaction as soon as it arrives. Stored and
+    missing details are recorded in event_detail, so a rerun only
+    fetches what an interrupted or failed run didn't store.
+    """
+
+    def __init__(self, client: AsyncClient,
+                 kinds: Sequence[DetailKind] = tuple(DetailKind),
+                 concurrency: int = settings.MATCH_SCRAPER_CONCURRENCY):
+        self.client = client
+        self.kinds = list(kinds)
+        self.concurrency = concurrency
+        # event id -> players, for heatmaps of already stored lineups
+        self.lineups: Dict[int, Dict[int, str]] = dict()
+
+    async def pending_events(self, db: AsyncSession, tournament_id: int,
+                             season_id: int
+                             ) -> List[Tuple[MatchRef, List[DetailKind]]]:
+        """
+        Finished events of the season with the kinds still to fetch.
+        """
+        events = (await db.exec(select(*MATCH_REF_COLUMNS).where(
+            TournamentEvent.tournament_id == tournament_id,
+            TournamentEvent.season_id == season_id,
+            TournamentEvent.status_type == 'finished',
+        ).order_by(TournamentEvent.start_timestamp))).all()
+        events = [MatchRef(*event) for event in events]
+        if not events:
+            return []
+
+        stored: Dict[int, Set[str]] = dict()
+        rows = await db.exec(select(EventDetail.event_id, EventDetail.kind).where(
+            col(EventDetail.event_id).in_(
+                [event.event_id for event in events]),
+            col(EventDetail.kind).in_([kind.value for kind in self.kinds])))
+        for event_id, kind in rows.all():
+            stored.setdefault(event_id, set()).add(kind)
+
+        pending = list()
+        for event in events:
+            done = stored.get(event.event_id, set())
+            kinds = [kind for kind in self.kinds if kind.value not in done
+                     and (kind != DetailKind.HEATMAPS or event.has_heatmaps)]
+            if kinds:
+                pending.append((event, kinds))
+
+        self.lineups = await stored_lineup_players(db, [
+            event.event_id for event, kinds in pending
+            if DetailKind.HEATMAPS in kinds
+            and DetailKind.LINEUPS not in kinds])
+        return pending
+
+    async def fetch_match(self, event: MatchRef,
+                          kinds: Sequence[DetailKind]) -> MatchDetails:
+        endpoints = [kind for kind in kinds if kind != DetailKind.HEATMAPS]
+        results = await asyncio.gather(
+            *(scrape_event_detail(self.client, event.event_id, kind.value)
+              for kind in endpoints),
+            return_exceptions=True)
+
+        details: Dict[DetailKind, Dict[str, Any] | None] = dict()
+        failed: List[DetailKind] = list()
+        for kind, result in zip(endpoints, results):
+            if isinstance(result, Exception):
+                logger.error(f"Match details: {str(result)}")
+                failed.append(kind)
+            else:
+                details[kind] = result
+
+        if DetailKind.HEATMAPS in kinds:
+            await self.fetch_heatmaps(event, details, failed)
+        return MatchDetails(event=event, details=details, failed=failed)
+
+    async def fetch_heatmaps(self, event: MatchRef,
+                             details: Dict[DetailKind, Dict[str, Any] | None],
+                             failed: List[DetailKind]) -> None:
+        """
+        Heatmaps need the players of the match, from the lineups fetched
+        along with them or stored before.
+        """
+        if DetailKind.LINEUPS in details:
+            players = lineup_players(details[DetailKind.LINEUPS])
+        elif event.event_id in self.lineups:
+            players = self.lineups[event.event_id]
+        else:
+            logger.error(f"Match details: heatmaps of event "
+                         f"{event.event_id} wait for its lineups.")
+            failed.append(DetailKind.HEATMAPS)
+            return
+
+        if not players:
+            details[DetailKind.HEATMAPS] = None
+            return
+        try:
+            details[DetailKind.HEATMAPS] = await fetch_heatmaps(
+                self.client, event.event_id, players)
+        except Exception as exc:
+            logger.error(f"Match details: {str(exc)}")
+            failed.append(DetailKind.HEATMAPS)
+
+    async def store_match(self, db: AsyncSession, match: MatchDetails) -> None:
+        """
+        Writes the parsed details and their event_detail rows in one
+        transaction.
+        """
+        if not match.details:
+            return
+
+        rows = list()
+        for kind, payload in match.details.items():
+            handler = DETAIL_HANDLERS.get(kind)
+            if handler is not None and payload is not None:
+                await handler(db, [(match.event, payload)])
+            rows.append(dict(
+                event_id=match.event.event_id,
+                kind=kind.value,
+                found=payload is not None,
+                payload=payload if handler is None else None,
+                fetched_at=datetime.now(),
+            ))
+
+        await detail_repo.upsert_many(db, rows,
+                                      conflict_cols=['event_id', 'kind'])
+
+    async def scrape_season(self, db: AsyncSession, tournament_id: int,
+                            season_id: int,
+                            progress: JobProgress | None = None
+                            ) -> Dict[str, Any]:
+        pending = await self.pending_events(db, tournament_id, season_id)
+        if progress:
+            await progress.update(stage="fetching", total=len(pending),
+                                  stored=0, failed=0)
+
+        queue: asyncio.Queue[MatchDetails | None] = asyncio.Queue(
+            maxsize=self.concurrency * 2)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(event: MatchRef, kinds: List[DetailKind]):
+            async with semaphore:
+                match = await self.fetch_match(event, kinds)
+            await queue.put(match)
+
+        async def produce():
+            try:
+                await asyncio.gather(*(fetch(event, kinds)
+                                       for event, kinds in pending))
+            finally:
+                await queue.put(None)
+
+        stored = failed = 0
+        producer = asyncio.create_task(produce())
+        try:
+            # The session is only ever used by this writer loop.
+            while (match := await queue.get()) is not None:
+                try:
+                    await self.store_match(db, match)
+                except Exception as exc:
+                    logger.error(f"Match details: storing event "
+                                 f"{match.event.event_id} failed: {str(exc)}")
+                    await db.rollback()
+                    failed += 1
+                    continue
+
+                if match.failed:
+                    failed += 1
+                else:
+                    stored += 1
+                if progress:
+                    await progress.increment(
+                        'failed' if match.failed else 'stored')
+            await producer
+        finally:
+            producer.cancel()
+
+        if progress:
+            await progress.update(stage="done")
+
+        logger.info(f"Match details: season {season_id} of tournament "
+                    f"{tournament_id}, {stored} matches stored, "
+                    f"{failed} incomplete.")
+        return dict(tournament_id=tournament_id, season_id=season_id,
+                    pending=len(pending), stored=stored, failed=failed)
+
+
+async def import_stored_details(db: AsyncSession, kind: DetailKind,
+                                batch_size: int = settings.DETAIL_IMPORT_BATCH_SIZE,
+                                progress: JobProgress | None = None) -> int:
+    """
+    Parses the raw payloads a detail kind kept in event_detail from
+    before it had a handler.
+
+    Each batch of matches goes through the handler at once (one
+    statement per table) and is committed together with clearing its
+    payloads, so an interrupted import continues with the remaining
+    ones.
+    """
+    handler = DETAIL_HANDLERS[kind]
+    imported = 0
+    last_event_id = None
+
+    while True:
+        query = select(EventDetail.event_id, EventDetail.payload).where(
+            EventDetail.kind == kind.value,
+            col(EventDetail.payload).is_not(None),
+        ).order_by(EventDetail.event_id).limit(batch_size)
+        if last_event_id is not None:
+            query = query.where(EventDetail.event_id > last_event_id)
+        details = (await db.exec(query)).all()
+        if not details:
+            break
+        last_event_id = details[-1][0]
+
+        payloads = dict(details)
+        events = [MatchRef(*event) for event in (await db.exec(
+            select(*MATCH_REF_COLUMNS).where(
+                col(TournamentEvent.sofascore_id).in_(list(payloads))))).all()]
+
+        await handler(db, [(event, payloads[event.event_id])
+                           for event in events])
+        await db.exec(update(EventDetail).where(
+            EventDetail.kind == kind.value,
+            col(EventDetail.event_id).in_([event.event_id
+                                           for event in events]),
+        ).values(payload=None))
+        await db.commit()
+
+        imported += len(events)
+        if progress:
+            await progress.update(stage="importing", matches=imported)
+
+    logger.info(f"Match details: imported {imported} stored {kind.value}.")
+    return imported
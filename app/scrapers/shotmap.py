@@ -0,0 +1,56 @@
+from typing import Any, Dict, List, Sequence
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.base import CRUDRepository
+from app.models.football import (SHOT_BODY_PARTS, SHOT_OUTCOMES,
+                                 SHOT_SITUATIONS, EventShot)
+from app.scrapers.details import MatchPayloads, MatchRef
+
+
+shot_repo = CRUDRepository(model=EventShot)
+
+
+def code_of(values: Sequence[str], value: str | None) -> int:
+    return values.index(value) if value in values else 0
+
+
+def parse_shotmap(event: MatchRef, payload: Dict[str, Any]
+                  ) -> List[Dict[str, Any]]:
+    rows = list()
+    for shot in payload.get('shotmap') or []:
+        coordinates = shot.get('playerCoordinates') or dict()
+        if shot.get('id') is None or coordinates.get('x') is None:
+            continue
+        is_home = bool(shot.get('isHome'))
+        rows.append(dict(
+            event_id=event.event_id,
+            shot_id=shot['id'],
+            season_id=event.season_id,
+            team_id=event.home_team_id if is_home else event.away_team_id,
+            opponent_id=event.away_team_id if is_home else event.home_team_id,
+            player_id=(shot.get('player') or dict()).get('id'),
+            is_home=is_home,
+            minute=shot.get('time') or 0,
+            added_time=shot.get('addedTime'),
+            x=coordinates['x'],
+            y=coordinates.get('y', 50),
+            xg=shot.get('xg'),
+            xgot=shot.get('xgot'),
+            body_part=code_of(SHOT_BODY_PARTS, shot.get('bodyPart')),
+            situation=code_of(SHOT_SITUATIONS, shot.get('situation')),
+            outcome=code_of(SHOT_OUTCOMES, shot.get('shotType')),
+        ))
+    return rows
+
+
+async def store_event_shots(db: AsyncSession,
+                            matches: MatchPayloads) -> None:
+    """
+    Writes `event_shotmaps` payloads, without committing.
+    """
+    rows = [row for event, payload in matches
+            for row in parse_shotmap(event, payload)]
+    await shot_repo.upsert_many(db, rows,
+                                conflict_cols=['event_id', 'shot_id'],
+                                commit=False)
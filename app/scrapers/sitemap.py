@@ -0,0 +1,287 @@
+import re
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, NamedTuple
+from urllib.parse import urlsplit
+from xml.etree.ElementTree import XMLPullParser
+
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.logger import logger
+from app.core.config import settings
+from app.core.jobs import JobProgress
+from app.core.rate_limiter import THROTTLE_STATUS_CODES, host_limiters
+from app.models.football import EventSeedBase, PlayerBase, TournamentBase
+from app.crud.tournament import (event_seed_service, player_service,
+                                 tournament_service)
+
+
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+SITEMAP_URL_PREFIX = 'https://www.sofascore.com/sitemaps/'
+GZIP_MAGIC = b'\x1f\x8b'
+READ_CHUNK_SIZE = 64 * 1024
+
+# .../football/tournament/<category>/<slug>/<id>
+TOURNAMENT_URL = re.compile(
+    r'/tournament/(?P<category>[^/]+)/(?P<slug>[^/]+)/(?P<id>\d+)/?$')
+# .../<home-away-slug>/<custom id>[#id:<event id>]
+EVENT_URL = re.compile(r'/(?P<slug>[^/]+)/(?P<custom_id>[A-Za-z]+)/?$')
+EVENT_ID_FRAGMENT = re.compile(r'id:(?P<id>\d+)')
+# .../player/<slug>/<id>
+PLAYER_URL = re.compile(r'/player/(?P<slug>[^/]+)/(?P<id>\d+)/?$')
+
+
+class SitemapEntry(NamedTuple):
+    tag: str
+    loc: str
+    lastmod: datetime | None
+
+
+def parse_lastmod(value: str | None) -> datetime | None:
+    """
+    Converts a W3C datetime into the naive utc datetimes stored in the db.
+    """
+    if not value:
+        return None
+    lastmod = datetime.fromisoformat(value.strip())
+    if lastmod.tzinfo is not None:
+        lastmod = lastmod.astimezone(timezone.utc).replace(tzinfo=None)
+    return lastmod
+
+
+class SitemapStreamParser:
+    """
+    Incremental sitemap parser fed with raw (optionally gzipped) chunks.
+
+    Completed <url> / <sitemap> elements are turned into entries and then
+    dropped from the tree, so memory stays constant however large the
+    document is.
+    """
+
+    def __init__(self):
+        self._decompressor = None
+        self._started = False
+        self._parser = XMLPullParser(events=('start', 'end'))
+        self._root = None
+
+    def feed(self, chunk: bytes) -> List[SitemapEntry]:
+        if not self._started:
+            self._started = True
+            if chunk.startswith(GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        if self._decompressor is not None:
+            chunk = self._decompressor.decompress(chunk)
+        self._parser.feed(chunk)
+        return self._read_entries()
+
+    def close(self) -> List[SitemapEntry]:
+        if self._decompressor is not None:
+            self._parser.feed(self._decompressor.flush())
+        self._parser.close()
+        return self._read_entries()
+
+    def _read_entries(self) -> List[SitemapEntry]:
+        entries = list()
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                if self._root is None:
+                    self._root = element
+                continue
+
+            tag = element.tag.replace(SITEMAP_NS, '')
+            if tag not in ('url', 'sitemap'):
+                continue
+
+            loc = element.findtext(f"{SITEMAP_NS}loc")
+            lastmod = element.findtext(f"{SITEMAP_NS}lastmod")
+            if loc:
+                entries.append(SitemapEntry(
+                    tag=tag,
+                    loc=loc.strip(),
+                    lastmod=parse_lastmod(lastmod),
+                ))
+            # Finished entries are not needed anymore.
+            self._root.clear()
+        return entries
+
+
+def resolve_sitemap_source(source: str) -> str:
+    """
+    Only allows SofaScore sitemap urls or files inside SITEMAP_DIR.
+    """
+    if source.startswith(SITEMAP_URL_PREFIX):
+        return source
+
+    directory = Path(settings.SITEMAP_DIR).resolve()
+    path = (directory / source).resolve()
+    if path.parent != directory or not path.is_file():
+        raise ValueError(f"Unknown sitemap {source}.")
+    return str(path)
+
+
+async def stream_sitemap_file(path: str) -> AsyncIterator[SitemapEntry]:
+    parser = SitemapStreamParser()
+    with open(path, 'rb') as file:
+        while chunk := file.read(READ_CHUNK_SIZE):
+            for entry in parser.feed(chunk):
+                yield entry
+    for entry in parser.close():
+        yield entry
+
+
+async def stream_sitemap_url(client: AsyncClient,
+                             url: str) -> AsyncIterator[SitemapEntry]:
+    limiter = host_limiters.get(url)
+    parser = SitemapStreamParser()
+
+    async with limiter.slot():
+        async with client.stream('GET', url) as res:
+            if res.status_code in THROTTLE_STATUS_CODES:
+                limiter.record(res.status_code, 0.0,
+                               res.headers.get('Retry-After'))
+            res.raise_for_status()
+
+            async for chunk in res.aiter_bytes(READ_CHUNK_SIZE):
+                for entry in parser.feed(chunk):
+                    yield entry
+    for entry in parser.close():
+        yield entry
+
+
+async def iter_sitemap(client: AsyncClient,
+                       source: str) -> AsyncIterator[SitemapEntry]:
+    """
+    Yields every <url> entry of a sitemap, following sitemap indexes
+    shard by shard.
+    """
+    if source.startswith('http'):
+        entries = stream_sitemap_url(client, source)
+    else:
+        entries = stream_sitemap_file(source)
+
+    # Index listings are small, shards are streamed once it is closed.
+    shards = list()
+    async for entry in entries:
+        if entry.tag == 'sitemap':
+            shards.append(entry.loc)
+        else:
+            yield entry
+
+    for shard in shards:
+        logger.info(f"Sitemap: streaming shard {shard}")
+        async for entry in iter_sitemap(client, shard):
+            yield entry
+
+
+def parse_tournament_entry(entry: SitemapEntry) -> TournamentBase | None:
+    match = TOURNAMENT_URL.search(urlsplit(entry.loc).path)
+    if not match:
+        return None
+
+    return TournamentBase(
+        sofascore_id=int(match['id']),
+        slug=match['slug'],
+        # Placeholder until the tournament details are scraped.
+        name=match['slug'].replace('-', ' ').title(),
+        sofascore_link=entry.loc,
+    )
+
+
+def parse_event_entry(entry: SitemapEntry) -> EventSeedBase | None:
+    url = urlsplit(entry.loc)
+    match = EVENT_URL.search(url.path)
+    if not match:
+        return None
+
+    event_id = EVENT_ID_FRAGMENT.search(url.fragment)
+    return EventSeedBase(
+        custom_id=match['custom_id'],
+        sofascore_id=int(event_id['id']) if event_id else None,
+        slug=match['slug'],
+        sofascore_link=entry.loc,
+        lastmod=entry.lastmod,
+    )
+
+
+def parse_player_entry(entry: SitemapEntry) -> PlayerBase | None:
+    match = PLAYER_URL.search(urlsplit(entry.loc).path)
+    if not match:
+        return None
+
+    return PlayerBase(
+        sofascore_id=int(match['id']),
+        slug=match['slug'],
+        # Placeholder until a lineup of the player is scraped.
+        name=match['slug'].replace('-', ' ').title(),
+        sofascore_link=entry.loc,
+    )
+
+
+async def save_sitemap_batch(db: AsyncSession, kind: str,
+                             batch: List[TournamentBase | EventSeedBase
+                                         | PlayerBase]
+                             ) -> None:
+    if kind == 'tournaments':
+        # Only fill in the link, scraped names and flags are kept.
+        await tournament_service.upsert_tournaments_many(
+            db, batch, update_cols=['sofascore_link', 'updated_at'])
+    elif kind == 'players':
+        # Only fill in the link, names from lineups are kept.
+        await player_service.upsert_players_many(
+            db, batch, update_cols=['sofascore_link', 'updated_at'])
+    else:
+        await event_seed_service.upsert_seeds_many(db, batch)
+
+
+SITEMAP_PARSERS = {
+    'tournaments': (parse_tournament_entry, 'sofascore_id'),
+    'events': (parse_event_entry, 'custom_id'),
+    'players': (parse_player_entry, 'sofascore_id'),
+}
+
+
+async def ingest_sitemap(db: AsyncSession,
+                         client: AsyncClient,
+                         source: str,
+                         kind: str,
+                         batch_size: int = 5000,
+                         progress: JobProgress | None = None) -> int:
+    """
+    Streams a sitemap (index) and bulk upserts the tournaments, event
+    seeds or players it lists, `batch_size` rows per statement.
+
+    Duplicates are dropped within a batch and across batches by the
+    upsert itself, so no id set has to be kept for the whole sitemap.
+    """
+    parse_entry, key = SITEMAP_PARSERS[kind]
+
+    batch: Dict[int | str, TournamentBase | EventSeedBase | PlayerBase] = dict()
+    entries = 0
+    persisted = 0
+
+    async for entry in iter_sitemap(client, resolve_sitemap_source(source)):
+        entries += 1
+        row = parse_entry(entry)
+        if row is not None:
+            batch[getattr(row, key)] = row
+
+        if len(batch) >= batch_size:
+            await save_sitemap_batch(db, kind, list(batch.values()))
+            persisted += len(batch)
+            batch.clear()
+            if progress:
+                await progress.update(entries=entries, persisted=persisted)
+
+    if batch:
+        await save_sitemap_batch(db, kind, list(batch.values()))
+        persisted += len(batch)
+
+    if progress:
+        await progress.update(stage="done", entries=entries,
+                              persisted=persisted)
+
+    logger.info(f"Sitemap: {persisted} {kind} saved from {entries} urls.")
+    return persisted
@@ -0,0 +1,292 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple, TypedDict
+from httpx import (AsyncClient, HTTPError, HTTPStatusError, Request, Response,
+                   codes)
+
+from app.logger import logger
+from app.core.config import settings
+from app.core.rate_limiter import host_limiters
+from app.core.scrape_cache import scrape_cache
+
+
+# SofaScore API endpoints
+links = {
+    'tournament': 'https://www.sofascore.com/api/v1/unique-tournament/{tournament_id}',
+    'tournament_seasons': 'https://www.sofascore.com/api/v1/unique-tournament/{tournament_id}/seasons',
+    'tournament_season_statistics': 'https://www.sofascore.com/api/v1/unique-tournament/{tournament_id}/season/{season_id}/statistics?limit={limit}&offset={offset}&order=-rating&accumulation={acc}&group={grp}',
+    'tournament_events': 'https://www.sofascore.com/api/v1/unique-tournament/{tournament_id}/season/{season_id}/team-events/total',
+    'team_performance_data': 'https://www.sofascore.com/api/v1/unique-tournament/17/season/52186/team/42/team-performance-graph-data',
+    'event_statistic': 'https://www.sofascore.com/api/v1/event/{event_id}/statistics',
+    'event_shotmaps': 'https://www.sofascore.com/api/v1/event/{event_id}/shotmap',
+    'event_lineups': 'https://www.sofascore.com/api/v1/event/{event_id}/lineups',
+    'event_player_heatmap': 'https://www.sofascore.com/api/v1/event/{event_id}/player/{player_id}/heatmap',
+}
+
+
+# Statuses worth retrying once the limiter has backed off.
+RETRY_STATUS_CODES = (429, 503)
+
+
+async def fetch_data(client: AsyncClient, client_url: str,
+                     allow_not_found: bool = False) -> Response:
+    """
+    GETs `client_url` through the cache and the host limiter, None on
+    errors. With `allow_not_found` a 404 is returned as a response so
+    callers can tell missing data from a failed request.
+    """
+    if settings.SCRAPE_CACHE_ENABLED:
+        cached = await scrape_cache.get(client_url)
+        if cached is not None:
+            if cached.status_code == codes.NOT_FOUND and not allow_not_found:
+                logger.info(f"cached 404 for {client_url}")
+                return None
+            logger.info(f"cache hit for {client_url}")
+            return Response(status_code=cached.status_code,
+                            content=cached.content,
+                            request=Request('GET', client_url))
+
+    limiter = host_limiters.get(client_url)
+
+    for attempt in range(settings.SCRAPER_MAX_RETRIES + 1):
+        async with limiter.slot():
+            try:
+                logger.info(f"fetching data for {client_url}")
+                started = time.monotonic()
+                res = await client.get(client_url)
+                limiter.record(res.status_code,
+                               time.monotonic() - started,
+                               res.headers.get('Retry-After'))
+
+                if (res.status_code in RETRY_STATUS_CODES
+                        and attempt < settings.SCRAPER_MAX_RETRIES):
+                    continue
+
+                if settings.SCRAPE_CACHE_ENABLED and res.status_code in (
+                        codes.OK, codes.NOT_FOUND):
+                    await scrape_cache.set(client_url, res.status_code,
+                                           res.content)
+
+                if allow_not_found and res.status_code == codes.NOT_FOUND:
+                    return res
+                res.raise_for_status()
+                return res
+            except HTTPError as exc:
+                if not isinstance(exc, HTTPStatusError):
+                    limiter.record_error()
+                logger.error(f"HTTP exception for {exc.request.url} - {exc}")
+                return None
+
+
+def get_json_data(res: Response) -> Dict[str, Any]:
+    data = res.json()
+
+    if data is None:
+        logger.error("No data returned")
+        raise Exception("No data returned")
+    return data
+
+
+async def scrape_tournament_details(client: AsyncClient,
+                                    tournament_id: int) -> Dict[str, Any]:
+    url = links['tournament'].format(tournament_id=tournament_id)
+
+    res = await fetch_data(client, url)
+
+    try:
+        data = get_json_data(res)
+        data = data['uniqueTournament']
+        logger.info(f"Received Data for tournament - {tournament_id}")
+        return data
+
+    except Exception as exc:
+        logger.error(exc)
+        raise Exception(f"Tournament Detail scrape error occured: {str(exc)}")
+
+
+async def scrape_tournament_seasons(client: AsyncClient,
+                                    tournament_id: int) -> Dict[str, Any]:
+    url = links['tournament_seasons'].format(
+        tournament_id=tournament_id
+    )
+
+    res = await fetch_data(client, url)
+
+    try:
+        data = get_json_data(res)
+        data = data['seasons']
+
+        seasons = list()
+        for season in data:
+            tmp_data = dict()
+            tmp_data['name'] = season['name']
+            tmp_data['year'] = season['year']
+            tmp_data['sofascore_id'] = season['id']
+            tmp_data['tournament_id'] = tournament_id
+            seasons.append(tmp_data)
+
+        return seasons
+
+    except Exception as exc:
+        logger.error(exc)
+        raise Exception(f"An unexpected error occured: {str(exc)}")
+
+
+class TeamDict(TypedDict):
+    name: str
+    slug: str
+    nameCode: str
+    sofascore_id: int
+
+
+class TournamentEventDict(TypedDict):
+    tournament_id: int
+    season_id: int
+    sofascore_id: int
+    homeTeam: TeamDict
+    awayTeam: TeamDict
+    home_score_current: int | None = None
+    home_score_period1: int | None = None
+    home_score_period2: int | None = None
+    home_score_normaltime: int | None = None
+
+    away_score_current: int | None = None
+    away_score_period1: int | None = None
+    away_score_period2: int | None = None
+    away_score_normaltime: int | None = None
+
+    match_slug: str
+    status_code: str
+    status_description: str
+    status_type: str
+
+    has_xg: str
+
+    startTimestamp: datetime
+    endTimestamp: datetime | None = None
+
+
+def clean_int_from_tuple(data: Tuple[int, ] | int) -> int:
+    """
+    Cleans up integer from tuple.
+    """
+
+    if type(data) is tuple:
+        return data[0]
+    return data
+
+
+async def scrape_tournament_events(
+        client: AsyncClient,
+        tournament_id: int,
+        season_id: int) -> List[TournamentEventDict]:
+    url = links['tournament_events'].format(
+        tournament_id=tournament_id,
+        season_id=season_id,
+    )
+
+    res = await fetch_data(client, url)
+
+    try:
+        data = get_json_data(res)
+        data = data['tournamentTeamEvents']['1'].values()
+        match_data = [
+            match for matchweek in data for match in matchweek
+        ]
+        match_list = list()
+
+        for match in match_data:
+            tmp_data = {}
+            tmp_data['tournament_id'] = tournament_id
+            tmp_data['season_id'] = season_id
+            tmp_data['sofascore_id'] = match['id']
+
+            tmp_data['homeTeam'] = {
+                'name': match['homeTeam']['name'],
+                'slug': match['homeTeam']['slug'],
+                'nameCode': match['homeTeam']['nameCode'],
+                'sofascore_id': match['homeTeam']['id'],
+            }
+            tmp_data['awayTeam'] = {
+                'name': match['awayTeam']['name'],
+                'slug': match['awayTeam']['slug'],
+                'nameCode': match['awayTeam']['nameCode'],
+                'sofascore_id': match['awayTeam']['id'],
+            }
+
+            home_score_current = clean_int_from_tuple(
+                match['homeScore']['current'])
+
+            home_score_period1 = clean_int_from_tuple(
+                match['homeScore']['period1'])
+            home_score_period2 = clean_int_from_tuple(
+                match['homeScore']['period2'])
+            home_score_normaltime = clean_int_from_tuple(
+                match['homeScore']['normaltime'])
+
+            away_score_current = clean_int_from_tuple(
+                match['awayScore']['current'])
+
+            away_score_period1 = clean_int_from_tuple(
+                match['awayScore']['period1'])
+            away_score_period2 = clean_int_from_tuple(
+                match['awayScore']['period2'])
+            away_score_normaltime = clean_int_from_tuple(
+                match['awayScore']['normaltime'])
+
+            tmp_data['home_score_current'] = home_score_current
+            tmp_data['home_score_period1'] = home_score_period1
+            tmp_data['home_score_period2'] = home_score_period2
+            tmp_data['home_score_normaltime'] = home_score_normaltime
+
+            tmp_data['away_score_current'] = away_score_current
+            tmp_data['away_score_period1'] = away_score_period1
+            tmp_data['away_score_period2'] = away_score_period2
+            tmp_data['away_score_normaltime'] = away_score_normaltime
+
+            tmp_data['match_slug'] = match['slug']
+
+            tmp_data['status_code'] = match['status']['code']
+            tmp_data['status_description'] = match['status']['description']
+            tmp_data['status_type'] = match['status']['type']
+
+            tmp_data['has_xg'] = match['hasXg']
+
+            tmp_data['startTimestamp'] = datetime.fromtimestamp(
+                match['startTimestamp'])
+            if 'endTimestamp' in match.keys():
+                tmp_data['endTimestamp'] = datetime.fromtimestamp(
+                    match['endTimestamp'])
+            else:
+                tmp_data['endTimestamp'] = None
+            match_list.append(tmp_data)
+
+        logger.info(
+            f"Tournament Event for tournament {tournament_id} of \
+            season {season_id} scraped.")
+
+        return match_list
+
+    except Exception as exc:
+        logger.error(exc)
+        raise Exception(f"Tournament event scrape error occured: {str(exc)}")
+
+
+async def scrape_event_detail(client: AsyncClient, event_id: int,
+                              kind: str, **params: Any
+                              ) -> Dict[str, Any] | None:
+    """
+    One of the `event_*` detail endpoints of a match, `params` fill the
+    rest of its url. Returns None when sofascore has no such detail for
+    it, raises when the request failed so the detail is tried again
+    later.
+    """
+    url = links[kind].format(event_id=event_id, **params)
+    res = await fetch_data(client, url, allow_not_found=True)
+
+    if res is None:
+        raise Exception(f"Fetching {kind} of event {event_id} failed "
+                        f"({url}).")
+    if res.status_code == codes.NOT_FOUND:
+        return None
+    return get_json_data(res)
@@ -0,0 +1,121 @@
+import re
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.base import CRUDRepository
+from app.models.football import EventStatistic, StatKey
+from app.scrapers.details import MatchPayloads
+
+
+NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+
+statistic_repo = CRUDRepository(model=EventStatistic)
+
+
+class StatItem(NamedTuple):
+    period: str
+    team_side: str
+    key: str
+    name: str
+    group_name: str | None
+    value: float
+
+
+def stat_value(item: Dict[str, Any], side: str) -> float | None:
+    """
+    Numeric value of one side, from `homeValue` or else the leading
+    number of the display string ("58%", "12 (3)").
+    """
+    value = item.get(f"{side}Value")
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = NUMBER.search(str(item.get(side) or ''))
+    return float(match.group()) if match else None
+
+
+def parse_statistics(payload: Dict[str, Any]) -> List[StatItem]:
+    items = list()
+    for period in payload.get('statistics') or []:
+        for group in period.get('groups') or []:
+            for item in group.get('statisticsItems') or []:
+                key = item.get('key')
+                if not key:
+                    continue
+                for side in ('home', 'away'):
+                    value = stat_value(item, side)
+                    if value is None:
+                        continue
+                    items.append(StatItem(
+                        period=period.get('period') or 'ALL',
+                        team_side=side,
+                        key=key,
+                        name=item.get('name') or key,
+                        group_name=group.get('groupName'),
+                        value=value,
+                    ))
+    return items
+
+
+async def resolve_stat_keys(db: AsyncSession,
+                            keys: Dict[str, Tuple[str, str | None]]
+                            ) -> Dict[str, int]:
+    """
+    Codes of `keys` (key -> (name, group)), unknown keys are added to
+    the dictionary first.
+
+    The id is a smallint serial and an INSERT burns a sequence value even
+    when it conflicts, so only keys missing from the dictionary are
+    inserted, not every key of every match.
+    """
+    rows = await db.exec(select(StatKey.key, StatKey.id).where(
+        col(StatKey.key).in_(list(keys))))
+    codes = dict(rows.all())
+
+    missing = [key for key in keys if key not in codes]
+    if missing:
+        stmt = insert(StatKey).values([
+            dict(key=key, name=keys[key][0], group_name=keys[key][1])
+            for key in missing
+        ]).on_conflict_do_nothing(index_elements=['key'])
+        await db.exec(stmt)
+
+        # Keys added meanwhile by a concurrent import too.
+        rows = await db.exec(select(StatKey.key, StatKey.id).where(
+            col(StatKey.key).in_(missing)))
+        codes.update(rows.all())
+    return codes
+
+
+async def store_event_statistics(db: AsyncSession,
+                                 matches: MatchPayloads) -> None:
+    """
+    Writes `event_statistic` payloads as one row per team, period and
+    statistic, without committing.
+    """
+    parsed = [(event, parse_statistics(payload))
+              for event, payload in matches]
+    keys = {item.key: (item.name, item.group_name)
+            for _, items in parsed for item in items}
+    if not keys:
+        return
+    codes = await resolve_stat_keys(db, keys)
+
+    rows = list()
+    for event, items in parsed:
+        team_ids = dict(home=event.home_team_id, away=event.away_team_id)
+        rows.extend(dict(event_id=event.event_id,
+                         stat_key_id=codes[item.key],
+                         period=item.period,
+                         team_side=item.team_side,
+                         season_id=event.season_id,
+                         team_id=team_ids[item.team_side],
+                         value=item.value)
+                    for item in items)
+
+    await statistic_repo.upsert_many(
+        db, rows,
+        conflict_cols=['event_id', 'stat_key_id', 'period', 'team_side'],
+        commit=False)
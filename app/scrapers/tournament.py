@@ -0,0 +1,262 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.logger import logger
+from app.core.config import settings
+from app.core.jobs import JobProgress
+from app.core.response_cache import CATEGORIES, TOURNAMENTS, response_cache
+from app.models.football import (CategoryBase, TeamBase, Tournament,
+                                 TournamentBase, TournamentEvent,
+                                 TournamentEventBase, TournamentSeasonBase)
+from app.crud.tournament import (LoadProfile, tournament_service,
+                                 category_service, tournament_season_service,
+                                 team_service, tournament_event_service)
+from app.scrapers.sofascore import (scrape_tournament_details,
+                                    scrape_tournament_events,
+                                    scrape_tournament_seasons)
+
+
+async def ingest_tournament_events(
+        db: AsyncSession,
+        client: AsyncClient,
+        tournament_id: int,
+        season_id: int,
+        progress: JobProgress | None = None) -> List[TournamentEvent]:
+    """
+    Scrapes the events of a tournament season and saves teams and events.
+    """
+    if progress:
+        await progress.update(stage="fetching")
+
+    event_data = await scrape_tournament_events(
+        client=client,
+        tournament_id=tournament_id,
+        season_id=season_id
+    )
+
+    if progress:
+        await progress.update(stage="persisting", total=len(event_data))
+
+    teams = list()
+    events = list()
+
+    for event in event_data:
+
+        home_team_obj = TeamBase(
+            sofascore_id=event['homeTeam']['sofascore_id'],
+            slug=event['homeTeam']['slug'],
+            name_code=event['homeTeam']['nameCode'],
+            name=event['homeTeam']['name']
+        )
+
+        away_team_obj = TeamBase(
+            sofascore_id=event['awayTeam']['sofascore_id'],
+            slug=event['awayTeam']['slug'],
+            name_code=event['awayTeam']['nameCode'],
+            name=event['awayTeam']['name']
+        )
+
+        teams.extend([home_team_obj, away_team_obj])
+
+        event_obj = TournamentEventBase(
+            tournament_id=tournament_id,
+            season_id=event['season_id'],
+            sofascore_id=event['sofascore_id'],
+            slug=event['match_slug'],
+            home_team_id=home_team_obj.sofascore_id,
+            away_team_id=away_team_obj.sofascore_id,
+            status_code=event['status_code'],
+            status_description=event['status_description'],
+            status_type=event['status_type'],
+            home_score_current=int(event['home_score_current']),
+            home_score_period_1=int(event['home_score_period1']),
+            home_score_period_2=int(event['home_score_period2']),
+            home_score_normaltime=int(event['home_score_normaltime']),
+            home_score_extratime=0,
+            home_score_penalties=0,
+
+            away_score_current=int(event['away_score_current']),
+            away_score_period_1=int(event['away_score_period1']),
+            away_score_period_2=int(event['away_score_period2']),
+            away_score_normaltime=int(event['away_score_normaltime']),
+            away_score_extratime=0,
+            away_score_penalties=0,
+            start_timestamp=event['startTimestamp'],
+            end_timestamp=event['endTimestamp'],
+            has_xg=event['has_xg'],
+        )
+
+        events.append(event_obj)
+
+    # Teams and events are written in one transaction, a few statements
+    # per season instead of a get + create round trip per row.
+    await team_service.upsert_teams_many(db=db, teams_data=teams,
+                                         commit=False)
+    events = await tournament_event_service.upsert_events_many(
+        db=db,
+        events_data=events,
+        full_season=True)
+
+    if progress:
+        await progress.update(stage="done", persisted=len(events))
+
+    return events
+
+
+def build_tournament_rows(tournament_data: Dict[str, Any]
+                          ) -> Tuple[CategoryBase, TournamentBase]:
+    """
+    Maps a scraped tournament detail to its category and tournament rows.
+    """
+    category_data = CategoryBase(
+        sofascore_id=tournament_data['category']['id'],
+        name=tournament_data['category']['name'],
+        slug=tournament_data['category']['slug']
+    )
+
+    tournament = TournamentBase(
+        sofascore_id=tournament_data['id'],
+        name=tournament_data['name'],
+        slug=tournament_data['slug'],
+        has_rounds=tournament_data['hasRounds'],
+        has_groups=tournament_data['hasGroups'],
+        has_playoff_series=tournament_data['hasPlayoffSeries'],
+        start_timestamp=datetime.fromtimestamp(
+            tournament_data['startDateTimestamp']) or None,
+        end_timestamp=datetime.fromtimestamp(
+            tournament_data['endDateTimestamp']) or None,
+        category_id=category_data.sofascore_id,
+    )
+
+    return category_data, tournament
+
+
+def build_season_rows(seasons_data: List[Dict[str, Any]]
+                      ) -> List[TournamentSeasonBase]:
+    return [
+        TournamentSeasonBase(
+            sofascore_id=season['sofascore_id'],
+            year=season['year'],
+            tournament_id=season['tournament_id'],
+            name=season['name'],
+        ) for season in seasons_data
+    ]
+
+
+async def ingest_tournament(db: AsyncSession,
+                            client: AsyncClient,
+                            tournament_id: int,
+                            progress: JobProgress | None = None
+                            ) -> Tournament:
+    """
+    Scrapes a tournament with its category and seasons and saves them.
+    """
+    if progress:
+        await progress.update(stage="fetching")
+
+    tournament_data, seasons_data = await asyncio.gather(
+        scrape_tournament_details(client=client,
+                                  tournament_id=tournament_id),
+        scrape_tournament_seasons(client=client,
+                                  tournament_id=tournament_id),
+    )
+
+    if progress:
+        await progress.update(stage="persisting", total=len(seasons_data))
+
+    category_data, tournament_data = build_tournament_rows(tournament_data)
+    seasons = build_season_rows(seasons_data)
+
+    await category_service.upsert_categories_many(db, [category_data],
+                                                  commit=False)
+    tournament, = await tournament_service.upsert_tournaments_many(
+        db, [tournament_data], commit=False)
+    seasons = await tournament_season_service.upsert_seasons_many(db, seasons)
+    await response_cache.bump(CATEGORIES, TOURNAMENTS)
+
+    # Expired so the eager loads replace the empty "noload" collections.
+    db.expire(tournament)
+    tournament = await tournament_service.get_tournament_by_id(
+        db, tournament.sofascore_id, profile=LoadProfile.WITH_SEASONS)
+
+    if progress:
+        await progress.update(stage="done", persisted=len(seasons))
+
+    return tournament
+
+
+async def ingest_tournaments_batch(
+        db: AsyncSession,
+        client: AsyncClient,
+        tournament_ids: List[int],
+        progress: JobProgress | None = None) -> Dict[str, Any]:
+    """
+    Scrapes many tournaments concurrently and saves them in one go.
+
+    Details and seasons are fetched under a single semaphore (sofascore
+    pacing itself is left to the per host limiter), then categories,
+    tournaments and seasons are written with one bulk upsert each inside
+    a single transaction. Tournaments whose scrape fails are reported
+    back instead of aborting the batch.
+    """
+    tournament_ids = list(dict.fromkeys(tournament_ids))
+    semaphore = asyncio.Semaphore(settings.SCRAPE_BATCH_CONCURRENCY)
+
+    if progress:
+        await progress.update(stage="fetching", total=len(tournament_ids),
+                              fetched=0)
+
+    async def fetch_tournament(tournament_id: int):
+        async with semaphore:
+            result = await asyncio.gather(
+                scrape_tournament_details(client=client,
+                                          tournament_id=tournament_id),
+                scrape_tournament_seasons(client=client,
+                                          tournament_id=tournament_id),
+            )
+        if progress:
+            await progress.increment('fetched')
+        return result
+
+    results = await asyncio.gather(
+        *(fetch_tournament(tournament_id) for tournament_id in tournament_ids),
+        return_exceptions=True,
+    )
+
+    categories: Dict[int, CategoryBase] = dict()
+    tournaments: List[TournamentBase] = list()
+    seasons: List[TournamentSeasonBase] = list()
+    failed: List[int] = list()
+
+    for tournament_id, result in zip(tournament_ids, results):
+        if isinstance(result, Exception):
+            logger.error(
+                f"Batch import: tournament {tournament_id} failed: {str(result)}")
+            failed.append(tournament_id)
+            continue
+
+        tournament_data, seasons_data = result
+        category_data, tournament_data = build_tournament_rows(tournament_data)
+        categories[category_data.sofascore_id] = category_data
+        tournaments.append(tournament_data)
+        seasons.extend(build_season_rows(seasons_data))
+
+    if progress:
+        await progress.update(stage="persisting")
+
+    await category_service.upsert_categories_many(
+        db, list(categories.values()), commit=False)
+    await tournament_service.upsert_tournaments_many(
+        db, tournaments, commit=False)
+    await tournament_season_service.upsert_seasons_many(db, seasons)
+    await response_cache.bump(CATEGORIES, TOURNAMENTS)
+
+    if progress:
+        await progress.update(stage="done", persisted=len(tournaments),
+                              failed=len(failed))
+
+    return dict(tournaments=len(tournaments), seasons=len(seasons),
+                categories=len(categories), failed=failed)
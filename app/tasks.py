@@ -1,24 +1,156 @@
 import asyncio
-from httpx import AsyncClient
-from arq import create_pool
-from arq.connections import RedisSettings
-from settings import settings
+from typing import Any, Dict, List
 
+from app.analytics.elo import update_ratings
+from app.core.config import settings
+from app.core.http_client import create_scraper_client
+from app.core.jobs import (REDIS_SETTINGS, JobProgress,
+                           publish_worker_stats, worker_name)
+from app.core.rate_limiter import host_limiters
+from app.core.response_cache import response_cache
+from app.core.scrape_cache import scrape_cache
+from app.db.session import SessionLocal
+from app.logger import logger
+from app.scrapers.details import DetailKind
+from app.scrapers.match import MatchScraper, import_stored_details
+from app.scrapers.sitemap import ingest_sitemap
+from app.scrapers.tournament import (ingest_tournament,
+                                     ingest_tournament_events,
+                                     ingest_tournaments_batch)
 
-REDIS_SETTINGS = RedisSettings(
-    host="redis",
-    port=6379,
-    database=settings.CELERY_RESULT_BACKEND
-)
+
+async def publish_stats_loop(redis) -> None:
+    """
+    Publishes this worker's limiter and scrape cache stats, which only
+    exist in the worker process, for /scrape/metrics and /scrape/cache.
+    """
+    worker = worker_name()
+    while True:
+        try:
+            await publish_worker_stats(redis, worker, dict(
+                limiters=host_limiters.metrics(),
+                cache=await asyncio.to_thread(scrape_cache.stats),
+            ))
+        except Exception as exc:
+            logger.error(f"Worker stats: publish error: {str(exc)}")
+        await asyncio.sleep(settings.SCRAPE_WORKER_STATS_INTERVAL)
 
 
 async def startup(ctx):
-    ctx['session'] = AsyncClient()
+    ctx['client'] = create_scraper_client()
+    # Writes bump the catalog cache versions the api workers read.
+    response_cache.attach_redis(ctx['redis'])
+    ctx['stats_task'] = asyncio.create_task(publish_stats_loop(ctx['redis']))
 
 
 async def shutdown(ctx):
-    await ctx['session'].aclose()
+    ctx['stats_task'].cancel()
+    await ctx['client'].aclose()
+
+
+async def scrape_events_job(ctx, tournament_id: int,
+                            season_id: int) -> Dict[str, Any]:
+    progress = JobProgress(ctx['redis'], ctx['job_id'])
+
+    async with SessionLocal() as db:
+        events = await ingest_tournament_events(
+            db=db,
+            client=ctx['client'],
+            tournament_id=tournament_id,
+            season_id=season_id,
+            progress=progress,
+        )
+
+    # New results are rated on top of the last checkpoint.
+    await ctx['redis'].enqueue_job('update_ratings_job')
+
+    return dict(tournament_id=tournament_id, season_id=season_id,
+                events=len(events))
+
+
+async def scrape_match_details_job(ctx, tournament_id: int,
+                                   season_id: int) -> Dict[str, Any]:
+    progress = JobProgress(ctx['redis'], ctx['job_id'])
+
+    async with SessionLocal() as db:
+        return await MatchScraper(ctx['client']).scrape_season(
+            db=db,
+            tournament_id=tournament_id,
+            season_id=season_id,
+            progress=progress,
+        )
+
+
+async def import_match_details_job(ctx, kind: str) -> Dict[str, Any]:
+    progress = JobProgress(ctx['redis'], ctx['job_id'])
+
+    async with SessionLocal() as db:
+        matches = await import_stored_details(db, DetailKind(kind),
+                                              progress=progress)
+
+    return dict(kind=kind, matches=matches)
+
+
+async def scrape_tournament_job(ctx, tournament_id: int) -> Dict[str, Any]:
+    progress = JobProgress(ctx['redis'], ctx['job_id'])
+
+    async with SessionLocal() as db:
+        tournament = await ingest_tournament(
+            db=db,
+            client=ctx['client'],
+            tournament_id=tournament_id,
+            progress=progress,
+        )
+
+    return dict(tournament_id=tournament.sofascore_id,
+                seasons=len(tournament.seasons))
+
+
+async def scrape_tournaments_batch_job(ctx, tournament_ids: List[int]
+                                       ) -> Dict[str, Any]:
+    progress = JobProgress(ctx['redis'], ctx['job_id'])
+
+    async with SessionLocal() as db:
+        return await ingest_tournaments_batch(
+            db=db,
+            client=ctx['client'],
+            tournament_ids=tournament_ids,
+            progress=progress,
+        )
+
+
+async def ingest_sitemap_job(ctx, source: str, kind: str) -> Dict[str, Any]:
+    progress = JobProgress(ctx['redis'], ctx['job_id'])
+
+    async with SessionLocal() as db:
+        persisted = await ingest_sitemap(
+            db=db,
+            client=ctx['client'],
+            source=source,
+            kind=kind,
+            batch_size=settings.SITEMAP_BATCH_SIZE,
+            progress=progress,
+        )
+
+    return dict(source=source, kind=kind, persisted=persisted)
+
+
+async def update_ratings_job(ctx, rebuild: bool = False) -> Dict[str, Any]:
+    async with SessionLocal() as db:
+        return await update_ratings(db, rebuild=rebuild)
 
 
-async def main():
-    redis = await create_pool(REDIS_SETTINGS)
+class WorkerSettings:
+    """
+    arq worker, run with `arq app.tasks.WorkerSettings`.
+    """
+    functions = [scrape_events_job, scrape_match_details_job,
+                 import_match_details_job, scrape_tournament_job,
+                 scrape_tournaments_batch_job, ingest_sitemap_job,
+                 update_ratings_job]
+    on_startup = startup
+    on_shutdown = shutdown
+    redis_settings = REDIS_SETTINGS
+    max_jobs = settings.SCRAPE_WORKER_MAX_JOBS
+    job_timeout = settings.SCRAPE_JOB_TIMEOUT
+    keep_result = settings.SCRAPE_JOB_KEEP_RESULT
@@ -0,0 +1,51 @@
+"""Event season backfill.
+
+Revision ID: b3f5d7a9c1e2
+Revises: a8c4e2f6b1d9
+Create Date: 2026-10-19 11:40:23.671905
+
+Fills the season_id left empty by f2b8d4e6a1c3 where it is known: from
+the event's stage, else from the tournament when it has a single season.
+Aggregate updates only subtract a previous result of the same season, so
+without the season a re-scraped result would be counted twice.
+
+Events still without a season get it from scrape_events_job
+(tournament_id, season_id) for their season, which overwrites season_id.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f5d7a9c1e2'
+down_revision: Union[str, None] = 'a8c4e2f6b1d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE tournament_event AS event
+        SET season_id = stage.tournament_season_id
+        FROM tournament_group AS stage
+        WHERE event.season_id IS NULL
+          AND stage.sofascore_id = event.stage_id
+    """)
+    op.execute("""
+        UPDATE tournament_event AS event
+        SET season_id = season.sofascore_id
+        FROM (
+            SELECT tournament_id, min(sofascore_id) AS sofascore_id
+            FROM tournament_season
+            GROUP BY tournament_id
+            HAVING count(*) = 1
+        ) AS season
+        WHERE event.season_id IS NULL
+          AND season.tournament_id = event.tournament_id
+    """)
+
+
+def downgrade() -> None:
+    # The backfilled seasons are right, there is nothing to undo.
+    pass
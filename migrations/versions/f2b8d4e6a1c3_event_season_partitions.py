@@ -0,0 +1,146 @@
+"""Event season id and partitions.
+
+Revision ID: f2b8d4e6a1c3
+Revises: e4a7c2d9f0b1
+Create Date: 2026-10-18 16:31:52.904117
+
+tournament_event becomes a table partitioned by HASH (tournament_id) with
+a season_id column. Existing rows are copied over, their season is left
+empty until the season is scraped again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4e6a1c3'
+down_revision: Union[str, None] = 'e4a7c2d9f0b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS = 16
+
+COLUMNS = (
+    'sofascore_id', 'slug', 'detail_id', 'stage_id', 'tournament_id',
+    'home_team_id', 'away_team_id',
+    'status_code', 'status_description', 'status_type',
+    'home_score_current', 'home_score_period_1', 'home_score_period_2',
+    'home_score_normaltime', 'home_score_extratime', 'home_score_penalties',
+    'away_score_current', 'away_score_period_1', 'away_score_period_2',
+    'away_score_normaltime', 'away_score_extratime', 'away_score_penalties',
+    'has_xg', 'has_eventplayer_statistics', 'has_eventplayer_heatmap',
+    'start_timestamp', 'end_timestamp', 'created_at', 'updated_at', 'id',
+)
+
+
+def event_columns(with_season: bool) -> list:
+    columns = [
+        sa.Column('sofascore_id', sa.Integer(), nullable=False),
+        sa.Column('slug', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('detail_id', sa.Integer(), nullable=True),
+        sa.Column('stage_id', sa.Integer(), nullable=True),
+        sa.Column('tournament_id', sa.Integer(), nullable=False),
+    ]
+    if with_season:
+        columns.append(sa.Column('season_id', sa.Integer(), nullable=True))
+    columns += [
+        sa.Column('home_team_id', sa.Integer(), nullable=False),
+        sa.Column('away_team_id', sa.Integer(), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('status_description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('status_type', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    ]
+    for side in ('home', 'away'):
+        columns += [
+            sa.Column(f'{side}_score_{score}', sa.Integer(), nullable=False)
+            for score in ('current', 'period_1', 'period_2', 'normaltime',
+                          'extratime', 'penalties')
+        ]
+    columns += [
+        sa.Column('has_xg', sa.Boolean(), nullable=False),
+        sa.Column('has_eventplayer_statistics', sa.Boolean(), nullable=False),
+        sa.Column('has_eventplayer_heatmap', sa.Boolean(), nullable=False),
+        sa.Column('start_timestamp', sa.DateTime(), nullable=True),
+        sa.Column('end_timestamp', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(['away_team_id'], ['team.sofascore_id'], ),
+        sa.ForeignKeyConstraint(['home_team_id'], ['team.sofascore_id'], ),
+        sa.ForeignKeyConstraint(['stage_id'], ['tournament_group.sofascore_id'], ),
+        sa.ForeignKeyConstraint(['tournament_id'], ['tournament.sofascore_id'], ),
+    ]
+    if with_season:
+        columns.append(sa.ForeignKeyConstraint(
+            ['season_id'], ['tournament_season.sofascore_id'], ))
+    return columns
+
+
+def create_event_indexes() -> None:
+    op.create_index(op.f('ix_tournament_event_id'), 'tournament_event', ['id'], unique=False)
+    op.create_index('ix_tournament_event_home_team_id_start_timestamp', 'tournament_event', ['home_team_id', 'start_timestamp'], unique=False)
+    op.create_index('ix_tournament_event_away_team_id_start_timestamp', 'tournament_event', ['away_team_id', 'start_timestamp'], unique=False)
+    op.create_index('ix_tournament_event_team_pair_start_timestamp', 'tournament_event', [sa.text('least(home_team_id, away_team_id)'), sa.text('greatest(home_team_id, away_team_id)'), 'start_timestamp'], unique=False)
+
+
+def move_events(source: str) -> None:
+    columns = ', '.join(COLUMNS)
+    op.execute(f"INSERT INTO tournament_event ({columns}) "
+               f"SELECT {columns} FROM {source}")
+    op.drop_table(source)
+
+
+def upgrade() -> None:
+    op.drop_constraint('team_rating_snapshot_event_id_fkey', 'team_rating_snapshot', type_='foreignkey')
+
+    # Free the names taken by the old table and its indexes.
+    op.rename_table('tournament_event', 'tournament_event_unpartitioned')
+    op.drop_constraint('uq_tournament_event_sofascore_id', 'tournament_event_unpartitioned', type_='unique')
+    op.execute("ALTER TABLE tournament_event_unpartitioned "
+               "RENAME CONSTRAINT tournament_event_pkey "
+               "TO tournament_event_unpartitioned_pkey")
+    op.drop_index('ix_tournament_event_team_pair_start_timestamp', table_name='tournament_event_unpartitioned')
+    op.drop_index('ix_tournament_event_away_team_id_start_timestamp', table_name='tournament_event_unpartitioned')
+    op.drop_index('ix_tournament_event_home_team_id_start_timestamp', table_name='tournament_event_unpartitioned')
+    op.drop_index(op.f('ix_tournament_event_id'), table_name='tournament_event_unpartitioned')
+
+    op.create_table('tournament_event',
+    *event_columns(with_season=True),
+    sa.PrimaryKeyConstraint('sofascore_id', 'tournament_id'),
+    postgresql_partition_by='HASH (tournament_id)'
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(f"CREATE TABLE tournament_event_p{remainder} "
+                   f"PARTITION OF tournament_event FOR VALUES WITH "
+                   f"(MODULUS {PARTITIONS}, REMAINDER {remainder})")
+
+    # Indexes are built once, after the copy.
+    move_events('tournament_event_unpartitioned')
+    create_event_indexes()
+    op.create_index('ix_tournament_event_season_id_start_timestamp', 'tournament_event', ['season_id', 'start_timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.rename_table('tournament_event', 'tournament_event_partitioned')
+    op.execute("ALTER TABLE tournament_event_partitioned "
+               "RENAME CONSTRAINT tournament_event_pkey "
+               "TO tournament_event_partitioned_pkey")
+    op.drop_index('ix_tournament_event_season_id_start_timestamp', table_name='tournament_event_partitioned')
+    op.drop_index('ix_tournament_event_team_pair_start_timestamp', table_name='tournament_event_partitioned')
+    op.drop_index('ix_tournament_event_away_team_id_start_timestamp', table_name='tournament_event_partitioned')
+    op.drop_index('ix_tournament_event_home_team_id_start_timestamp', table_name='tournament_event_partitioned')
+    op.drop_index(op.f('ix_tournament_event_id'), table_name='tournament_event_partitioned')
+
+    op.create_table('tournament_event',
+    *event_columns(with_season=False),
+    sa.PrimaryKeyConstraint('sofascore_id', 'id')
+    )
+    # Dropping the parent drops its partitions too.
+    move_events('tournament_event_partitioned')
+    create_event_indexes()
+    op.create_unique_constraint('uq_tournament_event_sofascore_id', 'tournament_event', ['sofascore_id'])
+
+    op.create_foreign_key('team_rating_snapshot_event_id_fkey', 'team_rating_snapshot', 'tournament_event', ['event_id'], ['sofascore_id'])
@@ -1,4 +1,5 @@
 import asyncio
+import time
 from typing import Any, Dict, List
 from datetime import datetime
 
@@ -6,6 +7,7 @@ from beanie import WriteRules
 from httpx import AsyncClient, Response
 import httpx
 from logger import logger
+from app.core.rate_limiter import host_limiters
 
 from crud.tournament import create_tournament, get_or_create_team, get_or_create_tournament_events, get_or_create_tournament_groups, get_or_create_tournament_seasons
 from models.documents import TeamScores, Tournament, TournamentEvent, TournamentGroup, TournamentSeason
@@ -30,16 +32,27 @@ links = {
 
 class Euro2024Scraper:
 
-    def __init__(self, tournament_id: int) -> None:
+    def __init__(self, tournament_id: int,
+                 client: AsyncClient | None = None) -> None:
         self.tournament_id = tournament_id
+        # Reuse one pooled client for every request of the scraper.
+        self.client = client or AsyncClient()
 
     async def fetch_data(self, client_url: str) -> Response:
-        async with AsyncClient() as client:
+        # Pacing is handled by the shared per host limiter.
+        limiter = host_limiters.get(client_url)
+        async with limiter.slot():
             try:
-                res = await client.get(client_url)
+                started = time.monotonic()
+                res = await self.client.get(client_url)
+                limiter.record(res.status_code,
+                               time.monotonic() - started,
+                               res.headers.get('Retry-After'))
                 res.raise_for_status()
                 return res
             except httpx.HTTPError as exc:
+                if not isinstance(exc, httpx.HTTPStatusError):
+                    limiter.record_error()
                 logger.error(f"HTTP exception for {exc.request.url} - {exc}")
 
     def get_json_data(self, res: Response) -> Dict[str, Any]:
@@ -148,8 +161,6 @@ class Euro2024Scraper:
                 g = await get_or_create_tournament_groups(group)
                 groups.append(g)
 
-            asyncio.sleep(5)
-
             return groups
         except TypeError:
             logger.error("Type error")
@@ -217,8 +228,6 @@ class Euro2024Scraper:
 
                 tournament_matches.append(tournament_event)
 
-                asyncio.sleep(5)
-
             return tournament_matches
         except TypeError as type_err:
             logger.error("Type error", type_err)
@@ -229,8 +238,6 @@ class Euro2024Scraper:
         tournament = await self.scrape_tournament_details(
             tournament_id=self.tournament_id)
 
-        asyncio.sleep(5)
-
         seasons = await self.scrape_tournament_seasons(
             tournament=tournament
         )
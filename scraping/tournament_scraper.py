@@ -1,32 +1,10 @@
 import asyncio
-from typing import Dict, List
-import httpx
-import json
+from pathlib import Path
 
-data = None
+from app.import_tournaments import import_tournaments, load_tournament_ids
 
-with open('./top_european_leagues.json', 'r') as f:
-    data = json.load(f)
+# Run from the project root: python -m scraping.tournament_scraper
+LEAGUES_FILE = Path(__file__).parent / 'top_european_leagues.json'
 
 
-async def fetch_tournament(client: httpx.AsyncClient, url: str) -> None:
-    resp = await client.get(url)
-    if resp.status_code == 200 or resp.status_code == 201:
-        print("Done!")
-
-
-async def main(tournament_list: List[Dict]) -> None:
-    async with httpx.AsyncClient() as client:
-        tasks = []
-        for tournament in tournament_list:
-            tasks.append(
-                fetch_tournament(
-                    client,
-                    f"http://127.0.0.1:8000/api/v1/scrape/tournaments?tournament_id={tournament['sofascore_id']}"
-                )
-            )
-
-        await asyncio.gather(*tasks)
-
-
-asyncio.run(main(data))
+asyncio.run(import_tournaments(load_tournament_ids(str(LEAGUES_FILE))))
@@ -0,0 +1,35 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from app.analytics.fixtures import Fixtures, build_fixtures
+
+
+# (home team, away team, home goals, away goals, day of the month)
+Match = Tuple[int, int, int, int, int]
+
+
+def make_fixtures(results: Sequence[Match],
+                  upcoming: Sequence[Tuple[int, int]] = ()) -> Fixtures:
+    """
+    Fixtures of one season from finished `results` and `upcoming`
+    (home, away) pairs, played from 2024-08-01 on.
+    """
+    matches = list(results) + [(home, away, 0, 0, 28)
+                               for home, away in upcoming]
+    finished = [True] * len(results) + [False] * len(upcoming)
+    columns = list(zip(*matches))
+    return build_fixtures(
+        [(1, 1)],
+        match_table=np.zeros(len(matches), dtype=np.int64),
+        event_ids=np.arange(len(matches), dtype=np.int64),
+        home_ids=np.array(columns[0], dtype=np.int64),
+        away_ids=np.array(columns[1], dtype=np.int64),
+        home_goals=np.array(columns[2], dtype=np.int32),
+        away_goals=np.array(columns[3], dtype=np.int32),
+        finished=np.array(finished, dtype=bool),
+        start_timestamp=np.array(
+            [f"2024-08-{day:02d}T15:00" for day in columns[4]],
+            dtype='datetime64[s]'),
+        upcoming=~np.array(finished, dtype=bool),
+    )
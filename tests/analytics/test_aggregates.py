@@ -0,0 +1,144 @@
+from datetime import datetime
+
+import pytest
+
+from app.analytics import aggregates
+from app.analytics.aggregates import (EventResult, apply_event_changes,
+                                      season_changes, team_deltas)
+from app.models.football import TeamSeasonAggregate
+
+
+def result(event_id, home_goals, away_goals, finished=True, day=1,
+           season_id=1, home=10, away=20):
+    return EventResult(event_id=event_id, home_team_id=home,
+                       away_team_id=away,
+                       start_timestamp=datetime(2024, 8, day, 15),
+                       finished=finished, home_goals=home_goals,
+                       away_goals=away_goals, season_id=season_id)
+
+
+class ScriptedSession:
+    """
+    Session double answering apply_event_changes' queries in order:
+    the lock, whether the season has aggregates, the aggregates, then the
+    stored states of the events kept in the forms.
+    """
+
+    def __init__(self, seeded, aggregates, kept=()):
+        self.answers = [None, seeded, list(aggregates),
+                        [tuple(event) for event in kept]]
+
+    async def exec(self, stmt, **kwargs):
+        self.answer = self.answers.pop(0)
+        return self
+
+    def one(self):
+        return self.answer
+
+    def all(self):
+        return self.answer
+
+
+@pytest.fixture
+def written(monkeypatch):
+    rows = list()
+
+    async def upsert_many(db, values, **kwargs):
+        rows.extend(values)
+        return []
+
+    monkeypatch.setattr(aggregates.aggregate_repo, 'upsert_many',
+                        upsert_many)
+    return rows
+
+
+def aggregate(team_id, form_event_ids, form, **totals):
+    return TeamSeasonAggregate(season_id=1, team_id=team_id,
+                               tournament_id=1, form=form,
+                               form_event_ids=form_event_ids, **totals)
+
+
+def test_corrected_score_moves_totals_to_new_result():
+    deltas = team_deltas([(result(1, 2, 0), result(1, 1, 1))])
+
+    assert deltas[10] == dict(played=0, wins=-1, draws=1, losses=0,
+                              goals_for=-1, goals_against=1, points=-2)
+    assert deltas[20] == dict(played=0, wins=0, draws=1, losses=-1,
+                              goals_for=1, goals_against=-1, points=1)
+
+
+def test_finished_event_counts_once():
+    deltas = team_deltas([(result(1, 0, 0, finished=False),
+                           result(1, 3, 1))])
+
+    assert deltas[10] == dict(played=1, wins=1, draws=0, losses=0,
+                              goals_for=3, goals_against=1, points=3)
+    assert deltas[20]['losses'] == 1
+    assert team_deltas([(None, result(1, 0, 0, finished=False))]) == {}
+
+
+def test_event_moved_to_another_season_leaves_the_old_one():
+    before = result(1, 2, 0, season_id=1)
+    after = result(1, 2, 0, season_id=2)
+    assert season_changes([(before, after)]) == {
+        1: [(before, None)], 2: [(None, after)]}
+
+    unchanged = result(2, 1, 0)
+    assert season_changes([(unchanged, unchanged),
+                           (None, result(3, 0, 0, season_id=None))]) == {
+        1: [(unchanged, unchanged)]}
+
+
+async def test_form_is_rebuilt_from_the_kept_events(written):
+    kept = [result(1, 1, 0, day=1), result(2, 0, 0, day=8)]
+    db = ScriptedSession(seeded=True, aggregates=[
+        aggregate(10, [1, 2], 'WD', played=2, wins=1, draws=1, points=4,
+                  goals_for=1, goals_against=0),
+        aggregate(20, [1, 2], 'LD', played=2, draws=1, losses=1, points=1,
+                  goals_for=0, goals_against=1),
+    ], kept=kept[:1])
+
+    # Event 2 is corrected to a home win and event 3 is played.
+    written_count = await apply_event_changes(db, 1, 1, [
+        (kept[1], result(2, 2, 1, day=8)),
+        (None, result(3, 0, 1, day=15)),
+    ])
+
+    assert written_count == 2
+    rows = {row['team_id']: row for row in written}
+    assert rows[10]['form_event_ids'] == [1, 2, 3]
+    assert rows[10]['form'] == 'WWL'
+    assert rows[10]['points'] == 6
+    assert rows[20]['form'] == 'LLW'
+    assert rows[20]['points'] == 3
+    assert rows[20]['last_played_at'] == datetime(2024, 8, 15, 15)
+
+
+async def test_removed_event_leaves_the_form(written):
+    kept = [result(1, 1, 0, day=1), result(2, 0, 0, day=8)]
+    db = ScriptedSession(seeded=True, aggregates=[
+        aggregate(10, [1, 2], 'WD', played=2, wins=1, draws=1, points=4,
+                  goals_for=1, goals_against=0),
+        aggregate(20, [1, 2], 'LD', played=2, draws=1, losses=1, points=1,
+                  goals_for=0, goals_against=1),
+    ], kept=kept[:1])
+
+    await apply_event_changes(db, 1, 1, [(kept[1], None)])
+
+    rows = {row['team_id']: row for row in written}
+    assert rows[10]['form_event_ids'] == [1]
+    assert (rows[10]['played'], rows[10]['points']) == (1, 3)
+    assert (rows[20]['played'], rows[20]['points']) == (1, 0)
+
+
+async def test_unseeded_season_is_skipped_unless_complete(written):
+    changes = [(None, result(1, 1, 0))]
+    assert await apply_event_changes(
+        ScriptedSession(seeded=False, aggregates=[]), 1, 1, changes) == 0
+    assert written == []
+
+    assert await apply_event_changes(
+        ScriptedSession(seeded=False, aggregates=[]), 1, 1,
+        changes + [(result(2, 0, 0), None)], full_season=True) == 2
+    assert {row['team_id']: row['points'] for row in written} == {
+        10: 3, 20: 0}
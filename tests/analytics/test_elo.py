@@ -0,0 +1,179 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.analytics import elo
+from app.analytics.aggregates import EventResult
+from app.analytics.elo import (EloConfig, TeamIndex, margin_multiplier,
+                               mark_ratings_stale, rate_events, rate_matches,
+                               rewind_ratings)
+
+
+CONFIG = EloConfig(k=20.0, home_advantage=65.0, initial=1500.0)
+
+
+def kick_off(day):
+    return datetime(2024, 8, day, 15)
+
+
+# pending_events_query rows: event, home, away, goals, kick off.
+EVENTS = [
+    (1, 10, 20, 2, 0, kick_off(1)),
+    (2, 30, 40, 1, 1, kick_off(2)),
+    (3, 20, 30, 0, 3, kick_off(8)),
+    (4, 40, 10, 1, 2, kick_off(9)),
+    (5, 10, 30, 4, 1, kick_off(15)),
+    (6, 20, 40, 2, 2, kick_off(16)),
+]
+
+
+def ratings_of(index):
+    return {team_id: (round(float(index.ratings[position]), 9),
+                      int(index.matches[position]))
+            for team_id, position in index.positions.items()}
+
+
+class RewindSession:
+    """
+    Session double answering rewind_ratings' queries from the snapshots
+    still stored after the rewind point.
+    """
+
+    def __init__(self, snapshots, since):
+        kept = [snapshot for snapshot in snapshots
+                if snapshot['start_timestamp'] < since]
+        latest = dict()
+        for snapshot in sorted(kept, key=lambda snapshot: (
+                snapshot['start_timestamp'], snapshot['event_id'])):
+            latest[snapshot['team_id']] = snapshot
+        matches = dict()
+        for snapshot in kept:
+            matches[snapshot['team_id']] = matches.get(
+                snapshot['team_id'], 0) + 1
+
+        self.answers = [
+            None,
+            [(team_id, snapshot['rating_after'], snapshot['event_id'],
+              snapshot['start_timestamp'])
+             for team_id, snapshot in sorted(latest.items())],
+            list(matches.items()),
+            len({snapshot['event_id'] for snapshot in kept}),
+            None,
+        ]
+
+    async def exec(self, stmt, **kwargs):
+        self.answer = self.answers.pop(0)
+        return self
+
+    def one(self):
+        return self.answer
+
+    def all(self):
+        return self.answer
+
+
+class RecordingSession:
+
+    def __init__(self):
+        self.statements = list()
+
+    async def exec(self, stmt, **kwargs):
+        self.statements.append(stmt)
+        return self
+
+
+@pytest.fixture
+def stored_ratings(monkeypatch):
+    rows = list()
+
+    async def upsert_many(db, values, **kwargs):
+        rows.extend(values)
+        return []
+
+    monkeypatch.setattr(elo.rating_repo, 'upsert_many', upsert_many)
+    return rows
+
+
+def test_margin_multiplier():
+    np.testing.assert_allclose(
+        margin_multiplier(np.array([0, 1, -1, 2, -2, 3, 5])),
+        [1.0, 1.0, 1.0, 1.5, 1.5, 1.75, 2.0])
+
+
+def test_rate_matches_single_step():
+    ratings = np.array([1500.0, 1500.0])
+    before, after = rate_matches(ratings, np.array([0]), np.array([1]),
+                                 np.array([3]), np.array([0]), CONFIG)
+
+    expected = 1 / (1 + 10 ** (-65 / 400))
+    delta = 20 * 1.75 * (1 - expected)
+    np.testing.assert_allclose(before, [[1500, 1500]])
+    np.testing.assert_allclose(after, [[1500 + delta, 1500 - delta]])
+    np.testing.assert_allclose(ratings, after[0])
+    assert round(delta, 4) == 14.2637
+
+
+def test_incremental_updates_match_a_rebuild():
+    rebuilt = TeamIndex(CONFIG.initial)
+    rate_events(rebuilt, EVENTS, CONFIG)
+
+    incremental = TeamIndex(CONFIG.initial)
+    rate_events(incremental, EVENTS[:2], CONFIG)
+    rate_events(incremental, EVENTS[2:5], CONFIG)
+    rate_events(incremental, EVENTS[5:], CONFIG)
+
+    assert ratings_of(incremental) == ratings_of(rebuilt)
+
+
+async def test_rewound_correction_matches_a_rebuild(stored_ratings):
+    index = TeamIndex(CONFIG.initial)
+    snapshots = rate_events(index, EVENTS, CONFIG)
+
+    # Event 3 is corrected after everything was rated.
+    corrected = list(EVENTS)
+    corrected[2] = (3, 20, 30, 2, 1, kick_off(8))
+    since = kick_off(8)
+
+    events, last_event_id, last_start_timestamp = await rewind_ratings(
+        RewindSession(snapshots, since), since)
+    assert (events, last_event_id, last_start_timestamp) == (
+        2, 2, kick_off(2))
+
+    rewound = TeamIndex(CONFIG.initial)
+    rewound.load([row['team_id'] for row in stored_ratings],
+                 [row['rating'] for row in stored_ratings],
+                 [row['matches'] for row in stored_ratings])
+    rate_events(rewound, [event for event in corrected
+                          if event[5] >= since], CONFIG)
+
+    rebuilt = TeamIndex(CONFIG.initial)
+    rate_events(rebuilt, corrected, CONFIG)
+    assert ratings_of(rewound) == ratings_of(rebuilt)
+    assert ratings_of(rewound) != ratings_of(index)
+
+
+def result(event_id, home_goals, away_goals, day, finished=True):
+    return EventResult(event_id=event_id, home_team_id=10, away_team_id=20,
+                       start_timestamp=kick_off(day), finished=finished,
+                       home_goals=home_goals, away_goals=away_goals,
+                       season_id=1)
+
+
+async def test_only_changed_results_mark_ratings_stale():
+    db = RecordingSession()
+    await mark_ratings_stale(db, [
+        (result(1, 1, 0, day=1), result(1, 1, 0, day=1)),
+        (None, result(2, 0, 0, day=2, finished=False)),
+    ])
+    assert db.statements == []
+
+    await mark_ratings_stale(db, [
+        (result(1, 1, 0, day=1), result(1, 1, 0, day=1)),
+        (result(3, 1, 0, day=9), result(3, 1, 1, day=9)),
+        (None, result(4, 2, 0, day=5)),
+    ])
+    statement, = db.statements
+    params = statement.compile().params
+    assert kick_off(5) in params.values()
+    assert kick_off(9) not in params.values()
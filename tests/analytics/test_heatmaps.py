@@ -0,0 +1,43 @@
+import numpy as np
+
+from app.analytics.heatmaps import (HEATMAP_SHAPE, encode_grid, rasterize,
+                                    sum_grids)
+
+
+def test_points_land_in_their_cells_edges_included():
+    grid = rasterize([(0, 0), (50, 50), (50.5, 50), (99.9, 99.9),
+                      (100, 100), (100, 0), (-3, 120)])
+
+    assert grid.shape == HEATMAP_SHAPE
+    assert grid.sum() == 7
+    assert grid[0, 0] == 1
+    assert grid[50, 32] == 2
+    # x == 100 and y == 100 belong to the last cells.
+    assert grid[99, 63] == 2
+    assert grid[99, 0] == 1
+    # Out of the pitch is clipped to its border.
+    assert grid[0, 63] == 1
+
+
+def test_cells_saturate_at_the_uint16_maximum():
+    grid = rasterize([(10, 10)] * 70000 + [(20, 20)])
+    assert grid[10, 6] == 65535
+    assert grid[20, 12] == 1
+    assert not rasterize([]).any()
+
+
+def test_encoded_grids_sum_back():
+    grids = [rasterize([(x, y) for x in range(0, 101, step)
+                        for y in range(0, 101, step)])
+             for step in (5, 10, 25)]
+    full = rasterize([(10, 10)] * 70000)
+
+    total = sum_grids(encode_grid(grid) for grid in grids + [full, full])
+
+    assert total.dtype == np.uint32
+    expected = sum(grid.astype(np.uint32) for grid in grids)
+    expected = expected + 2 * full.astype(np.uint32)
+    np.testing.assert_array_equal(total, expected)
+    # Sums go past the uint16 maximum of the single grids.
+    assert total[10, 6] == 2 * 65535 + sum(grid[10, 6] for grid in grids)
+    assert not sum_grids([]).any()
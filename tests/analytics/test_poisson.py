@@ -0,0 +1,62 @@
+import numpy as np
+
+from app.analytics.poisson import (build_predictions, fit_arguments,
+                                   fit_season, scoreline_matrix)
+from app.models.football import TournamentEvent
+from tests.analytics.helpers import make_fixtures
+
+
+def upcoming_events(pairs):
+    return [TournamentEvent(sofascore_id=index, tournament_id=1, season_id=1,
+                            home_team_id=home, away_team_id=away)
+            for index, (home, away) in enumerate(pairs)]
+
+
+def fit(fixtures):
+    return fit_season(*fit_arguments(fixtures, decay=0.0))
+
+
+def test_season_without_results_predicts_prior_rates():
+    fixtures = make_fixtures([], upcoming=[(10, 20), (30, 40)])
+    model = fit(fixtures)
+
+    assert model.matches == 0
+    home_rate, away_rate = model.expected_goals(np.array([10, 30]),
+                                                np.array([20, 40]))
+    np.testing.assert_allclose(home_rate, 1.5)
+    np.testing.assert_allclose(away_rate, 1.15)
+
+    predictions = build_predictions(model, upcoming_events([(10, 20)]), 5)
+    prediction, = predictions
+    probabilities = (prediction.home_win, prediction.draw,
+                     prediction.away_win)
+    assert all(np.isfinite(probabilities))
+    assert abs(sum(probabilities) - 1) < 1e-9
+    assert prediction.home_win > prediction.away_win
+
+
+def test_goalless_results_keep_rates_positive():
+    model = fit(make_fixtures([(10, 20, 0, 0, 1), (20, 10, 0, 0, 8)]))
+    home_rate, away_rate = model.expected_goals(np.array([10]),
+                                                np.array([20]))
+    assert model.home_advantage > 0
+    assert np.all(home_rate > 0) and np.all(away_rate > 0)
+
+
+def test_fit_recovers_stronger_team():
+    results = [(10, 20, 3, 0, day) for day in range(1, 8)] + \
+        [(20, 10, 0, 2, day) for day in range(8, 15)]
+    model = fit(make_fixtures(results))
+    home_rate, away_rate = model.expected_goals(np.array([10, 20]),
+                                                np.array([20, 10]))
+    assert home_rate[0] > away_rate[0]
+    assert away_rate[1] > home_rate[1]
+
+
+def test_scoreline_matrix_is_normalised():
+    model = fit(make_fixtures([(10, 20, 2, 1, 1), (20, 10, 1, 1, 8)]))
+    home_rate, away_rate = model.expected_goals(np.array([10, 20]),
+                                                np.array([20, 10]))
+    matrix = scoreline_matrix(model, home_rate, away_rate, 10)
+    np.testing.assert_allclose(matrix.sum(axis=(1, 2)), 1.0)
+    assert np.all(matrix >= 0)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from app.analytics.standings import (compute_standings,
+                                     compute_standings_history)
+from app.models.analytics import TieBreaker
+from tests.analytics.helpers import make_fixtures
+
+
+RESULTS = [
+    (10, 20, 2, 0, 1),
+    (30, 40, 1, 1, 1),
+    (20, 30, 3, 1, 8),
+    (40, 10, 0, 1, 8),
+]
+
+
+def table_by_team(fixtures, table):
+    return {int(team): dict(position=int(table.position[slot]),
+                            points=int(table.points[slot]),
+                            played=int(table.played[slot]),
+                            goal_difference=int(table.goal_difference[slot]))
+            for slot, team in enumerate(fixtures.team_ids)}
+
+
+def test_compute_standings_totals_and_positions():
+    fixtures = make_fixtures(RESULTS, upcoming=[(10, 30)])
+    rows = table_by_team(fixtures, compute_standings(fixtures))
+
+    assert rows[10] == dict(position=1, points=6, played=2,
+                            goal_difference=3)
+    assert rows[20] == dict(position=2, points=3, played=2,
+                            goal_difference=0)
+    assert rows[30]['points'] == rows[40]['points'] == 1
+    # Upcoming fixtures count for nothing.
+    assert sum(row['played'] for row in rows.values()) == 8
+
+
+def test_head_to_head_breaks_ties_before_goal_difference():
+    # 10 and 20 both on 4 points, 10 won the direct match by one goal
+    # but 20 has the better goal difference overall.
+    fixtures = make_fixtures([(10, 20, 1, 0, 1), (10, 30, 0, 0, 8),
+                              (20, 40, 5, 0, 8), (20, 30, 0, 0, 15)])
+    overall = table_by_team(fixtures, compute_standings(fixtures))
+    h2h = table_by_team(fixtures, compute_standings(
+        fixtures, (TieBreaker.POINTS, TieBreaker.HEAD_TO_HEAD,
+                   TieBreaker.GOAL_DIFFERENCE)))
+
+    assert overall[20]['position'] < overall[10]['position']
+    assert h2h[10]['position'] < h2h[20]['position']
+
+
+def test_standings_history_ends_at_final_table():
+    fixtures = make_fixtures(RESULTS)
+    history = compute_standings_history(fixtures)
+    final = compute_standings(fixtures)
+
+    assert len(history.dates) == 2
+    np.testing.assert_array_equal(history.points[-1], final.points)
+    np.testing.assert_array_equal(history.position[-1], final.position)
+    # After the first matchday 10 leads on goal difference.
+    first = dict(zip(fixtures.team_ids.tolist(), history.position[0]))
+    assert first[10] == 1
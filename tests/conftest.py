@@ -15,7 +15,7 @@ def event_loop(request):
     loop.close()
 
 
-@pytest.fixture(scope="class")
+@pytest_asyncio.fixture(scope="session")
 async def engine(event_loop):
     engine = create_async_engine(
         settings.ASYNC_POSTGRES_URI,
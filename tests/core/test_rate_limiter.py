@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import rate_limiter
+from app.core.config import settings
+from app.core.rate_limiter import AdaptiveLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(rate_limiter, 'time',
+                        SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+@pytest.fixture
+def limiter(clock, monkeypatch):
+    monkeypatch.setattr(settings, 'SCRAPER_INITIAL_CONCURRENCY', 4)
+    monkeypatch.setattr(settings, 'SCRAPER_INITIAL_RATE', 5.0)
+    monkeypatch.setattr(settings, 'SCRAPER_DECREASE_FACTOR', 0.5)
+    monkeypatch.setattr(settings, 'SCRAPER_THROTTLE_BACKOFF', 30.0)
+    return AdaptiveLimiter('example.com')
+
+
+def test_healthy_responses_increase_additively(limiter):
+    limiter.record(200, 0.1)
+    assert limiter.limit == pytest.approx(4.25)
+    assert limiter.bucket.rate == pytest.approx(5 + 1 / 4.25)
+
+    # +1 / limit per response: the limit grows like sqrt(16 + 2n).
+    for _ in range(20):
+        limiter.record(200, 0.1)
+    assert 7 < limiter.limit < 8
+
+
+def test_throttling_decreases_multiplicatively_once_per_cooldown(
+        limiter, clock):
+    limiter.record(429, 0.1)
+    assert (limiter.limit, limiter.bucket.rate) == (2.0, 2.5)
+
+    # In flight failures of the same burst don't cut again.
+    limiter.record(429, 0.1)
+    limiter.record_error()
+    assert (limiter.limit, limiter.bucket.rate) == (2.0, 2.5)
+
+    clock.value += 1.5
+    limiter.record_error()
+    assert (limiter.limit, limiter.bucket.rate) == (1.0, 1.25)
+    assert (limiter.throttled, limiter.errors) == (2, 2)
+
+
+def test_retry_after_blocks_the_host(limiter, clock):
+    limiter.record(429, 0.1, retry_after='12')
+    assert limiter.blocked_until == 1012.0
+
+    clock.value += 5
+    limiter.record(403, 0.1)
+    assert limiter.blocked_until == 1005.0 + 30.0
+    assert limiter.metrics()['blocked_for'] == 30.0
+
+
+@pytest.mark.parametrize('status_code', [500, 502, 503, 504])
+def test_server_errors_slow_down(limiter, status_code):
+    limiter.record(status_code, 0.1)
+    assert limiter.limit == 2.0
+    assert limiter.latency_ewma is None
+
+
+def test_unavailable_honours_retry_after(limiter, clock):
+    limiter.record(503, 0.1, retry_after='7')
+    assert limiter.blocked_until == 1007.0
+    assert limiter.throttled == 1
+
+    # Other server errors only pause the host when told to.
+    other = AdaptiveLimiter('other.example.com')
+    other.record(502, 0.1)
+    assert other.blocked_until == 0.0 and other.errors == 1
+    clock.value += 2
+    other.record(500, 0.1, retry_after='3')
+    assert other.blocked_until == 1005.0
@@ -0,0 +1,119 @@
+from redis.exceptions import ConnectionError
+
+from app.core.response_cache import ResponseCache
+
+
+class Builder:
+
+    def __init__(self, content=b'[]'):
+        self.content = content
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.content
+
+
+class FakeRedis:
+    """
+    The redis calls the cache makes, failing on demand.
+    """
+
+    def __init__(self):
+        self.values = dict()
+        self.down = False
+
+    def check(self):
+        if self.down:
+            raise ConnectionError("redis is down")
+
+    async def mget(self, keys):
+        self.check()
+        return [self.values.get(key) for key in keys]
+
+    async def incr(self, key):
+        self.check()
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    async def get(self, key):
+        self.check()
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.check()
+        self.values[key] = value
+
+
+def make_cache(max_bytes=1000, shared=False):
+    return ResponseCache(max_bytes=max_bytes, ttl=3600, shared=shared)
+
+
+async def test_bump_invalidates_responses_of_the_namespace():
+    cache = make_cache()
+    tournaments, seasons = Builder(b'[1]'), Builder(b'[2]')
+
+    for _ in range(2):
+        await cache.get_or_set('/tournaments', ['tournament'], tournaments)
+        await cache.get_or_set('/seasons', ['season'], seasons)
+    assert (tournaments.calls, seasons.calls) == (1, 1)
+
+    await cache.bump('tournament')
+    await cache.get_or_set('/tournaments', ['tournament'], tournaments)
+    await cache.get_or_set('/seasons', ['season'], seasons)
+    assert (tournaments.calls, seasons.calls) == (2, 1)
+
+
+async def test_entries_are_bounded_in_bytes_least_recent_first():
+    cache = make_cache(max_bytes=250)
+    builders = {name: Builder(bytes(100)) for name in 'abc'}
+
+    await cache.get_or_set('a', [], builders['a'])
+    await cache.get_or_set('b', [], builders['b'])
+    await cache.get_or_set('a', [], builders['a'])
+    await cache.get_or_set('c', [], builders['c'])
+
+    stats = cache.stats()
+    assert (stats['entries'], stats['size_bytes'], stats['evictions']) == (
+        2, 200, 1)
+    await cache.get_or_set('a', [], builders['a'])
+    await cache.get_or_set('b', [], builders['b'])
+    assert (builders['a'].calls, builders['b'].calls) == (1, 2)
+
+    # A body larger than the whole cache is served but never stored.
+    await cache.get_or_set('big', [], Builder(bytes(300)))
+    assert cache.stats()['size_bytes'] <= 250
+
+
+async def test_versions_of_other_workers_invalidate():
+    redis = FakeRedis()
+    api, worker = make_cache(), make_cache()
+    api.attach_redis(redis)
+    worker.attach_redis(redis)
+    build = Builder()
+
+    await api.get_or_set('/tournaments', ['tournament'], build)
+    await worker.bump('tournament')
+    await api.get_or_set('/tournaments', ['tournament'], build)
+    assert build.calls == 2
+
+
+async def test_unreachable_redis_skips_the_cache():
+    redis = FakeRedis()
+    cache = make_cache()
+    cache.attach_redis(redis)
+    build = Builder()
+
+    await cache.get_or_set('/tournaments', ['tournament'], build)
+    redis.down = True
+    # A bump that can't reach redis must not let version 1 of this
+    # worker stand for redis' version 1 later on.
+    await cache.bump('tournament')
+    await cache.get_or_set('/tournaments', ['tournament'], build)
+    await cache.get_or_set('/tournaments', ['tournament'], build)
+    assert build.calls == 3
+    assert cache.stats()['entries'] == 1
+
+    redis.down = False
+    await cache.get_or_set('/tournaments', ['tournament'], build)
+    assert build.calls == 3
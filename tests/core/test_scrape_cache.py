@@ -0,0 +1,30 @@
+import os
+
+from app.core.scrape_cache import ScrapeCache
+
+
+def make_cache(directory, max_bytes=20000):
+    return ScrapeCache(str(directory), max_bytes=max_bytes,
+                       default_ttl=3600, negative_ttl=3600)
+
+
+def directory_size(directory):
+    return sum(path.stat().st_size for path in directory.glob('*/*.gz'))
+
+
+def test_entries_of_other_processes_are_hits(tmp_path):
+    writer, reader = make_cache(tmp_path), make_cache(tmp_path)
+    reader.stats()
+    writer._write('https://example.com/a', 200, b'{}')
+
+    entry = reader._read('https://example.com/a')
+    assert entry is not None and entry.content == b'{}'
+    assert reader.hits == 1 and reader.misses == 0
+
+
+def test_max_bytes_bounds_the_shared_directory(tmp_path):
+    caches = [make_cache(tmp_path), make_cache(tmp_path)]
+    for index in range(40):
+        caches[index % 2]._write(f"https://example.com/{index}", 200,
+                                 os.urandom(1500))
+    assert directory_size(tmp_path) <= 20000
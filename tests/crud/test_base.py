@@ -0,0 +1,112 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.crud.base import (CRUDRepository, MAX_BIND_PARAMS, decode_cursor,
+                           dedupe_rows, encode_cursor, keyset_after,
+                           upsert_chunk_size)
+from app.models.football import Category, Team, TournamentEvent
+
+
+EVENT_COLUMNS = [TournamentEvent.__table__.c.start_timestamp,
+                 TournamentEvent.__table__.c.sofascore_id]
+
+
+class RecordingSession:
+    """
+    Session double recording the statements upsert_many executes.
+    """
+
+    def __init__(self):
+        self.statements = list()
+        self.commits = 0
+
+    async def exec(self, stmt, **kwargs):
+        self.statements.append(stmt)
+        return self
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+def test_dedupe_rows_keeps_last_row_per_key():
+    rows = [dict(sofascore_id=1, name='a'),
+            dict(sofascore_id=2, name='b'),
+            dict(sofascore_id=1, name='c')]
+    unique = dedupe_rows(Category, rows, ['sofascore_id'])
+    assert [(row['sofascore_id'], row['name']) for row in unique] == [
+        (1, 'c'), (2, 'b')]
+
+
+def test_dedupe_rows_fills_every_column_with_defaults():
+    unique = dedupe_rows(Category, [dict(sofascore_id=1, name='a')],
+                         ['sofascore_id'])
+    columns = {column.name for column in Category.__table__.columns}
+    assert set(unique[0]) == columns
+    assert unique[0]['id'] is not None
+    assert unique[0]['created_at'] is not None
+
+
+def test_upsert_chunk_size_respects_bind_parameter_limit():
+    assert upsert_chunk_size(1000, 10) == 1000
+    assert upsert_chunk_size(1000, 100) == MAX_BIND_PARAMS // 100
+    assert upsert_chunk_size(0, 10) == 1
+    assert upsert_chunk_size(1000, 0) == 1000
+
+
+async def test_upsert_many_writes_deduplicated_chunks():
+    db = RecordingSession()
+    rows = [dict(sofascore_id=index % 25, name=f"team {index}")
+            for index in range(100)]
+    await CRUDRepository(model=Team).upsert_many(db, rows, chunk_size=10)
+    assert len(db.statements) == 3
+    assert db.commits == 1
+
+
+async def test_upsert_many_without_rows_only_commits():
+    db = RecordingSession()
+    assert await CRUDRepository(model=Team).upsert_many(db, []) == []
+    assert db.statements == []
+    assert db.commits == 1
+
+
+def compile_sql(clause):
+    return str(clause.compile(dialect=postgresql.dialect(),
+                              compile_kwargs={"literal_binds": True}))
+
+
+def test_cursor_round_trip():
+    values = [datetime(2024, 8, 17, 14, 0), 12345]
+    assert decode_cursor(encode_cursor(values), EVENT_COLUMNS) == values
+    assert decode_cursor(encode_cursor([None, 7]), EVENT_COLUMNS) == [None, 7]
+
+
+@pytest.mark.parametrize('cursor', ['not a cursor', encode_cursor([1])])
+def test_invalid_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, EVENT_COLUMNS)
+    assert exc.value.status_code == 400
+
+
+def test_keyset_after_keeps_null_rows_last():
+    sql = compile_sql(keyset_after(EVENT_COLUMNS,
+                                   [datetime(2024, 8, 17), 5]))
+    assert "tournament_event.start_timestamp IS NULL" in sql
+    assert " OR " in sql
+
+
+def test_keyset_after_null_cursor_continues_among_nulls():
+    sql = compile_sql(keyset_after(EVENT_COLUMNS, [None, 5]))
+    assert sql == ("tournament_event.start_timestamp IS NULL AND "
+                   "(tournament_event.sofascore_id) > (5)")
@@ -0,0 +1,50 @@
+import io
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.exports.arrow import ArrowFormat, select_schema, write_batches
+
+
+SCHEMA = select_schema(['sofascore_id', 'status_type', 'status_description',
+                        'start_timestamp'])
+
+
+def make_rows(start, count, description):
+    return [dict(sofascore_id=start + index,
+                 status_type='finished' if index % 2 else 'notstarted',
+                 status_description=None if index % 3 == 0 else description,
+                 start_timestamp=datetime(2024, 8, 17, 14, 0))
+            for index in range(count)]
+
+
+async def batches():
+    # Every batch brings a status value the earlier ones did not have.
+    yield make_rows(0, 5, 'Ended')
+    yield make_rows(5, 5, 'Some new status')
+    yield make_rows(10, 5, 'Another status')
+
+
+def read(sink, format):
+    sink.seek(0)
+    if format == ArrowFormat.PARQUET:
+        return pq.read_table(sink)
+    return pa.ipc.open_file(sink).read_all()
+
+
+@pytest.mark.parametrize('format', list(ArrowFormat))
+async def test_multi_batch_export(format):
+    sink = io.BytesIO()
+    written = await write_batches(batches(), sink, format, SCHEMA)
+
+    table = read(sink, format)
+    expected = make_rows(0, 5, 'Ended') + make_rows(
+        5, 5, 'Some new status') + make_rows(10, 5, 'Another status')
+    assert written == table.num_rows == 15
+    assert table.column('sofascore_id').to_pylist() == list(range(15))
+    assert table.column('status_description').to_pylist() == [
+        row['status_description'] for row in expected]
+    assert table.column('status_type').to_pylist() == [
+        row['status_type'] for row in expected]
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pytest
+
+from app.scrapers import lineups
+from app.scrapers.details import MatchRef
+from app.scrapers.lineups import parse_lineups, store_event_lineups
+
+
+def match(event_id, home_team_id, away_team_id):
+    return MatchRef(event_id=event_id, tournament_id=17, season_id=52186,
+                    home_team_id=home_team_id, away_team_id=away_team_id,
+                    start_timestamp=datetime(2024, 8, 17, 15))
+
+
+def entry(player_id, name, minutes=None, substitute=False, **fields):
+    statistics = dict(minutesPlayed=minutes) if minutes is not None else {}
+    return dict(player=dict(id=player_id, name=name, slug=name.lower(),
+                            position='M'),
+                substitute=substitute, statistics=statistics, **fields)
+
+
+def payload(home, away):
+    return dict(home=dict(players=home), away=dict(players=away))
+
+
+@pytest.fixture
+def written(monkeypatch):
+    calls = dict()
+
+    async def upsert_players_many(db, players, **kwargs):
+        calls['players'] = players
+        return []
+
+    async def upsert_many(db, rows, **kwargs):
+        calls['appearances'] = rows
+        calls['conflict_cols'] = kwargs['conflict_cols']
+        return []
+
+    monkeypatch.setattr(lineups.player_service, 'upsert_players_many',
+                        upsert_players_many)
+    monkeypatch.setattr(lineups.appearance_repo, 'upsert_many', upsert_many)
+    return calls
+
+
+def test_appearances_take_side_and_team_from_the_event():
+    players, appearances = parse_lineups(match(1, 42, 38), payload(
+        home=[entry(10, 'Saka', minutes=90, shirtNumber='7', captain=True),
+              entry(11, 'Nwaneri', minutes=12, substitute=True)],
+        away=[entry(20, 'Palmer', minutes=90, jerseyNumber='x'),
+              entry(21, 'Unused', substitute=True),
+              dict(player=dict(name='No id'))],
+    ))
+
+    assert [player.sofascore_id for player in players] == [10, 11, 20, 21]
+    rows = {row['player_id']: row for row in appearances}
+    assert rows[10] == dict(
+        event_id=1, player_id=10, season_id=52186, team_id=42,
+        is_home=True, position='M', shirt_number=7, substitute=False,
+        captain=True, minutes=90, rating=None)
+    assert (rows[11]['team_id'], rows[11]['substitute'],
+            rows[11]['minutes']) == (42, True, 12)
+    assert (rows[20]['team_id'], rows[20]['is_home'],
+            rows[20]['shirt_number']) == (38, False, None)
+    assert (rows[21]['substitute'], rows[21]['minutes']) == (True, 0)
+
+
+async def test_players_are_deduped_over_the_batch(written):
+    await store_event_lineups(None, [
+        (match(1, 42, 38), payload(
+            home=[entry(10, 'Saka', minutes=90)],
+            away=[entry(20, 'Palmer', minutes=90)])),
+        (match(2, 33, 42), payload(
+            home=[entry(30, 'Salah', minutes=90)],
+            away=[entry(10, 'Bukayo Saka', minutes=70),
+                  entry(11, 'Nwaneri', minutes=20, substitute=True)])),
+    ])
+
+    players = {player.sofascore_id: player for player in written['players']}
+    assert len(written['players']) == len(players) == 4
+    # The latest lineup of the batch wins.
+    assert players[10].name == 'Bukayo Saka'
+
+    assert written['conflict_cols'] == ['event_id', 'player_id']
+    rows = {(row['event_id'], row['player_id']): row
+            for row in written['appearances']}
+    assert len(rows) == len(written['appearances']) == 5
+    assert (rows[1, 10]['team_id'], rows[1, 10]['is_home']) == (42, True)
+    assert (rows[2, 10]['team_id'], rows[2, 10]['is_home'],
+            rows[2, 10]['minutes']) == (42, False, 70)
+    assert rows[2, 11]['substitute'] and not rows[2, 30]['substitute']
+
+
+async def test_empty_lineups_write_nothing(written):
+    await store_event_lineups(None, [(match(1, 42, 38), dict())])
+    assert written == {}
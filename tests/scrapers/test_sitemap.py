@@ -0,0 +1,99 @@
+import gzip
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.scrapers.sitemap import (SitemapStreamParser, iter_sitemap,
+                                  parse_event_entry, parse_player_entry,
+                                  parse_tournament_entry,
+                                  resolve_sitemap_source)
+
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url>
+    <loc>https://www.sofascore.com/football/tournament/england/premier-league/17</loc>
+    <lastmod>2024-08-01T10:00:00+02:00</lastmod>
+  </url>
+  <url>
+    <loc>https://www.sofascore.com/arsenal-chelsea/RsR#id:12437786</loc>
+    <lastmod>2024-09-14</lastmod>
+  </url>
+  <url>
+    <loc>https://www.sofascore.com/liverpool-everton/KdsTb</loc>
+  </url>
+  <url>
+    <loc>https://www.sofascore.com/player/bukayo-saka/934235</loc>
+  </url>
+  <url>
+    <loc>https://www.sofascore.com/news/transfer-window-2024</loc>
+  </url>
+</urlset>
+"""
+
+
+@pytest.fixture
+def sitemap_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'SITEMAP_DIR', str(tmp_path))
+    (tmp_path / 'football.xml.gz').write_bytes(gzip.compress(SITEMAP))
+    return tmp_path
+
+
+def parse_in_chunks(data, size):
+    parser = SitemapStreamParser()
+    entries = list()
+    for start in range(0, len(data), size):
+        entries.extend(parser.feed(data[start:start + size]))
+    return entries + parser.close()
+
+
+def test_gzipped_sitemap_parses_like_plain_xml_in_any_chunks():
+    entries = parse_in_chunks(gzip.compress(SITEMAP), 37)
+
+    assert entries == parse_in_chunks(SITEMAP, 4096)
+    assert [entry.tag for entry in entries] == ['url'] * 5
+    # Lastmods are stored as naive utc.
+    assert entries[0].lastmod == datetime(2024, 8, 1, 8)
+    assert entries[1].lastmod == datetime(2024, 9, 14)
+    assert entries[2].lastmod is None
+
+
+async def test_file_entries_match_the_url_patterns(sitemap_dir):
+    source = resolve_sitemap_source('football.xml.gz')
+    entries = [entry async for entry in iter_sitemap(None, source)]
+
+    tournaments = [parse_tournament_entry(entry) for entry in entries]
+    tournament = tournaments[0]
+    assert (tournament.sofascore_id, tournament.slug, tournament.name) == (
+        17, 'premier-league', 'Premier League')
+    assert tournaments[1:] == [None] * 4
+
+    events = [parse_event_entry(entry) for entry in entries]
+    assert events[0] is None
+    assert (events[1].custom_id, events[1].sofascore_id,
+            events[1].slug) == ('RsR', 12437786, 'arsenal-chelsea')
+    assert (events[2].custom_id, events[2].sofascore_id) == ('KdsTb', None)
+    # Slugs with digits or dashes aren't event custom ids.
+    assert events[3:] == [None, None]
+
+    players = [parse_player_entry(entry) for entry in entries]
+    assert players[3].sofascore_id == 934235
+    assert players[3].name == 'Bukayo Saka'
+    assert [player for player in players if player] == [players[3]]
+
+
+def test_sources_outside_the_sitemaps_are_rejected(sitemap_dir, tmp_path):
+    assert resolve_sitemap_source('football.xml.gz') == str(
+        sitemap_dir / 'football.xml.gz')
+    url = 'https://www.sofascore.com/sitemaps/football/index.xml'
+    assert resolve_sitemap_source(url) == url
+
+    (sitemap_dir / 'nested').mkdir()
+    (sitemap_dir / 'nested' / 'shard.xml').write_bytes(SITEMAP)
+    for source in ('../football.xml.gz', '/etc/passwd', 'missing.xml',
+                   'nested/shard.xml', str(sitemap_dir / 'nested'),
+                   'https://example.com/sitemaps/index.xml',
+                   'http://www.sofascore.com/sitemaps/index.xml'):
+        with pytest.raises(ValueError):
+            resolve_sitemap_source(source)